@@ -0,0 +1,15 @@
+"""
+Performance benchmarks of datawalk, run them from the project root directory:
+>>> uv run python -m benchmarks.bench_compile
+"""
+
+from timeit import Timer
+from typing import Callable
+
+
+def measure(function: Callable[[], object], repeat: int = 5, number: int = 100_000) -> float:
+    """
+    Returns the best duration of a call to the given function, in nanoseconds
+    """
+    best_duration = min(Timer(function).repeat(repeat=repeat, number=number))
+    return best_duration / number * 1e9
@@ -0,0 +1,84 @@
+"""
+Measures the access to a value by key according to the type of the container (dict, dataclass, slotted dataclass,
+NamedTuple, plain object):
+- ByKey calls (cached getter by type) compared with the direct access in Python code
+- filtering with the % selector, whose values are retrieved with the getter of the items type
+>>> uv run python -m benchmarks.bench_access
+"""
+
+from dataclasses import dataclass
+from typing import Any, Callable, NamedTuple
+
+from benchmarks import measure
+from datawalk.selectors import value_getter
+from datawalk.selectors.all import All
+from datawalk.selectors.by_key import ByKey
+
+ITEMS_COUNT = 10_000
+
+
+@dataclass
+class ProductDataclass:
+    name: str
+    price: int
+
+
+@dataclass(slots=True)
+class ProductSlots:
+    name: str
+    price: int
+
+
+class ProductNamedTuple(NamedTuple):
+    name: str
+    price: int
+
+
+class Product:
+    def __init__(self, name: str, price: int):
+        self.name = name
+        self.price = price
+
+
+def main():
+    product_types = {
+        'dict': lambda name, price: {'name': name, 'price': price},
+        'dataclass': ProductDataclass,
+        'slots dataclass': ProductSlots,
+        'NamedTuple': ProductNamedTuple,
+        'object': Product,
+    }
+    print(f'{"container":<16}{"direct":>10}{"ByKey":>10}{"% loop":>12}{"% selector":>12}  (ns per item)')
+    for type_label, product_type in product_types.items():
+        print(f'{type_label:<16}{measure_accesses(product_type)}')
+
+
+def measure_accesses(product_type: Callable[[str, int], Any]) -> str:
+    """
+    Returns the durations of the accesses to the price of the products of the given type, in ns per item
+    """
+    product = product_type('pen', 3)
+    direct_access = product.__getitem__ if isinstance(product, dict) else None
+    if direct_access is None:
+        direct_duration = measure(lambda: product.price)
+    else:
+        direct_duration = measure(lambda: direct_access('price'))
+    by_key = ByKey('price')
+    by_key_duration = measure(lambda: by_key(product))
+
+    products = [product_type(f'product {index}', index % 100) for index in range(ITEMS_COUNT)]
+    cheap_prices = frozenset(range(10))
+    all_selector = All('price', cheap_prices)
+    predicate = all_selector.predicate
+    # value_getter applied on each item, as before the getters by type
+    loop_duration = measure(lambda: [item for item in products if predicate(value_getter(item, 'price'))], number=20)
+    all_duration = measure(lambda: all_selector(products), number=20)
+
+    return (
+        f'{direct_duration:>10.0f}{by_key_duration:>10.0f}'
+        f'{loop_duration / ITEMS_COUNT:>12.0f}{all_duration / ITEMS_COUNT:>12.0f}'
+    )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,32 @@
+"""
+Compares Walk.column with the NumPy arrays built from the values of the compiled walk
+>>> uv run python -m benchmarks.bench_columns
+"""
+
+import numpy
+
+from benchmarks import measure
+from datawalk import Walk
+
+RECORDS_COUNT = 200_000
+
+
+def main():
+    records = [{'product': {'name': f'product {index}', 'price': index * 0.5}} for index in range(RECORDS_COUNT)]
+    price_walk = Walk / 'product' / 'price'
+    compiled_walk = price_walk.compile()
+    cases = {
+        'numpy.array(list)': lambda: numpy.array([compiled_walk(record) for record in records]),
+        'numpy.fromiter(map)': lambda: numpy.fromiter(map(compiled_walk, records), float, count=RECORDS_COUNT),
+        'column(dtype=float)': lambda: price_walk.column(records, dtype=float),
+        'column()': lambda: price_walk.column(records),
+        'column(default=0.)': lambda: price_walk.column(records, dtype=float, default=0.0),
+        'column(masked=True)': lambda: price_walk.column(records, dtype=float, masked=True),
+    }
+    print(f'{RECORDS_COUNT} records, walk: {price_walk}')
+    for label, case in cases.items():
+        print(f'{label:<22}{measure(case, repeat=7, number=3) / 1e6:>10.1f} ms')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,39 @@
+"""
+Compares the interpreted walk() method with the function generated by Walk.compile()
+>>> uv run python -m benchmarks.bench_compile
+"""
+
+from benchmarks import measure
+from datawalk import Walk
+
+DATA = {
+    'org': {
+        'address': {'country': 'France', 'city': 'Rennes'},
+        'phones': ['01 23 45 67 89', '02 13 46 58 79'],
+    },
+    'friends': [{'name': f'friend {index}'} for index in range(10)],
+}
+
+WALKS = {
+    'keys': Walk / 'org' / 'address' / 'country',
+    'keys and index': Walk / 'org' / 'phones' / 1,
+    'slice and first': Walk / 'friends' / slice(2, None) @ ('name', 'friend 5') / 'name',
+    'picker': Walk / 'org' / 'address' // ('country', 'city'),
+    'missing with default': Walk / 'org' / 'address' / 'zipcode',
+}
+
+
+def main():
+    print(f'{"walk":<22}{"walk() ns":>12}{"compiled ns":>14}{"speedup":>10}')
+    for label, walk in WALKS.items():
+        compiled_walk = walk.compile()
+        interpreted_duration = measure(lambda walk=walk: walk.walk(DATA, default=None))
+        compiled_duration = measure(lambda compiled_walk=compiled_walk: compiled_walk(DATA, default=None))
+        print(
+            f'{label:<22}{interpreted_duration:>12.0f}{compiled_duration:>14.0f}'
+            f'{interpreted_duration / compiled_duration:>9.1f}x'
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,37 @@
+"""
+Measures the construction of walks:
+- walks built step by step in a loop, which share their parent walks instead of copying their selectors
+- the memory used by many generated walks, whose equal prefixes (and equal walks) are shared
+>>> uv run python -m benchmarks.bench_construction
+"""
+
+import tracemalloc
+from timeit import default_timer
+
+from datawalk import Walk
+
+DEPTH = 10_000
+WALKS_COUNT = 100_000
+
+
+def main():
+    start = default_timer()
+    walk = Walk()
+    for index in range(DEPTH):
+        walk = walk / index
+    duration = default_timer() - start
+    print(f'walk of {DEPTH} steps built step by step: {duration * 1000:.1f} ms')
+
+    tracemalloc.start()
+    walks = [Walk / 'records' / (index % 1000) / 'fields' / f'field {index % 100}' for index in range(WALKS_COUNT)]
+    _, peak_memory = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    distinct_walks_count = len({id(walk) for walk in walks})
+    print(
+        f'{WALKS_COUNT} generated walks ({distinct_walks_count} distinct objects): {peak_memory / 2**20:.1f} MiB, '
+        f'{peak_memory / WALKS_COUNT:.0f} bytes per walk'
+    )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,43 @@
+"""
+Compares repeated @ lookups in a list (linear scans), in an IndexedSequence (hash lookups) and in a SortedSequence
+(binary searches)
+>>> uv run python -m benchmarks.bench_indexes
+"""
+
+from timeit import default_timer
+
+from datawalk import IndexedSequence, SortedSequence, Walk
+
+ITEMS_COUNT = 100_000
+LOOKUPS_COUNT = 1_000
+
+
+def lookup_all(walks: list[Walk], items) -> float:
+    start = default_timer()
+    for walk in walks:
+        walk.walk(items)
+
+    return default_timer() - start
+
+
+def main():
+    items = [{'id': item_id, 'value': item_id * 2} for item_id in range(ITEMS_COUNT)]
+    step = ITEMS_COUNT // LOOKUPS_COUNT
+    walks = [Walk @ ('id', item_id) / 'value' for item_id in range(0, ITEMS_COUNT, step)]
+
+    linear_duration = lookup_all(walks, items)
+    indexed_duration = lookup_all(walks, IndexedSequence(items))
+    start = default_timer()
+    sorted_items = SortedSequence(items, 'id')
+    sorted_duration = default_timer() - start + lookup_all(walks, sorted_items)
+    print(f'{LOOKUPS_COUNT} lookups in {ITEMS_COUNT} items')
+    print(f'list:            {linear_duration * 1000:>10.1f} ms')
+    print(f'IndexedSequence: {indexed_duration * 1000:>10.1f} ms (index built included)')
+    print(f'SortedSequence:  {sorted_duration * 1000:>10.1f} ms (sorted key values read included)')
+    print(
+        f'speedup:         {linear_duration / indexed_duration:>10.1f}x (indexed), {linear_duration / sorted_duration:.1f}x (sorted)'
+    )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,52 @@
+"""
+Compares loading a large JSON document before walking it with walking the JSON document with Walk.walk_json
+>>> uv run python -m benchmarks.bench_json_walk
+"""
+
+import json
+import tracemalloc
+from timeit import default_timer
+
+from datawalk import Walk, WalkSet
+
+RECORDS_COUNT = 200_000
+
+
+def profile(label: str, function):
+    # the duration and the memory are measured in distinct runs because tracing the memory slows the execution down
+    start = default_timer()
+    value = function()
+    duration = default_timer() - start
+    tracemalloc.start()
+    function()
+    _, peak_memory = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f'{label:<28}{duration * 1000:>10.1f} ms{peak_memory / 2**20:>10.1f} MiB  -> {value}')
+
+
+def main():
+    document = json.dumps(
+        {
+            'metadata': {'source': 'benchmark', 'count': RECORDS_COUNT},
+            'records': [{'id': index, 'name': f'record {index}', 'tags': ['a', 'b']} for index in range(RECORDS_COUNT)],
+            'summary': {'status': 'complete'},
+        }
+    ).encode()
+    print(f'document of {len(document) / 2**20:.1f} MiB')
+
+    source_walk = Walk / 'metadata' / 'source'
+    status_walk = Walk / 'summary' / 'status'
+    record_walk = Walk / 'records' @ ('id', RECORDS_COUNT // 2) / 'name'
+    walk_set = WalkSet({'source': source_walk, 'record': record_walk, 'status': status_walk})
+
+    profile('json.loads + walk (head)', lambda: source_walk.walk(json.loads(document)))
+    profile('walk_json (head)', lambda: source_walk.walk_json(document))
+    profile('walk_json strict (head)', lambda: source_walk.walk_json(document, strict=True))
+    profile('json.loads + walk (tail)', lambda: status_walk.walk(json.loads(document)))
+    profile('walk_json (tail)', lambda: status_walk.walk_json(document))
+    profile('json.loads + walk set', lambda: walk_set.walk(json.loads(document)))
+    profile('walk set walk_json', lambda: walk_set.walk_json(document))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,40 @@
+"""
+Measures the throughput of scan_jsonl on a JSON Lines file according to the number of worker processes
+>>> uv run python -m benchmarks.bench_scan
+"""
+
+import json
+import os
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from timeit import default_timer
+
+from datawalk import Walk, scan_jsonl
+
+RECORDS_COUNT = 400_000
+
+
+def main():
+    with TemporaryDirectory() as tmp_folder:
+        jsonl_path = Path(tmp_folder) / 'records.jsonl'
+        with jsonl_path.open('w') as jsonl_file:
+            for index in range(RECORDS_COUNT):
+                record = {'id': index, 'user': {'name': f'user {index}', 'tags': ['a', 'b', 'c']}, 'score': index % 97}
+                jsonl_file.write(json.dumps(record) + '\n')
+
+        size_in_mib = jsonl_path.stat().st_size / 2**20
+        print(f'{RECORDS_COUNT} lines, {size_in_mib:.1f} MiB, {os.cpu_count()} cores')
+        walks = (Walk / 'user' / 'name', Walk / 'score')
+        workers_counts = sorted({1, 2, 4, os.cpu_count() or 1})
+        for workers in workers_counts:
+            start = default_timer()
+            lines_count = sum(1 for _ in scan_jsonl(jsonl_path, *walks, workers=workers, chunk_size=2**20))
+            duration = default_timer() - start
+            print(
+                f'{workers:>3} workers: {duration * 1000:>10.1f} ms {size_in_mib / duration:>8.1f} MiB/s '
+                f'({lines_count} lines)'
+            )
+
+
+if __name__ == '__main__':
+    main()
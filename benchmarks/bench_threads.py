@@ -0,0 +1,60 @@
+"""
+Measures the throughput of Walk.map_threaded according to the number of threads. Run it with a GIL interpreter and with
+a free-threaded one (python3.13t, python3.14t) to compare: the walks only scale with the threads without the GIL
+>>> uv run python -m benchmarks.bench_threads
+>>> uv run --python 3.14t python -m benchmarks.bench_threads
+"""
+
+import os
+import platform
+import sys
+import sysconfig
+from timeit import default_timer
+
+from datawalk import IndexedSequence, Walk
+
+RECORDS_COUNT = 200_000
+THREADS_COUNTS = (1, 2, 4, 8)
+REPEAT = 3
+
+
+def gil_status() -> str:
+    if not sysconfig.get_config_var('Py_GIL_DISABLED'):
+        return 'GIL build'
+
+    # the GIL can be enabled again at runtime by PYTHON_GIL=1 or by extension modules not supporting free threading
+    gil_enabled = getattr(sys, '_is_gil_enabled', lambda: True)()
+    return f'free-threaded build, GIL {"enabled" if gil_enabled else "disabled"}'
+
+
+def main():
+    tags = IndexedSequence([{'name': f'tag {index}', 'weight': index} for index in range(32)])
+    records = [
+        {'id': index, 'user': {'name': f'user {index}', 'tags': tags}, 'score': index % 97}
+        for index in range(RECORDS_COUNT)
+    ]
+    walk = Walk / 'user' / 'tags' @ ('name', 'tag 7') / 'weight'
+    print(f'{platform.python_implementation()} {platform.python_version()} ({gil_status()}), {os.cpu_count()} cores')
+    print(f'{RECORDS_COUNT} records, walk: {walk}')
+
+    single_thread_rate = None
+    for threads_count in THREADS_COUNTS:
+        duration = min(_timed_map(walk, records, threads_count) for _ in range(REPEAT))
+        rate = RECORDS_COUNT / duration
+        single_thread_rate = single_thread_rate or rate
+        print(
+            f'{threads_count:>3} threads: {duration * 1000:>8.1f} ms {rate / 1000:>10.1f} k records/s '
+            f'(x{rate / single_thread_rate:.2f})'
+        )
+
+
+def _timed_map(walk: Walk, records: list, threads_count: int) -> float:
+    start = default_timer()
+    for _ in walk.map_threaded(records, workers=threads_count, chunk_size=2000):
+        pass
+
+    return default_timer() - start
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,366 @@
+"""
+Benchmark suite comparing the walks (interpreted and compiled) with hand-written accesses, by group of cases:
+- depth of the walks, container types (dict, object, dataclass, NamedTuple), selectors, fan-out, record counts
+- default values and errors
+The results can be saved as JSON and compared with the results of a previous run to detect regressions:
+>>> uv run python -m benchmarks --output results.json
+>>> uv run python -m benchmarks --baseline results.json --threshold 1.25
+"""
+
+import json
+import platform
+from argparse import ArgumentParser
+from contextlib import suppress
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from timeit import Timer
+from typing import Any, Callable, Sequence
+
+from datawalk import Between, Compare, Walk, __version__
+from datawalk.errors import WalkError
+
+from tests.conftest import Pet, PetDataclass, PetNamedTuple
+
+# minimal duration of a measure, the number of calls is doubled until it is reached
+MIN_MEASURE_DURATION = 0.02
+
+
+@dataclass
+class Case:
+    """
+    A benchmark case: functions performing the same access on a dataset, by implementation label
+    """
+
+    group: str
+    name: str
+    implementations: dict[str, Callable[[], Any]]
+
+
+def measure_ns(function: Callable[[], Any], repeat: int) -> float:
+    """
+    Returns the best duration of a call to the function in nanoseconds, the number of calls is adapted to the function
+    """
+    timer = Timer(function)
+    number = 1
+    while timer.timeit(number) < MIN_MEASURE_DURATION:
+        number *= 2
+
+    return min(timer.repeat(repeat=repeat, number=number)) / number * 1e9
+
+
+def walk_case(group: str, name: str, walk: Walk, data: Any, hand_written: Callable[[Any], Any], **walk_kwargs) -> Case:
+    """
+    Compares the walk() method and the compiled walk with the hand-written access, on the same dataset
+    """
+    compiled_walk = walk.compile()
+    return Case(
+        group,
+        name,
+        {
+            'walk': lambda: walk.walk(data, **walk_kwargs),
+            'compiled': lambda: compiled_walk(data, **walk_kwargs),
+            'hand-written': lambda: hand_written(data),
+        },
+    )
+
+
+def _catching(function: Callable[[], Any], error_type: type[Exception]) -> Callable[[], None]:
+    def catch_error():
+        with suppress(error_type):
+            function()
+
+    return catch_error
+
+
+def _error_message(function: Callable[[], Any], error_type: type[Exception]) -> Callable[[], str]:
+    def render_error_message() -> str:
+        try:
+            function()
+        except error_type as error:
+            return str(error)
+
+        raise AssertionError(f'{error_type.__name__} not raised')
+
+    return render_error_message
+
+
+def _depth_cases() -> list[Case]:
+    cases = []
+    for depth in (1, 4, 16):
+        walk, data = Walk(), 'value'
+        for _ in range(depth):
+            walk, data = walk / 'key', {'key': data}
+        # generates the hand-written access data['key']['key']...
+        hand_written = eval('lambda data: data' + "['key']" * depth)
+        cases.append(walk_case('depth', f'{depth} keys', walk, data, hand_written))
+
+    return cases
+
+
+def _container_cases() -> list[Case]:
+    containers = {
+        'dict': (
+            {'owner': {'name': 'Lucie', 'pet': {'name': 'Socks', 'type': 'cat'}}},
+            lambda data: data['owner']['pet']['type'],
+        ),
+        'object': ({'owner': {'pet': Pet('Socks', 'cat')}}, lambda data: data['owner']['pet'].type),
+        'dataclass': ({'owner': {'pet': PetDataclass('Socks', 'cat')}}, lambda data: data['owner']['pet'].type),
+        'NamedTuple': ({'owner': {'pet': PetNamedTuple('Socks', 'cat')}}, lambda data: data['owner']['pet'].type),
+        'tuple': ({'owner': {'pet': ('Socks', 'cat')}}, lambda data: data['owner']['pet'][1]),
+    }
+    return [
+        walk_case('container', label, Walk / 'owner' / 'pet' / (1 if label == 'tuple' else 'type'), data, hand_written)
+        for label, (data, hand_written) in containers.items()
+    ]
+
+
+def _selector_cases() -> list[Case]:
+    pets = [
+        Pet('Cinnamon', 'cat'),
+        PetDataclass('Caramel', 'dog'),
+        Pet('Melody', 'bird'),
+        PetNamedTuple('Socks', 'cat'),
+    ]
+    friends = [{'name': f'friend {index}', 'age': index} for index in range(10)]
+    contact = {'firstname': 'Suzie', 'lastname': 'Q', 'phone': '06 43 15 27 98', 'city': 'Rennes'}
+    return [
+        walk_case('selector', 'key /', Walk / 'firstname', contact, lambda data: data['firstname']),
+        walk_case('selector', 'index /', Walk / 2, friends, lambda data: data[2]),
+        walk_case('selector', 'slice /', Walk / slice(2, -2, 2), friends, lambda data: data[2:-2:2]),
+        walk_case(
+            'selector',
+            'first @',
+            Walk @ ('name', 'Melody'),
+            pets,
+            lambda data: next(pet for pet in data if pet.name == 'Melody'),
+        ),
+        walk_case(
+            'selector',
+            'all % in',
+            Walk % ('type', ['cat', 'bird']),
+            pets,
+            lambda data: [pet for pet in data if pet.type in ('cat', 'bird')],
+        ),
+        walk_case(
+            'selector',
+            'all % compare',
+            Walk % ('age', Compare('>=', 5)),
+            friends,
+            lambda data: [friend for friend in data if friend['age'] >= 5],
+        ),
+        walk_case(
+            'selector',
+            'all % between',
+            Walk % ('age', Between(2, 6)),
+            friends,
+            lambda data: [friend for friend in data if 2 <= friend['age'] <= 6],
+        ),
+        walk_case(
+            'selector',
+            'picker //',
+            Walk // ('firstname', 'city'),
+            contact,
+            lambda data: {'firstname': data['firstname'], 'city': data['city']},
+        ),
+        walk_case('selector', 'custom *', Walk / 'phone' * str.split, contact, lambda data: data['phone'].split()),
+        # chains rewritten by the optimizer
+        walk_case(
+            'selector',
+            'all % then index',
+            Walk % ('age', Compare('>=', 5)) / 0,
+            friends,
+            lambda data: next(friend for friend in data if friend['age'] >= 5),
+        ),
+        walk_case(
+            'selector',
+            'slice then slice',
+            Walk / slice(1, None) / slice(None, 4),
+            friends,
+            lambda data: data[1:5],
+        ),
+    ]
+
+
+def _fan_out_cases() -> list[Case]:
+    cases = []
+    for items_count in (10, 1_000):
+        items = [{'id': index, 'group': index % 10} for index in range(items_count)]
+        last_id = items_count - 1
+        cases += [
+            walk_case(
+                'fan-out',
+                f'@ last of {items_count}',
+                Walk @ ('id', last_id),
+                items,
+                lambda data, last_id=last_id: next(item for item in data if item['id'] == last_id),
+            ),
+            walk_case(
+                'fan-out',
+                f'% 10% of {items_count}',
+                Walk % ('group', [0]),
+                items,
+                lambda data: [item for item in data if item['group'] in (0,)],
+            ),
+            walk_case(
+                'fan-out',
+                f'[::2] of {items_count}',
+                Walk / slice(None, None, 2),
+                items,
+                lambda data: data[::2],
+            ),
+        ]
+    keys = [f'key {index}' for index in range(8)]
+    record = {key: index for index, key in enumerate(keys)}
+    cases.append(
+        walk_case('fan-out', 'picker of 8 keys', Walk // keys, record, lambda data: {key: data[key] for key in keys})
+    )
+
+    return cases
+
+
+def _records_cases() -> list[Case]:
+    cases = []
+    for records_count in (1_000, 100_000):
+        records = [{'user': {'name': f'user {index}', 'id': index}} for index in range(records_count)]
+        walk = Walk / 'user' / 'name'
+        cases.append(
+            Case(
+                'records',
+                f'{records_count} records',
+                {
+                    'walk': lambda records=records, walk=walk: [walk.walk(record) for record in records],
+                    'walk_list': lambda records=records, walk=walk: walk.walk_list(records),
+                    'hand-written': lambda records=records: [record['user']['name'] for record in records],
+                },
+            )
+        )
+
+    return cases
+
+
+def _default_and_error_cases() -> list[Case]:
+    data = {'org': {'address': {'city': 'Rennes'}}, 'pet': Pet('Socks', 'cat')}
+    missing_key = Walk / 'org' / 'address' / 'zipcode'
+    missing_attribute = Walk / 'pet' / 'age'
+    compiled_missing_key = missing_key.compile()
+    return [
+        walk_case(
+            'default and errors',
+            'missing key with default',
+            missing_key,
+            data,
+            lambda data: data['org']['address'].get('zipcode'),
+            default=None,
+        ),
+        walk_case(
+            'default and errors',
+            'missing attribute with default',
+            missing_attribute,
+            data,
+            lambda data: getattr(data['pet'], 'age', None),
+            default=None,
+        ),
+        Case(
+            'default and errors',
+            'missing key error',
+            {
+                'walk': _catching(lambda: missing_key.walk(data), WalkError),
+                'compiled': _catching(lambda: compiled_missing_key(data), WalkError),
+                'hand-written': _catching(lambda: data['org']['address']['zipcode'], KeyError),
+            },
+        ),
+        Case(
+            'default and errors',
+            'missing key error message',
+            {
+                # the message is formatted when the error is rendered
+                'walk': _error_message(lambda: missing_key.walk(data), WalkError),
+                'hand-written': lambda: f'could not find zipcode in {data["org"]["address"]}',
+            },
+        ),
+    ]
+
+
+def build_cases() -> list[Case]:
+    return [
+        *_depth_cases(),
+        *_container_cases(),
+        *_selector_cases(),
+        *_fan_out_cases(),
+        *_records_cases(),
+        *_default_and_error_cases(),
+    ]
+
+
+def run_cases(cases: Sequence[Case], repeat: int) -> list[dict]:
+    """
+    Measures the implementations of the cases, and their overhead relative to the hand-written access
+    """
+    results = []
+    print(f'{"group":<20}{"case":<34}{"implementation":<16}{"ns":>14}{"vs hand-written":>18}')
+    for case in cases:
+        durations_ns = {label: measure_ns(function, repeat) for label, function in case.implementations.items()}
+        hand_written_ns = durations_ns.get('hand-written')
+        for label, duration_ns in durations_ns.items():
+            relative = '' if hand_written_ns is None else f'{duration_ns / hand_written_ns:.1f}x'
+            print(f'{case.group:<20}{case.name:<34}{label:<16}{duration_ns:>14.0f}{relative:>18}')
+        results.append({'group': case.group, 'name': case.name, 'durations_ns': durations_ns})
+
+    return results
+
+
+def find_regressions(results: list[dict], baseline: dict, threshold: float) -> list[str]:
+    """
+    Returns the descriptions of the measures slower than the ones of the baseline by more than the threshold ratio
+    """
+    baseline_durations = {
+        (result['group'], result['name'], label): duration_ns
+        for result in baseline['results']
+        for label, duration_ns in result['durations_ns'].items()
+    }
+    regressions = []
+    for result in results:
+        for label, duration_ns in result['durations_ns'].items():
+            baseline_ns = baseline_durations.get((result['group'], result['name'], label))
+            if baseline_ns is not None and duration_ns > baseline_ns * threshold:
+                regressions.append(
+                    f'{result["group"]} / {result["name"]} / {label}: '
+                    f'{baseline_ns:.0f} ns -> {duration_ns:.0f} ns ({duration_ns / baseline_ns:.2f}x)'
+                )
+
+    return regressions
+
+
+def main(arguments: Sequence[str] | None = None) -> int:
+    parser = ArgumentParser(prog='python -m benchmarks', description='Runs the benchmark suite of datawalk')
+    parser.add_argument('--output', help='path of the JSON file where the results are saved')
+    parser.add_argument('--baseline', help='path of the JSON results of a previous run to compare with')
+    parser.add_argument('--threshold', type=float, default=1.25, help='slowdown ratio flagged as a regression')
+    parser.add_argument('--group', action='append', help='runs the cases of the given group only (repeatable)')
+    parser.add_argument('--repeat', type=int, default=5, help='number of measures of each case, the best is kept')
+    options = parser.parse_args(arguments)
+
+    cases = [case for case in build_cases() if options.group is None or case.group in options.group]
+    results = run_cases(cases, options.repeat)
+    report = {
+        'datawalk_version': __version__,
+        'python_version': platform.python_version(),
+        'python_implementation': platform.python_implementation(),
+        'platform': platform.platform(),
+        'date': datetime.now(timezone.utc).isoformat(),
+        'results': results,
+    }
+    if options.output is not None:
+        with open(options.output, 'w', encoding='utf-8') as output_file:
+            json.dump(report, output_file, indent=2)
+
+    if options.baseline is not None:
+        with open(options.baseline, encoding='utf-8') as baseline_file:
+            regressions = find_regressions(results, json.load(baseline_file), options.threshold)
+        print(f'\n{len(regressions)} regression(s) beyond {options.threshold}x the baseline')
+        for regression in regressions:
+            print(f'- {regression}')
+        if regressions:
+            return 1
+
+    return 0
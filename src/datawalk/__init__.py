@@ -6,17 +6,68 @@ Eases data retrieval in nested structures by providing a DSL based on the magic
 
 from __future__ import annotations
 
-from typing import Any, Hashable, Protocol, Sequence
-
-from datawalk.errors import SelectorError, WalkError
+import os
+from functools import lru_cache
+from threading import Lock
+from typing import TYPE_CHECKING, Any, Callable, Hashable, Iterable, Iterator, Mapping, Protocol, Sequence
+from weakref import WeakValueDictionary
+
+from datawalk import instrumentation
+from datawalk.async_walk import PendingLoads, awalk_records, awalk_selectors
+from datawalk.columns import extract_column, extract_columns
+from datawalk.compiler import compile_selectors
+from datawalk.errors import SelectorError
+from datawalk.indexed_sequence import IndexedSequence
+from datawalk.json_walk import JsonSource
+from datawalk.optimizer import explain_selectors, plan_steps, source_walk_error
+from datawalk.parallel import compiled_walker, map_parallel, map_threaded
+from datawalk.parser import parse_selectors
+from datawalk.scan import scan_jsonl, scan_lines
 from datawalk.selectors.all import All
 from datawalk.selectors.by_key import ByKey
 from datawalk.selectors.by_slice import BySlice
+from datawalk.selectors.fan_out import Descendants, Each
 from datawalk.selectors.first import First
+from datawalk.selectors.group_by import GroupBy
+from datawalk.selectors.partition import Partition
 from datawalk.selectors.picker import Picker
+from datawalk.selectors.predicates import Between, Compare, Exists, In, Not, Predicate
+from datawalk.sorted_sequence import SortedSequence
+from datawalk.spec import from_spec, to_spec
+from datawalk.update import update_selectors
+from datawalk.walk_cache import WalkCache
+
+if TYPE_CHECKING:
+    from numpy import ndarray
 
 __version__ = '0.4.0'
 
+# public API, including the re-exported features of the submodules
+__all__ = [
+    'Between',
+    'Compare',
+    'Descendants',
+    'Each',
+    'Exists',
+    'GroupBy',
+    'In',
+    'IndexedSequence',
+    'Not',
+    'Partition',
+    'Predicate',
+    'SortedSequence',
+    'Walk',
+    'WalkCache',
+    'WalkSet',
+    'instrumentation',
+    'scan_jsonl',
+    'scan_lines',
+]
+
+
+# flag of the missing keys
+_MISSING = object()
+
 
 class Selector(Protocol):
     def __call__(self, state: Any) -> Any: ...
@@ -28,6 +79,7 @@ class MetaWalk(type):
     >>> Walk / 'key'
     >>> Walk @ ('key', value)
     >>> Walk % ('key', values)
+    >>> Walk % ('key', predicate)
     >>> Walk // ('attr_1', 'attr_2')
     >>> Walk * StateProcessor()
     """
@@ -38,7 +90,7 @@ class MetaWalk(type):
     def __matmul__(cls, filter: Sequence[Hashable, Hashable]) -> Any:
         return Walk() @ filter
 
-    def __mod__(cls, filter: Sequence[Hashable, Sequence]):
+    def __mod__(cls, filter: Sequence[Hashable, Sequence | Predicate]):
         return Walk() % filter
 
     def __floordiv__(cls, pickers: Sequence[Hashable]) -> dict:
@@ -51,6 +103,16 @@ class MetaWalk(type):
         return Walk(selector)
 
 
+# walks indexed by their parent walk and their last selector, as long as they are used
+_INTERNED_WALKS: WeakValueDictionary[tuple[Walk, Selector], Walk] = WeakValueDictionary()
+# WeakValueDictionary.setdefault is not atomic: the insertions are serialized so that threads creating equal walks
+# get the same one
+_interning_lock = Lock()
+
+# hash flag of the walks having an unhashable selector, and of their children walks
+_UNHASHABLE = object()
+
+
 class Walk(metaclass=MetaWalk):
     """
     A walk is an immutable sequence of selectors that can be applied on a dataset to return the corresponding value.
@@ -61,16 +123,107 @@ class Walk(metaclass=MetaWalk):
     There are 2 groups of selector operators:
     - the ones that return a selected value: `/ 'key'` and `@ ('key', value)`
     - the ones that return a sequence of values: `/ slice(...)` and `% ('key', value)`
+
+    Walks are linked to their parent walk (the walk without their last selector), so that adding a selector does not
+    copy the selectors of the parent. They are interned: creating a walk equal to a living one returns the latter.
+    Walks are equal and hashed according to their selectors.
+    Walks can be shared by threads: their lazily computed attributes (selectors, steps, hash, compiled function) are
+    idempotent, threads computing them concurrently store equal values; the interning of new walks is serialized.
     """
 
+    __slots__ = ('parent', 'selector', '_selectors', '_steps', '_hash', '_compiled', '__weakref__')
+
     # flag used when walking a data structure without a default value
     _NO_DEFAULT = object()
 
-    def __init__(self, *selectors: Selector):
+    def __new__(cls, *selectors: Selector) -> Walk:
         """
         Used internally to create a new walk combining the selectors of different walks.
         """
-        self.selectors = tuple(selectors)
+        walk = _EMPTY_WALK
+        for selector in selectors:
+            walk = walk._child(selector)
+
+        return walk
+
+    def _child(self, selector: Selector) -> Walk:
+        """
+        Returns the walk appending the selector to the current walk, reusing the interned one if it exists
+        """
+        intern_key = None
+        if self._hash is not _UNHASHABLE:
+            try:
+                intern_key = (self, selector)
+                if (child := _INTERNED_WALKS.get(intern_key)) is not None:
+                    return child
+            except TypeError:
+                # walks with unhashable selectors are not interned, nor their children walks
+                intern_key = None
+
+        child = Walk._create(self, selector)
+        if intern_key is None:
+            child._hash = _UNHASHABLE
+        else:
+            with _interning_lock:
+                # returns the child interned meanwhile by another thread, if any
+                child = _INTERNED_WALKS.setdefault(intern_key, child)
+
+        return child
+
+    @staticmethod
+    def _create(parent: Walk | None, selector: Selector | None) -> Walk:
+        walk = object.__new__(Walk)
+        walk.parent = parent
+        walk.selector = selector
+        walk._selectors = () if parent is None else None
+        walk._steps = None
+        walk._hash = hash(()) if parent is None else None
+        walk._compiled = None
+
+        return walk
+
+    @property
+    def selectors(self) -> tuple[Selector, ...]:
+        """
+        The selectors of the walk, gathered from the parent walks the first time they are requested
+        """
+        if self._selectors is None:
+            parent_selectors = []
+            walk = self
+            while walk._selectors is None:
+                parent_selectors.append(walk.selector)
+                walk = walk.parent
+            self._selectors = (*walk._selectors, *reversed(parent_selectors))
+
+        return self._selectors
+
+    @property
+    def steps(self) -> tuple[Selector, ...]:
+        """
+        The selectors applying the walk, rewritten once into cheaper equivalent forms by the optimizer (see explain()).
+        The selectors from the first fan-out one ([*] or ..key) are folded into a selector applying them on each branch
+        """
+        if self._steps is None:
+            self._steps = plan_steps(self.selectors)
+
+        return self._steps
+
+    def __eq__(self, other: object) -> bool:
+        return self is other or (isinstance(other, Walk) and other.selectors == self.selectors)
+
+    def __hash__(self) -> int:
+        """
+        Hashes the walks according to their selectors, raises a TypeError if one of them is not hashable
+        """
+        if self._hash is None:
+            # the parent walk and the selector were hashed when the walk was interned (the walks with an unhashable
+            # selector are flagged when they are created), so deep walks are hashed without recursion
+            self._hash = hash((self.parent._hash, self.selector))
+
+        if self._hash is _UNHASHABLE:
+            raise TypeError('the walk has an unhashable selector')
+
+        return self._hash
 
     @staticmethod
     def build_selector(step: Hashable | slice) -> Selector:
@@ -91,9 +244,9 @@ class Walk(metaclass=MetaWalk):
         """
 
         if step is Ellipsis:
-            return Walk(*self.selectors[:-1])
+            return self if self.parent is None else self.parent
         else:
-            return Walk(*self.selectors, Walk.build_selector(step))
+            return self._child(Walk.build_selector(step))
 
     def __floordiv__(self, pickers: Sequence[Hashable]) -> dict:
         """
@@ -107,7 +260,7 @@ class Walk(metaclass=MetaWalk):
         >>> # -> {'firstname': 'Suzie, 'lastname': 'Q'}
         """
 
-        return Walk(*self.selectors, Picker(pickers))
+        return self._child(Picker(pickers))
 
     def __matmul__(self, filter: Sequence[Hashable, Hashable]) -> Any:
         """
@@ -117,20 +270,27 @@ class Walk(metaclass=MetaWalk):
 
         match filter:
             case [key, value]:
-                return Walk(*self.selectors, First(key, value))
+                return self._child(First(key, value))
 
             case _:
                 raise SelectorError(f'unsupported filter: {filter}')
 
-    def __mod__(self, filter: Sequence[Hashable, Sequence]):
+    def __mod__(self, filter: Sequence[Hashable, Sequence | Predicate]):
         """
-        In a sequence, selects the entries whose key has a value in the given sequence
+        In a sequence, selects the entries whose key has a value in the given sequence, or satisfies the given predicate
         >>> walk % (key, [values])
+        >>> walk % (key, Compare('>=', 18))
+        >>> walk % (key, Between(18, 65))
+        >>> walk % (key, Not([values]))
+        >>> walk % (key, Exists())
         """
 
         match filter:
+            case [key, Predicate() as predicate]:
+                return self._child(All(key, predicate))
+
             case [key, [*values]]:
-                return Walk(*self.selectors, All(key, values))
+                return self._child(All(key, values))
 
             case [key, value]:
                 raise SelectorError(f'unsupported filter: {filter}, value {value} must be a sequence')
@@ -144,7 +304,7 @@ class Walk(metaclass=MetaWalk):
         >>> walk * StateProcessor()
         """
 
-        return Walk(*self.selectors, selector)
+        return self._child(selector)
 
     def __add__(self, other_walk) -> Walk:
         """
@@ -153,7 +313,11 @@ class Walk(metaclass=MetaWalk):
         >>> walk + other_walk # produces a new walk
         """
         if isinstance(other_walk, Walk):
-            return Walk(*self.selectors, *other_walk.selectors)
+            walk = self
+            for selector in other_walk.selectors:
+                walk = walk._child(selector)
+
+            return walk
 
         return NotImplemented
 
@@ -185,22 +349,290 @@ class Walk(metaclass=MetaWalk):
         """
         Applies the walk's selectors on the given dataset and returns the final result
         """
-        current_state = data
-        passed_selectors = []
-        for selector in self.selectors:
+        if instrumentation.enabled:
+            return instrumentation.instrumented_walk(self, data, default, Walk._NO_DEFAULT)
+
+        state = data
+        if default is Walk._NO_DEFAULT:
             try:
-                current_state = selector(current_state)
-                passed_selectors.append(selector)
+                for failed_index, selector in enumerate(self.steps):  # noqa: B007 (read by the error handler)
+                    state = selector(state)
             except Exception as error:
-                if default is Walk._NO_DEFAULT:
-                    raise WalkError(
-                        f'walked {passed_selectors} but could not find {selector} in the current data state',
-                        data_state=current_state,
-                    ) from error
+                # the message is formatted when it is read
+                raise source_walk_error(self.selectors, self.steps, failed_index, state) from error
+
+            return state
+
+        try:
+            for selector in self.steps:
+                # the missing dict keys, list and tuple indices and object attributes are detected without exceptions
+                if type(selector) is ByKey:
+                    # inlined fast path of plain dicts
+                    if type(state) is dict and not selector.is_dict_attribute:
+                        state = state.get(selector.key, _MISSING)
+                    else:
+                        state = selector.get(state, _MISSING)
+                    if state is _MISSING:
+                        return default
                 else:
-                    return default
+                    state = selector(state)
+        except Exception:
+            return default
+
+        return state
 
-        return current_state
+    def set(self, data: dict | object, value: Any, /) -> Any:
+        """
+        Returns a copy of the dataset in which the walked value is replaced by the given one. Only the containers along
+        the walked path are copied (dicts, lists, tuples, named tuples, dataclasses and objects), the other values are
+        shared with the dataset, which is left unchanged. The last key of a dict is added if it is missing.
+        >>> updated_data = (Walk / 'org' / 'address' / 'city').set(data, 'Nantes')
+
+        Raises:
+            SelectorError: when the walk is not made of / key steps only
+            WalkError: when one of the containers of the walked path cannot be reached
+        """
+        return update_selectors(self.selectors, data, lambda _: value, can_add=True)
+
+    def update(self, data: dict | object, function: Callable[[Any], Any], /) -> Any:
+        """
+        Returns a copy of the dataset in which the walked value is replaced by the result of the function applied on
+        it, copying only the containers along the walked path (see Walk.set)
+        >>> updated_data = (Walk / 'org' / 'address' / 'city').update(data, str.upper)
+
+        Raises:
+            SelectorError: when the walk is not made of / key steps only
+            WalkError: when the walked value cannot be reached
+        """
+        return update_selectors(self.selectors, data, function, can_add=False)
+
+    async def awalk(self, data: dict | object, /, *, default: Any = _NO_DEFAULT) -> Any:
+        """
+        Applies the walk's selectors on the given dataset, awaiting the awaitable states between the selectors (lazy
+        relationships of ORM objects, remote resources). The awaitable values picked by the // selector, or selected
+        by the % and slice selectors, are awaited concurrently.
+        >>> city = await (Walk / 'org' / 'address' / 'city').awalk(user)
+
+        Raises:
+            WalkError: when one of the selectors fails to return a value and no default value is given
+        """
+        return await awalk_selectors(self.selectors, self.steps, data, default, Walk._NO_DEFAULT, PendingLoads())
+
+    async def awalk_many(
+        self,
+        records: Iterable[dict | object],
+        /,
+        *,
+        default: Any = _NO_DEFAULT,
+        max_concurrency: int | None = None,
+    ) -> list[Any]:
+        """
+        Applies the walk on the records concurrently, like awalk, and returns their values in the order of the records.
+        The loads are shared by the records: the walks applying a selector on the same object (a shared relationship,
+        for example) await the same load instead of starting one each.
+        At most max_concurrency records are walked at a time when it is given (all of them otherwise), to bound the
+        number of loads sent to a database or a remote service.
+        >>> cities = await (Walk / 'org' / 'address' / 'city').awalk_many(users, default=None, max_concurrency=10)
+
+        Raises:
+            WalkError: when no default value is given and the walk fails on a record
+            ValueError: when max_concurrency is not positive
+        """
+        return await awalk_records(self.selectors, self.steps, records, default, Walk._NO_DEFAULT, max_concurrency)
+
+    def walk_many(self, records: Iterable[dict | object], /, *, default: Any = _NO_DEFAULT) -> Iterator[Any]:
+        """
+        Lazily applies the walk on each record of the given iterable, which can be a generator.
+        The walk is compiled once for all the records and no WalkError is created for the records missing a value
+        when a default value is given.
+        >>> for name in (Walk / 'name').walk_many(records, default=None):
+        >>>     ...
+
+        Raises:
+            WalkError: when no default value is given and the walk fails on a record
+        """
+        compiled_walk = self.compile()
+        if default is Walk._NO_DEFAULT:
+            return map(compiled_walk, records)
+        else:
+            return (compiled_walk(record, default=default) for record in records)
+
+    def walk_list(self, records: Iterable[dict | object], /, *, default: Any = _NO_DEFAULT) -> list[Any]:
+        """
+        Applies the walk on each record of the given iterable and returns the values in a list
+        >>> names = (Walk / 'name').walk_list(records, default=None)
+        """
+        return list(self.walk_many(records, default=default))
+
+    def walk_json(self, source: JsonSource, /, *, default: Any = _NO_DEFAULT, strict: bool = False) -> Any:
+        """
+        Applies the walk on a JSON document (bytes, string or file) without loading it: the walk drives the parsing,
+        which skips the parts of the document that it does not visit and stops once the value is found.
+        Lenient by default (the first duplicate key wins, the document is not validated after the value), see
+        WalkSet.walk_json() for the strict=True behaviour.
+        >>> with open('big_document.json', 'rb') as json_file:
+        >>>     (Walk / 'org' / 'address' / 'city').walk_json(json_file)
+
+        Raises:
+            WalkError: when one of the selectors fails to return a value and no default value is given
+            json.JSONDecodeError: when the scanned parts of the document are not valid JSON
+        """
+        defaults = {} if default is Walk._NO_DEFAULT else {None: default}
+        return WalkSet({None: self}, defaults=defaults).walk_json(source, strict=strict)[None]
+
+    def column(
+        self,
+        records: Iterable[dict | object],
+        /,
+        *,
+        dtype: Any = None,
+        default: Any = _NO_DEFAULT,
+        masked: bool = False,
+    ) -> ndarray:
+        """
+        Applies the walk on each record and returns the values in a NumPy array, filled in one pass.
+        The records without value are set with the default value, or masked if masked=True (a masked array is returned).
+        Without dtype, it is inferred from the values: numbers are stored in a numeric array, the other values (strings,
+        etc.) in an array of objects.
+        >>> prices = (Walk / 'product' / 'price').column(records, dtype=float, default=0.)
+
+        Raises:
+            ImportError: when NumPy is not installed (pip install "datawalk[numpy]")
+            WalkError: when no default value is given, masked is False and the walk fails on a record
+        """
+        has_default = default is not Walk._NO_DEFAULT
+        return extract_column(self.compile(), records, dtype, default, has_default, masked)
+
+    def columns(
+        self,
+        records: Iterable[dict | object],
+        /,
+        *,
+        dtypes: Any | Mapping[Hashable, Any] = None,
+        default: Any = _NO_DEFAULT,
+        masked: bool = False,
+    ) -> dict[Hashable, ndarray]:
+        """
+        Applies the walk, which must end with a picker (//), on each record and returns the picked values in
+        NumPy arrays indexed by key (struct of arrays). The dtypes can be given for all the columns, or by key; the missing
+        ones are inferred from the values (see column()).
+        >>> columns = (Walk / 'product' // ('name', 'price')).columns(records, dtypes={'name': object, 'price': float})
+        >>> # -> {'name': array([...], dtype=object), 'price': array([...])}
+
+        Raises:
+            SelectorError: when the walk does not end with a picker
+            ImportError: when NumPy is not installed (pip install "datawalk[numpy]")
+            WalkError: when no default value is given, masked is False and the walk fails on a record
+        """
+        if len(self.selectors) == 0 or not isinstance(picker := self.selectors[-1], Picker):
+            raise SelectorError(f'the walk must end with a picker (//) to extract columns: {self}')
+
+        walk_set = WalkSet({by_key.key: Walk(*self.selectors[:-1], by_key) for by_key in picker.pickers})
+        has_default = default is not Walk._NO_DEFAULT
+        return extract_columns(walk_set, records, dtypes, default, has_default, masked)
+
+    def map_parallel(
+        self,
+        records: Iterable[dict | object],
+        /,
+        *,
+        workers: int | None = None,
+        chunk_size: int = 1000,
+        ordered: bool = True,
+        default: Any = _NO_DEFAULT,
+    ) -> Iterator[Any]:
+        """
+        Applies the walk on each record with a pool of worker processes (os.cpu_count() by default) and yields the
+        values in the order of the records, unless ordered is False. The walk is sent once to each worker, the records
+        are sent by chunks: they must be picklable, like the custom selectors of the walk.
+        >>> names = (Walk / 'name').map_parallel(records, workers=4, chunk_size=1000)
+        """
+        workers = workers or os.cpu_count() or 1
+        has_default = default is not Walk._NO_DEFAULT
+        return map_parallel([self.to_spec()], records, workers, chunk_size, has_default, default, ordered)
+
+    def map_threaded(
+        self,
+        records: Iterable[dict | object],
+        /,
+        *,
+        workers: int | None = None,
+        chunk_size: int = 1000,
+        ordered: bool = True,
+        default: Any = _NO_DEFAULT,
+    ) -> Iterator[Any]:
+        """
+        Applies the walk on each record with a pool of threads (os.cpu_count() by default) and yields the values in the
+        order of the records, unless ordered is False. The threads share the compiled walk and the records: nothing is
+        pickled, the walks run in parallel on free-threaded interpreters (they are serialized by the GIL otherwise).
+        >>> names = (Walk / 'name').map_threaded(records, workers=4, chunk_size=1000)
+        """
+        workers = workers or os.cpu_count() or 1
+        walker = compiled_walker([self.compile()], default is not Walk._NO_DEFAULT, default)
+        return map_threaded(walker, records, workers, chunk_size, ordered)
+
+    @staticmethod
+    @lru_cache(maxsize=1024)
+    def parse(text: str) -> Walk:
+        """
+        Creates the walk whose string representation is given, compiled and ready to run. The walks are cached by text:
+        parsing the same text again returns the same walk (see datawalk.parser for the supported syntax)
+        >>> Walk.parse('.friends @(name==Suzie Q) .phone') | data
+        >>> Walk.parse.cache_info() # statistics of the cache, which can be emptied with Walk.parse.cache_clear()
+        """
+        walk = Walk(*parse_selectors(text))
+        walk.compile()
+
+        return walk
+
+    def to_spec(self) -> tuple:
+        """
+        Returns the canonical specification of the walk, made of built-in values (see datawalk.spec)
+        >>> (Walk / 'pets' @ ('name', 'Socks')).to_spec()
+        >>> # -> (1, ('/', 'pets'), ('@', 'name', 'Socks'))
+        """
+        return to_spec(self.selectors)
+
+    @staticmethod
+    def from_spec(spec: Sequence) -> Walk:
+        """
+        Creates the walk described by the given specification
+        >>> Walk.from_spec((1, ('/', 'pets'), ('@', 'name', 'Socks')))
+        """
+        return Walk(*from_spec(spec))
+
+    def __reduce__(self) -> tuple:
+        # pickles the selectors only, the compiled function is generated again when needed
+        return Walk, self.selectors
+
+    def compile(self) -> Callable[..., Any]:
+        """
+        Returns a function fusing the walk's selectors, which behaves like the walk() method but runs faster.
+        The function is generated once per walk, since walks are immutable.
+        >>> country_of = (Walk / 'org' / 'address' / 'country').compile()
+        >>> country_of(data)
+        >>> country_of(data, default=None)
+        """
+        if self._compiled is None:
+            self._compiled = compile_selectors(self.selectors, self.steps, Walk._NO_DEFAULT)
+
+        return self._compiled
+
+    def explain(self) -> str:
+        """
+        Describes the steps executing the walk, one per line: the steps rewritten by the optimizer are followed by a
+        comment describing the rewrite (see datawalk.optimizer)
+        >>> print((Walk / 'friends' % ('name', ['Suzie Q']) / 0 / 'phone').explain())
+        >>> # .friends
+        >>> # %(name in ['Suzie Q']) [0]  # one-pass filter, stops at the match 0
+        >>> # .phone
+        """
+        return explain_selectors(self.selectors)
 
     def __repr__(self) -> str:
         return ' '.join(f'{selector}' for selector in self.selectors)
+
+
+_EMPTY_WALK = Walk._create(None, None)
+
+from datawalk.walk_set import WalkSet
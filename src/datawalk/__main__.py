@@ -0,0 +1,5 @@
+import sys
+
+from datawalk.cli import main
+
+sys.exit(main())
@@ -0,0 +1,132 @@
+"""
+Applies walks on object graphs whose nodes are loaded lazily with await (ORM relationships, remote resources):
+- the awaitable states are awaited between the selectors
+- the awaitable values picked by the // selector, or selected by the % and slice selectors, are awaited concurrently
+- the loads are shared by the walks of several records: a selector applied on the same object (identity) triggers one
+  load, awaited by all the walks needing it
+"""
+
+import asyncio
+from inspect import isawaitable
+from typing import Any, Awaitable, Callable, Iterable
+
+from datawalk.optimizer import source_walk_error
+from datawalk.selectors.all import All
+from datawalk.selectors.by_slice import BySlice
+from datawalk.selectors.picker import Picker
+
+
+class PendingLoads:
+    """
+    The loads started while walking records, indexed by their awaitable or by the selector and the state producing it.
+    The states and the awaitables are kept referenced so that their identities are not reused during the walks.
+    """
+
+    def __init__(self):
+        self._selected: dict[tuple[int, Callable[[Any], Any]], tuple[Any, asyncio.Future]] = {}
+        self._awaited: dict[int, tuple[Awaitable, asyncio.Future]] = {}
+
+    async def resolve(self, value: Any) -> Any:
+        """
+        Awaits the value as long as it is awaitable, each awaitable is awaited once
+        """
+        while isawaitable(value):
+            if (load := self._awaited.get(id(value))) is None:
+                load = self._awaited[id(value)] = value, asyncio.ensure_future(value)
+            value = await load[1]
+
+        return value
+
+    async def select(self, selector: Callable[[Any], Any], state: Any) -> Any:
+        """
+        Applies the selector on the state and resolves the selected value, or the selected values for the fan-out
+        selectors. Applying the same selector on the same state reuses the load started by the first application.
+        """
+        try:
+            load_key = (id(state), selector)
+            load = self._selected.get(load_key)
+        except TypeError:
+            # unhashable selector
+            load_key, load = None, None
+
+        if load is not None:
+            value = await load[1]
+        elif isawaitable(value := selector(state)):
+            future = asyncio.ensure_future(self.resolve(value))
+            if load_key is not None:
+                self._selected[load_key] = state, future
+            value = await future
+
+        match selector:
+            case Picker() if any(isawaitable(picked) for picked in value.values()):
+                return dict(zip(value.keys(), await asyncio.gather(*map(self.resolve, value.values()))))
+            case All() | BySlice() if isinstance(value, list) and any(isawaitable(item) for item in value):
+                return await asyncio.gather(*map(self.resolve, value))
+            case _:
+                return value
+
+    def cancel(self):
+        """
+        Cancels the loads which are still pending (after a walk failed for example)
+        """
+        for _, future in (*self._selected.values(), *self._awaited.values()):
+            future.cancel()
+
+
+async def awalk_selectors(
+    selectors: tuple[Callable[[Any], Any], ...],
+    steps: tuple[Callable[[Any], Any], ...],
+    data: Any,
+    default: Any,
+    no_default: Any,
+    loads: PendingLoads,
+) -> Any:
+    """
+    Behaves like Walk.walk, applying the steps planned for the selectors and awaiting the awaitable states between them
+    """
+    state = data
+    failed_index = 0
+    try:
+        state = await loads.resolve(state)
+        for failed_index, step in enumerate(steps):  # noqa: B007 (read by the error handler)
+            state = await loads.select(step, state)
+    except Exception as error:
+        if default is no_default:
+            raise source_walk_error(selectors, steps, failed_index, state, replay=False) from error
+
+        return default
+
+    return state
+
+
+async def awalk_records(
+    selectors: tuple[Callable[[Any], Any], ...],
+    steps: tuple[Callable[[Any], Any], ...],
+    records: Iterable[Any],
+    default: Any,
+    no_default: Any,
+    max_concurrency: int | None = None,
+) -> list[Any]:
+    """
+    Walks the records concurrently, sharing their loads, and returns their values in the order of the records.
+    At most max_concurrency records are walked at a time when it is given, to bound the number of pending loads.
+    """
+    if max_concurrency is not None and max_concurrency < 1:
+        raise ValueError(f'the maximum concurrency must be positive: {max_concurrency}')
+
+    loads = PendingLoads()
+    if max_concurrency is None:
+        walks = (awalk_selectors(selectors, steps, record, default, no_default, loads) for record in records)
+    else:
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def bounded_walk(record: Any) -> Any:
+            async with semaphore:
+                return await awalk_selectors(selectors, steps, record, default, no_default, loads)
+
+        walks = map(bounded_walk, records)
+
+    try:
+        return await asyncio.gather(*walks)
+    finally:
+        loads.cancel()
@@ -0,0 +1,165 @@
+"""
+Command line interface applying walks on JSON Lines (or JSON documents) read from the standard input or from files, like
+jq but with the syntax of the walk representations (see datawalk.parser):
+>>> cat users.jsonl | datawalk '.name' '.address .city' --default null --output-format csv
+>>> datawalk '.friends @(name==Suzie Q) .phone' --input data.json --input-format json
+>>> python -m datawalk '.id' --input users.jsonl --workers 4 --stats
+
+The lines are streamed: they are decoded, walked and written by chunks (by a pool of worker processes with --workers),
+the memory use does not depend on the number of lines. The values are written:
+- as JSON Lines: one value per line, or one array of values per line when several walks are given
+- as CSV: one column per walk, headed by the walk representation; strings are written as is, missing values (null) as
+  empty cells and the other values as JSON
+"""
+
+import csv
+import json
+import os
+import sys
+from argparse import ArgumentParser, ArgumentTypeError
+from time import perf_counter
+from typing import Any, Iterable, Iterator, Sequence, TextIO
+
+from datawalk import Walk
+from datawalk.errors import SelectorError, WalkError
+from datawalk.parallel import compiled_walker
+from datawalk.scan import scan_jsonl, scan_lines
+
+# flag of the walks failing without a default value
+_NO_DEFAULT = object()
+
+# path of the standard input
+STDIN = '-'
+
+
+def json_value(text: str) -> Any:
+    try:
+        return json.loads(text)
+    except ValueError as error:
+        raise ArgumentTypeError(f'invalid JSON value: {text}') from error
+
+
+def build_parser() -> ArgumentParser:
+    parser = ArgumentParser(
+        prog='datawalk', description='Applies walks on JSON Lines or JSON documents and writes their values'
+    )
+    parser.add_argument('walks', nargs='+', metavar='WALK', help="walk representation, like '.friends [*] .name'")
+    parser.add_argument(
+        '-i',
+        '--input',
+        action='append',
+        dest='inputs',
+        metavar='PATH',
+        help=f'file to read, the standard input by default or with {STDIN} (repeatable)',
+    )
+    parser.add_argument(
+        '--input-format',
+        choices=('jsonl', 'json'),
+        default='jsonl',
+        help='JSON Lines (one record per line, by default) or one JSON document per input',
+    )
+    parser.add_argument('--output-format', choices=('jsonl', 'csv'), default='jsonl', help='jsonl by default')
+    parser.add_argument(
+        '--default',
+        type=json_value,
+        default=_NO_DEFAULT,
+        metavar='JSON',
+        help='value written when a walk fails (like null), instead of stopping with an error',
+    )
+    parser.add_argument(
+        '-w', '--workers', type=int, default=1, help='number of worker processes decoding and walking the lines'
+    )
+    parser.add_argument(
+        '--stats', action='store_true', help='prints the number of records and the throughput on the standard error'
+    )
+
+    return parser
+
+
+def walk_inputs(
+    walks: Sequence[Walk], paths: Sequence[str], input_format: str, workers: int, default: Any
+) -> Iterator[tuple]:
+    """
+    Yields the tuple of the values of the walks for each record of the inputs
+    """
+    defaults = {} if default is _NO_DEFAULT else {'default': default}
+    for path in paths:
+        if input_format == 'json':
+            walker = compiled_walker([walk.compile() for walk in walks], default is not _NO_DEFAULT, default)
+            if path == STDIN:
+                values = [walker(json.load(sys.stdin))]
+            else:
+                with open(path, encoding='utf-8') as json_file:
+                    values = [walker(json.load(json_file))]
+        elif path == STDIN:
+            values = scan_lines(sys.stdin.buffer, *walks, workers=workers, **defaults)
+        else:
+            values = scan_jsonl(path, *walks, workers=workers, **defaults)
+
+        # the scans yield the value itself when there is one walk
+        yield from values if len(walks) > 1 else ((value,) for value in values)
+
+
+def write_jsonl(rows: Iterable[tuple], output: TextIO) -> int:
+    rows_count = 0
+    for rows_count, row in enumerate(rows, 1):  # noqa: B007 (returned)
+        output.write(json.dumps(row[0] if len(row) == 1 else row, ensure_ascii=False, default=str))
+        output.write('\n')
+
+    return rows_count
+
+
+def _csv_cell(value: Any) -> str:
+    if value is None:
+        return ''
+    elif isinstance(value, str):
+        return value
+    else:
+        return json.dumps(value, ensure_ascii=False, default=str)
+
+
+def write_csv(rows: Iterable[tuple], output: TextIO, walks: Sequence[Walk]) -> int:
+    writer = csv.writer(output, lineterminator='\n')
+    writer.writerow(repr(walk) for walk in walks)
+    rows_count = 0
+    for rows_count, row in enumerate(rows, 1):  # noqa: B007 (returned)
+        writer.writerow(_csv_cell(value) for value in row)
+
+    return rows_count
+
+
+def main(arguments: Sequence[str] | None = None) -> int:
+    parser = build_parser()
+    options = parser.parse_args(arguments)
+    if options.workers < 1:
+        parser.error(f'the number of workers must be positive: {options.workers}')
+    try:
+        walks = [Walk.parse(text) for text in options.walks]
+    except SelectorError as error:
+        parser.error(str(error))
+
+    start = perf_counter()
+    rows = walk_inputs(walks, options.inputs or [STDIN], options.input_format, options.workers, options.default)
+    try:
+        if options.output_format == 'csv':
+            rows_count = write_csv(rows, sys.stdout, walks)
+        else:
+            rows_count = write_jsonl(rows, sys.stdout)
+        sys.stdout.flush()
+    except BrokenPipeError:
+        # the reader of the output stopped (datawalk ... | head): the remaining output is discarded
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        return 1
+    except (WalkError, ValueError, OSError) as error:
+        # ValueError: invalid JSON lines, OSError: unreadable inputs
+        print(f'datawalk: error: {error}', file=sys.stderr)
+        return 1
+
+    if options.stats:
+        duration = perf_counter() - start
+        print(
+            f'{rows_count} records in {duration:.3f} s ({rows_count / duration if duration > 0 else 0:.0f} records/s)',
+            file=sys.stderr,
+        )
+
+    return 0
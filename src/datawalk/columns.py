@@ -0,0 +1,124 @@
+"""
+Extracts the values of walks applied on records into NumPy arrays, in one pass over the records: the values are
+streamed into the array by numpy.fromiter when the dtype is given, gathered in a list to infer the dtype otherwise.
+NumPy is an optional dependency: pip install "datawalk[numpy]"
+
+Without dtype, the dtype of a column is inferred from its values, like numpy.array does for numbers: booleans, ints,
+floats and complex numbers are stored in an array of the dtype holding all of them ([1, 2.5] -> float64), the other
+values (strings, None, lists, etc.) in an array of objects.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, Callable, Hashable, Iterable, Mapping
+
+if TYPE_CHECKING:
+    from numpy import ndarray
+
+    from datawalk.walk_set import WalkSet
+
+# flag returned by the walks when they could not find a value
+_MISSING = object()
+
+# kinds of the dtypes inferred from the values: boolean, signed and unsigned integer, float and complex
+_NUMERIC_KINDS = frozenset('biufc')
+
+
+def _numpy():
+    try:
+        import numpy
+    except ImportError as error:
+        raise ImportError(
+            'NumPy is required to extract columns, install it with: pip install "datawalk[numpy]"'
+        ) from error
+
+    return numpy
+
+
+def _inferred_array(numpy, values: list) -> ndarray:
+    """
+    Builds the array of the values with a numeric dtype when numpy.array infers one, an array of objects otherwise
+    """
+    try:
+        array = numpy.array(values)
+        if array.dtype.kind in _NUMERIC_KINDS and array.ndim == 1:
+            return array
+    except ValueError:
+        # sequences of different lengths
+        pass
+
+    return numpy.fromiter(values, dtype=object, count=len(values))
+
+
+def _array(numpy, values: Iterable, dtype: Any, count: int) -> ndarray:
+    if dtype is None:
+        return _inferred_array(numpy, values if isinstance(values, list) else list(values))
+
+    return numpy.fromiter(values, dtype=dtype, count=count)
+
+
+def _masked_array(numpy, values: list, dtype: Any) -> ndarray:
+    """
+    Builds the masked array of the values, masking the missing ones
+    """
+    mask = numpy.fromiter((value is _MISSING for value in values), dtype=bool, count=len(values))
+    if dtype is None:
+        dtype = _inferred_array(numpy, [value for value in values if value is not _MISSING]).dtype
+    # the masked values are set with the zero of the dtype
+    zero = numpy.zeros(1, dtype=dtype)[0]
+    array = numpy.fromiter((zero if value is _MISSING else value for value in values), dtype=dtype, count=len(values))
+
+    return numpy.ma.MaskedArray(array, mask=mask)
+
+
+def extract_column(
+    compiled_walk: Callable[..., Any],
+    records: Iterable[dict | object],
+    dtype: Any,
+    default: Any,
+    has_default: bool,
+    masked: bool,
+) -> ndarray:
+    """
+    Applies the compiled walk on each record and stores the values in an array (a masked array if requested,
+    flagging the records without value)
+    """
+    numpy = _numpy()
+    if masked:
+        return _masked_array(numpy, [compiled_walk(record, default=_MISSING) for record in records], dtype)
+
+    # the walks without default value raise the WalkError of the failing record
+    if has_default:
+        values = (compiled_walk(record, default=default) for record in records)
+    else:
+        values = map(compiled_walk, records)
+    return _array(numpy, values, dtype, len(records) if hasattr(records, '__len__') else -1)
+
+
+def extract_columns(
+    walk_set: WalkSet,
+    records: Iterable[dict | object],
+    dtypes: Any | Mapping[Hashable, Any],
+    default: Any,
+    has_default: bool,
+    masked: bool,
+) -> dict[Hashable, ndarray]:
+    """
+    Applies the walks of the walk set on each record and stores their values in arrays indexed by walk label
+    (struct of arrays). The dtypes can be given for all the columns, or by label.
+    """
+    numpy = _numpy()
+    if masked:
+        rows = [walk_set.walk(record, default=_MISSING) for record in records]
+    elif has_default:
+        rows = [walk_set.walk(record, default=default) for record in records]
+    else:
+        rows = [walk_set.walk(record) for record in records]
+
+    columns = {}
+    for label in walk_set.walks:
+        dtype = dtypes.get(label) if isinstance(dtypes, Mapping) else dtypes
+        values = [row[label] for row in rows]
+        columns[label] = _masked_array(numpy, values, dtype) if masked else _array(numpy, values, dtype, len(values))
+
+    return columns
@@ -0,0 +1,101 @@
+"""
+Compiles the selectors of a walk into a single function fusing the selectors chain into straight-line code:
+- ByKey and BySlice selectors are inlined as subscriptions of the built-in containers, they fall back on calling
+  the selector for the other states (mappings, objects, iterators)
+- the missing keys of dicts return the default value without raising exceptions
+- the other selectors are called in sequence
+- one error handler per walk, the failing selector is retrieved from the line number of the traceback
+"""
+
+from typing import Any, Callable, Sequence
+
+from datawalk.errors import WalkError
+from datawalk.optimizer import source_walk_error
+from datawalk.selectors.by_key import ByKey
+from datawalk.selectors.by_slice import BySlice
+
+# containers whose subscription can be inlined
+_BUILTIN_CONTAINERS = frozenset((dict, list, tuple, str))
+
+# flag of the missing keys
+_MISSING = object()
+
+# line of the generated function where the first selector is applied (see the template below)
+_FIRST_STEP_LINE = 4
+
+_FUNCTION_TEMPLATE = """def compiled_walk(data, /, *, default=no_default):
+    state = data
+    try:
+{steps}
+    except Exception as error:
+        if default is not no_default:
+            return default
+        raise walk_error(error, state) from error
+    return state
+"""
+
+
+def _compile_step(index: int, selector: Callable[[Any], Any], namespace: dict) -> list[str]:
+    """
+    Returns the lines of code applying the selector on the state
+    """
+    selector_name = f'selector_{index}'
+    namespace[selector_name] = selector
+    match selector:
+        case ByKey(key=int()):
+            namespace[f'key_{index}'] = selector.key
+            return [f'state = state[key_{index}] if type(state) in builtin_containers else {selector_name}(state)']
+        case ByKey():
+            # fast path for plain dicts, the selector handles the other mappings and the attributes
+            key_name = f'key_{index}'
+            namespace[key_name] = selector.key
+            lines = [
+                f'if type(state) is dict and (value := state.get({key_name}, missing)) is not missing:',
+                '    state = value',
+            ]
+            if not selector.is_dict_attribute:
+                lines += ['elif default is not no_default and type(state) is dict:', '    return default']
+
+            return lines + ['else:', f'    state = {selector_name}(state)']
+        case BySlice():
+            namespace[f'slicer_{index}'] = selector.slicer
+            return [f'state = state[slicer_{index}] if type(state) in builtin_containers else {selector_name}(state)']
+        case _:
+            return [f'state = {selector_name}(state)']
+
+
+def compile_selectors(
+    selectors: Sequence[Callable[[Any], Any]], steps: Sequence[Callable[[Any], Any]], no_default: Any
+) -> Callable[..., Any]:
+    """
+    Generates a function applying the steps planned for the given selectors on a dataset, with the same signature and
+    behavior as Walk.walk (the errors describe the selectors):
+    >>> compiled_walk(data)
+    >>> compiled_walk(data, default=None)
+    """
+
+    selectors, steps = tuple(selectors), tuple(steps)
+    # index of the step applied by each line of the steps
+    line_steps: list[int] = []
+
+    def walk_error(error: Exception, data_state: Any) -> WalkError:
+        failed_step = line_steps[error.__traceback__.tb_lineno - _FIRST_STEP_LINE]
+        return source_walk_error(selectors, steps, failed_step, data_state)
+
+    namespace = {
+        'no_default': no_default,
+        'walk_error': walk_error,
+        'builtin_containers': _BUILTIN_CONTAINERS,
+        'missing': _MISSING,
+    }
+    lines = []
+    for index, step in enumerate(steps):
+        step_lines = _compile_step(index, step, namespace)
+        lines.extend(step_lines)
+        line_steps.extend([index] * len(step_lines))
+
+    # an empty walk returns the dataset
+    source = _FUNCTION_TEMPLATE.format(steps='\n'.join(f'        {line}' for line in lines) or '        pass')
+    exec(compile(source, f'<walk {" ".join(map(repr, steps))}>', 'exec'), namespace)
+
+    return namespace['compiled_walk']
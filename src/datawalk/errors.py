@@ -1,11 +1,59 @@
+from reprlib import Repr
+from typing import Any, Callable, Sequence
+
+# bounds the size of the representations of the data states
+_DATA_STATE_REPR = Repr()
+_DATA_STATE_REPR.maxlevel = 3
+_DATA_STATE_REPR.maxdict = _DATA_STATE_REPR.maxlist = _DATA_STATE_REPR.maxtuple = _DATA_STATE_REPR.maxset = 8
+_DATA_STATE_REPR.maxstring = _DATA_STATE_REPR.maxother = 80
+
+
 class WalkError(LookupError):
     """
     Raised when an error occurred while walking the dataset.
+
+    The walks give their selectors and the index of the failing one, so that the message is only formatted when it
+    is read.
     """
 
-    def __init__(self, /, message, *, data_state=None):
-        super().__init__(message)
+    def __init__(
+        self,
+        /,
+        message: str | None = None,
+        *,
+        data_state: Any = None,
+        selectors: Sequence[Callable[[Any], Any]] = (),
+        failed_index: int = 0,
+    ):
+        super().__init__(*(() if message is None else (message,)))
+        self._message = message
         self.data_state = data_state
+        self.selectors = selectors
+        self.failed_index = failed_index
+
+    @property
+    def message(self) -> str:
+        if self._message is None:
+            passed_selectors = list(self.selectors[: self.failed_index])
+            self._message = (
+                f'walked {passed_selectors} but could not find {self.selectors[self.failed_index]} '
+                'in the current data state'
+            )
+
+        return self._message
+
+    @property
+    def data_state_repr(self) -> str:
+        """
+        Representation of the data state bounded in size (nesting depth, number of items, length of the strings)
+        """
+        return _DATA_STATE_REPR.repr(self.data_state)
+
+    def __str__(self) -> str:
+        return self.message
+
+    def __repr__(self) -> str:
+        return f'WalkError({self.message!r})'
 
 
 class SelectorError(ValueError):
@@ -0,0 +1,98 @@
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, Hashable, Iterable, Iterator, Sequence
+
+from datawalk.selectors import _DEFAULT, item_values
+
+
+class IndexedSequence(Sequence):
+    """
+    Wraps a sequence of dicts or objects and lets the @ (First) and % (All) selectors find items with hash lookups
+    instead of linear scans. An index mapping the values of a key to the positions of the items is built in one pass
+    the first time the key is looked up, and is reused by the next lookups, whatever the walk.
+
+    The number of indexes is bounded: the least recently used index is dropped when a new key is indexed.
+    Call invalidate() after modifying the wrapped sequence.
+
+    The indexed sequence can be shared by threads: an index is built without holding the lock and is published when it
+    is complete (threads indexing the same key concurrently build equal indexes), the lock only guards the LRU order.
+    >>> pets = IndexedSequence(pets_list)
+    >>> Walk @ ('name', 'Socks') | pets  # -> builds the 'name' index, then finds Socks with a hash lookup
+    >>> Walk @ ('name', 'Melody') | pets # -> reuses the 'name' index
+    """
+
+    def __init__(self, items: Sequence[dict | object], /, *, max_indexes: int = 8):
+        self.items = items
+        self.max_indexes = max_indexes
+        # index of positions by value, for each key (None when the key has unhashable values)
+        self._indexes: OrderedDict[Hashable, dict[Hashable, list[int]] | None] = OrderedDict()
+        self._indexes_lock = Lock()
+
+    def __getitem__(self, index: int | slice) -> Any:
+        return self.items[index]
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def __iter__(self) -> Iterator:
+        return iter(self.items)
+
+    def __repr__(self) -> str:
+        return f'IndexedSequence({self.items!r})'
+
+    def __getstate__(self) -> dict:
+        # the indexes are rebuilt on demand, the lock cannot be pickled
+        return {'items': self.items, 'max_indexes': self.max_indexes}
+
+    def __setstate__(self, state: dict):
+        self.__init__(state['items'], max_indexes=state['max_indexes'])
+
+    def invalidate(self, key: Hashable = _DEFAULT):
+        """
+        Drops the index of the given key, or all the indexes if no key is given
+        """
+        with self._indexes_lock:
+            if key is _DEFAULT:
+                self._indexes.clear()
+            else:
+                self._indexes.pop(key, None)
+
+    def positions(self, key: Hashable, values: Iterable[Any]) -> list[int] | None:
+        """
+        Returns the sorted positions of the items whose key has one of the given values,
+        or None if the key or one of the values cannot be indexed (not hashable)
+        """
+        if (index := self._index(key)) is None:
+            return None
+
+        try:
+            values_positions = [index.get(value, ()) for value in set(values)]
+        except TypeError:
+            return None
+
+        if len(values_positions) == 1:
+            return values_positions[0]
+        else:
+            return sorted(position for value_positions in values_positions for position in value_positions)
+
+    def _index(self, key: Hashable) -> dict[Hashable, list[int]] | None:
+        with self._indexes_lock:
+            if (index := self._indexes.get(key, _DEFAULT)) is not _DEFAULT:
+                self._indexes.move_to_end(key)
+                return index
+
+        index = {}
+        try:
+            for position, value in enumerate(item_values(self.items, key)):
+                if value is not _DEFAULT:
+                    index.setdefault(value, []).append(position)
+        except TypeError:
+            # a value of the key is not hashable: the items must be scanned
+            index = None
+
+        with self._indexes_lock:
+            self._indexes[key] = index
+            if len(self._indexes) > self.max_indexes:
+                self._indexes.popitem(last=False)
+
+        return index
@@ -0,0 +1,351 @@
+"""
+Opt-in instrumentation of Walk.walk and of the selectors, to find the hot walks and the selectors dominating the time.
+When disabled (by default), Walk.walk only checks a flag. When enabled, Walk.walk records:
+- for each walk: the number of calls, the cumulative time and the number of hits, misses (WalkError) and defaults
+- for each selector: the number of calls, the cumulative time, the hits and misses, and the number of items scanned
+  by the @ (First) and % (All) selectors (the lookups in the indexes of an IndexedSequence and the binary searches in a
+  SortedSequence scan no item). The one-pass filters of the optimizer (% fused with the slices and the index around it,
+  see datawalk.optimizer) are recorded as their % selector, their scanned items being the ones filtered before the
+  scan stopped
+>>> from datawalk import instrumentation
+>>> instrumentation.enable()
+>>> ...
+>>> snapshot = instrumentation.snapshot()
+>>> snapshot.walks[Walk / 'friends' @ ('name', 'Suzie Q')].calls
+>>> snapshot.hot_walks(5) # the 5 walks with the highest cumulative time
+>>> instrumentation.disable()
+
+The compiled walks (compile(), walk_many(), walk_list(), etc.) are not instrumented.
+
+Each thread records its statistics in its own dicts, which snapshot() sums up: walking in parallel threads (see
+Walk.map_threaded) neither loses counts nor contends on shared counters.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Iterator, Sized
+from threading import Lock, Thread, current_thread, local
+from time import perf_counter_ns
+from typing import TYPE_CHECKING, Any, Callable, Hashable
+
+from datawalk.indexed_sequence import IndexedSequence
+from datawalk.optimizer import source_walk_error
+from datawalk.selectors.all import All
+from datawalk.selectors.filtered_scan import FilteredScan
+from datawalk.selectors.first import First
+from datawalk.selectors.predicates import In
+from datawalk.sorted_sequence import SortedSequence
+
+if TYPE_CHECKING:
+    from datawalk import Walk
+
+# read by Walk.walk, set with enable() and disable()
+enabled = False
+
+
+class WalkStatistics:
+    __slots__ = ('calls', 'total_ns', 'hits', 'misses', 'defaults')
+
+    def __init__(self):
+        self.calls = 0
+        self.total_ns = 0
+        self.hits = 0
+        # the walks which raised a WalkError
+        self.misses = 0
+        # the walks which returned the default value
+        self.defaults = 0
+
+    @property
+    def average_ns(self) -> float:
+        return self.total_ns / self.calls if self.calls > 0 else 0.0
+
+    def copy(self) -> WalkStatistics:
+        statistics = WalkStatistics()
+        for attribute in WalkStatistics.__slots__:
+            setattr(statistics, attribute, getattr(self, attribute))
+
+        return statistics
+
+    def __repr__(self) -> str:
+        return (
+            f'WalkStatistics(calls={self.calls}, total_ns={self.total_ns}, hits={self.hits}, misses={self.misses}, '
+            f'defaults={self.defaults})'
+        )
+
+
+class SelectorStatistics:
+    __slots__ = ('calls', 'total_ns', 'hits', 'misses', 'scans', 'scanned_items', 'index_lookups')
+
+    def __init__(self):
+        self.calls = 0
+        self.total_ns = 0
+        self.hits = 0
+        self.misses = 0
+        # calls of the @ and % selectors scanning the items, and the number of scanned items
+        self.scans = 0
+        self.scanned_items = 0
+        # calls of the @ and % selectors answered by the index of an IndexedSequence or by binary searches
+        self.index_lookups = 0
+
+    @property
+    def average_ns(self) -> float:
+        return self.total_ns / self.calls if self.calls > 0 else 0.0
+
+    @property
+    def average_scanned(self) -> float:
+        """
+        Average number of items scanned by the @ and % selectors when they are not answered by an index
+        """
+        return self.scanned_items / self.scans if self.scans > 0 else 0.0
+
+    def copy(self) -> SelectorStatistics:
+        statistics = SelectorStatistics()
+        for attribute in SelectorStatistics.__slots__:
+            setattr(statistics, attribute, getattr(self, attribute))
+
+        return statistics
+
+    def __repr__(self) -> str:
+        return (
+            f'SelectorStatistics(calls={self.calls}, total_ns={self.total_ns}, hits={self.hits}, misses={self.misses}, '
+            f'scans={self.scans}, scanned_items={self.scanned_items}, index_lookups={self.index_lookups})'
+        )
+
+
+class Snapshot:
+    """
+    Copy of the statistics recorded by walk and by selector, the unhashable ones are indexed by their representation
+    """
+
+    __slots__ = ('walks', 'selectors')
+
+    def __init__(self, walks: dict[Walk | str, WalkStatistics], selectors: dict[Hashable, SelectorStatistics]):
+        self.walks = walks
+        self.selectors = selectors
+
+    def hot_walks(self, count: int = 10) -> list[tuple[Walk | str, WalkStatistics]]:
+        """
+        Returns the walks with the highest cumulative time, and their statistics
+        """
+        return sorted(self.walks.items(), key=lambda walk_statistics: walk_statistics[1].total_ns, reverse=True)[:count]
+
+    def hot_selectors(self, count: int = 10) -> list[tuple[Hashable, SelectorStatistics]]:
+        """
+        Returns the selectors with the highest cumulative time, and their statistics
+        """
+        return sorted(
+            self.selectors.items(), key=lambda selector_statistics: selector_statistics[1].total_ns, reverse=True
+        )[:count]
+
+    def __repr__(self) -> str:
+        return f'Snapshot(walks={self.walks!r}, selectors={self.selectors!r})'
+
+
+class _ThreadStatistics(local):
+    """
+    Statistics recorded by the current thread, registered the first time the thread records statistics
+    """
+
+    def __init__(self):
+        self.walks: dict[Walk | str, WalkStatistics] = {}
+        self.selectors: dict[Hashable, SelectorStatistics] = {}
+        with _registry_lock:
+            _threads_statistics.append((current_thread(), self.walks, self.selectors))
+
+
+# statistics of each thread, summed up by snapshot()
+_registry_lock = Lock()
+_threads_statistics: list[tuple[Thread, dict[Walk | str, WalkStatistics], dict[Hashable, SelectorStatistics]]] = []
+_thread_statistics = _ThreadStatistics()
+
+
+def enable():
+    global enabled
+    enabled = True
+
+
+def disable():
+    """
+    Stops recording the statistics, the recorded ones are kept until reset() is called
+    """
+    global enabled
+    enabled = False
+
+
+def reset():
+    """
+    Drops the recorded statistics, and the registration of the finished threads
+    """
+    with _registry_lock:
+        _threads_statistics[:] = [
+            (thread, walks, selectors) for thread, walks, selectors in _threads_statistics if thread.is_alive()
+        ]
+        for _, walks, selectors in _threads_statistics:
+            walks.clear()
+            selectors.clear()
+
+
+def snapshot() -> Snapshot:
+    """
+    Returns the sum of the statistics recorded by the threads
+    """
+    walks_statistics: dict[Walk | str, WalkStatistics] = {}
+    selectors_statistics: dict[Hashable, SelectorStatistics] = {}
+    with _registry_lock:
+        for _, walks, selectors in _threads_statistics:
+            _add_statistics(walks_statistics, walks)
+            _add_statistics(selectors_statistics, selectors)
+
+    return Snapshot(walks_statistics, selectors_statistics)
+
+
+def _add_statistics(total_statistics_by_key: dict, statistics_by_key: dict):
+    # the dict of another thread is copied before being iterated, because the thread may add statistics meanwhile
+    for key, statistics in dict(statistics_by_key).items():
+        if (total_statistics := total_statistics_by_key.get(key)) is None:
+            total_statistics_by_key[key] = statistics.copy()
+        else:
+            for attribute in type(statistics).__slots__:
+                setattr(
+                    total_statistics, attribute, getattr(total_statistics, attribute) + getattr(statistics, attribute)
+                )
+
+
+def _statistics_of(statistics_by_key: dict, key: Any, statistics_type: type) -> Any:
+    try:
+        statistics = statistics_by_key.get(key)
+    except TypeError:
+        # unhashable walk or selector
+        key = repr(key)
+        statistics = statistics_by_key.get(key)
+
+    if statistics is None:
+        statistics = statistics_by_key[key] = statistics_type()
+
+    return statistics
+
+
+def _counted(items: Iterable, statistics: SelectorStatistics) -> Iterator:
+    """
+    Counts the items as they are scanned (the iterators are filtered lazily by the % selector)
+    """
+    for item in items:
+        statistics.scanned_items += 1
+        yield item
+
+
+def _is_index_lookup(selector: First | All, state: IndexedSequence | SortedSequence) -> bool:
+    """
+    Tells whether the @ or % selector was answered by an index of the IndexedSequence (the indexes are built by then)
+    or by binary searches in the SortedSequence
+    """
+    if isinstance(state, SortedSequence):
+        if isinstance(selector, First):
+            return len(state) > 0 and state.equal_positions(selector.key, selector.value) is not None
+        return state.positions(selector.key, selector.predicate) is not None
+
+    if isinstance(selector, First):
+        return len(state) > 0 and state.positions(selector.key, (selector.value,)) is not None
+    else:
+        return (
+            isinstance(selector.predicate, In) and state.positions(selector.key, selector.predicate.values) is not None
+        )
+
+
+def _call_filtered_scan(filtered_scan: FilteredScan, state: Any) -> Any:
+    """
+    Applies the one-pass filter on the state and records its statistics as the ones of its % selector
+    """
+    statistics = _statistics_of(_thread_statistics.selectors, filtered_scan.filter, SelectorStatistics)
+    statistics.calls += 1
+    # the index lookups build the missing indexes, as the one-pass filter would
+    is_index_lookup = (
+        filtered_scan.before is None
+        and isinstance(state, (IndexedSequence, SortedSequence))
+        and _is_index_lookup(filtered_scan.filter, state)
+    )
+    if is_index_lookup:
+        statistics.index_lookups += 1
+        scanned = None
+    else:
+        statistics.scans += 1
+
+        def scanned(items: Iterable) -> Iterator:
+            return _counted(items, statistics)
+
+    start = perf_counter_ns()
+    try:
+        value = filtered_scan(state, scanned)
+    except Exception:
+        statistics.total_ns += perf_counter_ns() - start
+        statistics.misses += 1
+        raise
+
+    statistics.total_ns += perf_counter_ns() - start
+    statistics.hits += 1
+
+    return value
+
+
+def _call_selector(selector: Callable[[Any], Any], state: Any) -> Any:
+    """
+    Applies the selector on the state and records its statistics
+    """
+    if type(selector) is FilteredScan:
+        return _call_filtered_scan(selector, state)
+
+    statistics = _statistics_of(_thread_statistics.selectors, selector, SelectorStatistics)
+    statistics.calls += 1
+    is_scanning = isinstance(selector, (First, All)) and not isinstance(state, (IndexedSequence, SortedSequence))
+    scanned_state = state
+    if is_scanning:
+        statistics.scans += 1
+        if isinstance(selector, First) or isinstance(state, Iterator):
+            scanned_state = _counted(iter(state), statistics)
+        elif isinstance(state, Sized):
+            statistics.scanned_items += len(state)
+
+    start = perf_counter_ns()
+    try:
+        value = selector(scanned_state)
+    except Exception:
+        statistics.total_ns += perf_counter_ns() - start
+        statistics.misses += 1
+        raise
+
+    statistics.total_ns += perf_counter_ns() - start
+    statistics.hits += 1
+    if isinstance(state, (IndexedSequence, SortedSequence)) and isinstance(selector, (First, All)):
+        if _is_index_lookup(selector, state):
+            statistics.index_lookups += 1
+        else:
+            statistics.scans += 1
+            statistics.scanned_items += len(state)
+
+    return value
+
+
+def instrumented_walk(walk: Walk, data: Any, default: Any, no_default: Any) -> Any:
+    """
+    Behaves like Walk.walk and records the statistics of the walk and of its selectors
+    """
+    statistics = _statistics_of(_thread_statistics.walks, walk, WalkStatistics)
+    statistics.calls += 1
+    start = perf_counter_ns()
+    state = data
+    try:
+        for failed_index, selector in enumerate(walk.steps):  # noqa: B007 (read by the error handler)
+            state = _call_selector(selector, state)
+    except Exception as error:
+        statistics.total_ns += perf_counter_ns() - start
+        if default is no_default:
+            statistics.misses += 1
+            raise source_walk_error(walk.selectors, walk.steps, failed_index, state) from error
+
+        statistics.defaults += 1
+        return default
+
+    statistics.total_ns += perf_counter_ns() - start
+    statistics.hits += 1
+
+    return state
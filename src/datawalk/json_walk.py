@@ -0,0 +1,366 @@
+"""
+Applies walks on a JSON document without loading it: the selectors drive a scanner of the JSON bytes.
+- the ByKey, First and BySlice selectors find their values by scanning the objects and arrays of the document,
+  the subtrees that they do not visit are skipped without building Python objects
+- the other selectors are applied on the decoded value of their state
+- the scan stops as soon as all the walks found their value
+
+Lenient by default, the scan differs from json.loads on documents that it does not read entirely: the first member of
+an object having a duplicate key wins, and the syntax errors located after the walked values are not detected.
+With strict=True, the objects and arrays visited by the walks are scanned up to their end (the last duplicate key wins,
+like with json.loads) and the end of the document is checked; the skipped subtrees are checked for balanced brackets
+and terminated strings only.
+
+Files are memory-mapped so that only the scanned parts of the document are read.
+"""
+
+from __future__ import annotations
+
+import json
+import re
+import sys
+from contextlib import contextmanager
+from itertools import islice
+from mmap import ACCESS_READ, mmap
+from typing import IO, TYPE_CHECKING, Any, Hashable, Iterator
+
+from datawalk.selectors import _DEFAULT, value_getter
+from datawalk.selectors.by_key import ByKey
+from datawalk.selectors.by_slice import BySlice
+from datawalk.selectors.first import First
+
+if TYPE_CHECKING:
+    from datawalk.walk_set import WalkNode, WalkSet
+
+JsonSource = bytes | bytearray | memoryview | str | IO
+
+_WHITESPACES = re.compile(rb'[ \t\n\r]*')
+# the rest of a string after its opening double-quote
+_STRING_END = re.compile(rb'[^"\\]*(?:\\.[^"\\]*)*"', re.DOTALL)
+# number, true, false or null
+_SCALAR = re.compile(rb'[^ \t\n\r,\]}]+')
+
+
+def _container_content_pattern(nesting_depth: int, possessive: bool) -> re.Pattern:
+    """
+    Matches the content of an object or array, including the nested containers up to the given depth so that they are
+    skipped by the regex engine. The match stops at the end of the container, or at a container nested deeper.
+    Possessive quantifiers do not keep backtracking states, which would otherwise grow with the content length.
+    """
+    repeat = b'*+' if possessive else b'*'
+    string = rb'"[^"\\]*(?:\\.[^"\\]*)*"'
+    content = rb'(?:[^"\[\]{}]+|' + string + rb')' + repeat
+    for _ in range(nesting_depth):
+        content = rb'(?:[^"\[\]{}]+|' + string + rb'|[\[{]' + content + rb'[\]}])' + repeat
+
+    return re.compile(content, re.DOTALL)
+
+
+def _container_content(python_version: tuple) -> re.Pattern:
+    if python_version >= (3, 11):
+        return _container_content_pattern(nesting_depth=8, possessive=True)
+
+    # without possessive quantifiers (Python 3.10), the nested containers are handled by _value_end
+    return _container_content_pattern(nesting_depth=0, possessive=False)
+
+
+_CONTAINER_CONTENT = _container_content(sys.version_info)
+
+# size in bytes under which a value is decoded rather than scanned
+_SMALL_VALUE_SIZE = 1024
+
+_QUOTE, _COMMA = ord('"'), ord(',')
+_OBJECT_START, _OBJECT_END, _ARRAY_START, _ARRAY_END = ord('{'), ord('}'), ord('['), ord(']')
+
+
+def _skip_whitespaces(document: bytes, position: int) -> int:
+    return _WHITESPACES.match(document, position).end()
+
+
+def _syntax_error(message: str, position: int) -> json.JSONDecodeError:
+    return json.JSONDecodeError(message, '', position)
+
+
+def _string_end(document: bytes, position: int) -> int:
+    if (string_end := _STRING_END.match(document, position + 1)) is None:
+        raise _syntax_error('unterminated string', position)
+
+    return string_end.end()
+
+
+def _value_end(document: bytes, position: int) -> int:
+    """
+    Returns the position after the JSON value starting at the given position, without decoding it
+    """
+    first_character = document[position]
+    if first_character == _QUOTE:
+        return _string_end(document, position)
+
+    if first_character not in (_OBJECT_START, _ARRAY_START):
+        if (scalar := _SCALAR.match(document, position)) is None:
+            raise _syntax_error('expecting value', position)
+        return scalar.end()
+
+    # the regex engine skips the content of the container, stopping at deeper nested containers or at the end
+    depth = 0
+    while position < len(document):
+        character = document[position]
+        if character in (_OBJECT_START, _ARRAY_START):
+            depth += 1
+        elif character in (_OBJECT_END, _ARRAY_END):
+            depth -= 1
+            if depth == 0:
+                return position + 1
+        else:
+            raise _syntax_error('unterminated string', position)
+
+        position = _CONTAINER_CONTENT.match(document, position + 1).end()
+
+    raise _syntax_error('unterminated object or array', position)
+
+
+def _decode(document: bytes, position: int) -> Any:
+    return json.loads(document[position : _value_end(document, position)])
+
+
+def _decode_key(document: bytes, position: int) -> tuple[str, int]:
+    key_end = _string_end(document, position)
+    raw_key = document[position + 1 : key_end - 1]
+    key = json.loads(document[position:key_end]) if b'\\' in raw_key else raw_key.decode('utf-8')
+
+    return key, key_end
+
+
+def _next_item_position(document: bytes, value_end: int, container_end: int) -> int | None:
+    """
+    Skips the comma after the current value, returns the position of the next item or None at the end of the container
+    """
+    position = _skip_whitespaces(document, value_end)
+    if document[position] == container_end:
+        return None
+    if document[position] != _COMMA:
+        raise _syntax_error('expecting comma delimiter', position)
+
+    return _skip_whitespaces(document, position + 1)
+
+
+def _members(document: bytes, position: int) -> Iterator[tuple[str, int]]:
+    """
+    Yields the key and the value position of the members of the JSON object starting at the given position
+    """
+    position = _skip_whitespaces(document, position + 1)
+    if document[position] == _OBJECT_END:
+        return
+
+    while True:
+        key, position = _decode_key(document, position)
+        position = _skip_whitespaces(document, position)
+        if document[position] != ord(':'):
+            raise _syntax_error('expecting colon delimiter', position)
+        position = _skip_whitespaces(document, position + 1)
+        yield key, position
+        if (position := _next_item_position(document, _value_end(document, position), _OBJECT_END)) is None:
+            return
+
+
+def _elements(document: bytes, position: int) -> Iterator[tuple[int, int]]:
+    """
+    Yields the start and end positions of the elements of the JSON array starting at the given position
+    """
+    position = _skip_whitespaces(document, position + 1)
+    if document[position] == _ARRAY_END:
+        return
+
+    while True:
+        element_end = _value_end(document, position)
+        yield position, element_end
+        if (position := _next_item_position(document, element_end, _ARRAY_END)) is None:
+            return
+
+
+def _first_match_position(document: bytes, array_position: int, first: First, strict: bool) -> int | None:
+    """
+    Returns the position of the first element of the array having the key and value of the First selector
+    """
+    for element_start, element_end in _elements(document, array_position):
+        if document[element_start] != _OBJECT_START or element_end - element_start <= _SMALL_VALUE_SIZE:
+            # decoding small values is faster than scanning them
+            element_value = value_getter(json.loads(document[element_start:element_end]), first.key)
+        else:
+            # decodes the value of the key only
+            element_value = _DEFAULT
+            for key, value_position in _members(document, element_start):
+                if key == first.key:
+                    element_value = _decode(document, value_position)
+                    if not strict:
+                        break
+
+        if element_value == first.value:
+            return element_start
+
+    return None
+
+
+def _is_streamable(selector: Any, container_start: int) -> bool:
+    match selector:
+        case ByKey(key=str()):
+            # the values of dict attributes (like "items") are retrieved from the decoded dict
+            return container_start == _OBJECT_START and not hasattr(dict, selector.key)
+        case ByKey(key=int()):
+            return container_start == _ARRAY_START and selector.key >= 0 and type(selector.key) is int
+        case First():
+            return container_start == _ARRAY_START
+        case BySlice():
+            return (
+                container_start == _ARRAY_START
+                and (selector.slicer.start or 0) >= 0
+                and (selector.slicer.stop or 0) >= 0
+                and (selector.slicer.step or 1) > 0
+            )
+        case _:
+            return False
+
+
+def _check_container(document: bytes, position: int):
+    """
+    Scans the members or the elements of the container starting at the given position, raising its syntax errors
+    """
+    items = _members(document, position) if document[position] == _OBJECT_START else _elements(document, position)
+    for _ in items:
+        pass
+
+
+def _walk_json_node(
+    walk_set: WalkSet, node: WalkNode, document: bytes, position: int, values: dict, default: Any, strict: bool
+):
+    """
+    Applies the selectors of the node subtree on the JSON value starting at the given position
+    """
+    if node.labels:
+        decoded_value = _decode(document, position)
+        for label in node.labels:
+            values[label] = decoded_value
+
+    container_start = document[position]
+    children_by_key: dict[str, WalkNode] = {}
+    children_by_index: dict[int, WalkNode] = {}
+    decoded_children: list[WalkNode] = []
+    for child_node in node.children.values():
+        selector = child_node.selector
+        if not _is_streamable(selector, container_start):
+            decoded_children.append(child_node)
+        elif isinstance(selector, ByKey) and container_start == _OBJECT_START:
+            children_by_key[selector.key] = child_node
+        elif isinstance(selector, ByKey):
+            children_by_index[selector.key] = child_node
+        elif isinstance(selector, First):
+            try:
+                match_position = _first_match_position(document, position, selector, strict)
+            except json.JSONDecodeError:
+                raise
+            except Exception as error:
+                walk_set._fail_subtree(child_node, lambda: _decode(document, position), values, default, error)
+                continue
+
+            if match_position is not None:
+                _walk_json_node(walk_set, child_node, document, match_position, values, default, strict)
+            elif document[_skip_whitespaces(document, position + 1)] == _ARRAY_END:
+                # the First selector returns None on empty sequences
+                walk_set._walk_subtree(child_node, None, values, default)
+            else:
+                walk_set._fail_subtree(
+                    child_node, lambda: _decode(document, position), values, default, StopIteration(repr(selector))
+                )
+        else:
+            slicer = selector.slicer
+            elements = islice(_elements(document, position), slicer.start, slicer.stop, slicer.step)
+            walk_set._walk_subtree(
+                child_node, [json.loads(document[start:end]) for start, end in elements], values, default
+            )
+
+    # scans the object members once for all the keys, until they are all found (up to the end in strict mode)
+    if children_by_key:
+        value_positions: dict[str, int] = {}
+        for key, value_position in _members(document, position):
+            if key in children_by_key and (strict or key not in value_positions):
+                value_positions[key] = value_position
+                if not strict and len(value_positions) == len(children_by_key):
+                    break
+
+        for key, child_node in children_by_key.items():
+            if (value_position := value_positions.get(key)) is not None:
+                _walk_json_node(walk_set, child_node, document, value_position, values, default, strict)
+            else:
+                walk_set._fail_subtree(child_node, lambda: _decode(document, position), values, default, KeyError(key))
+
+    # scans the array elements until the greatest index (up to the end in strict mode)
+    if children_by_index:
+        max_index = max(children_by_index)
+        for index, (element_start, _) in enumerate(_elements(document, position)):
+            if (child_node := children_by_index.pop(index, None)) is not None:
+                _walk_json_node(walk_set, child_node, document, element_start, values, default, strict)
+            if index == max_index and not strict:
+                break
+
+        for child_node in children_by_index.values():
+            walk_set._fail_subtree(
+                child_node, lambda: _decode(document, position), values, default, IndexError('list index out of range')
+            )
+
+    # the other selectors are applied on the decoded value
+    if decoded_children:
+        decoded_value = _decode(document, position)
+        for child_node in decoded_children:
+            try:
+                child_state = child_node.selector(decoded_value)
+            except Exception as error:
+                walk_set._fail_subtree(child_node, lambda: decoded_value, values, default, error)
+            else:
+                walk_set._walk_subtree(child_node, child_state, values, default)
+
+    # the containers decoded or scanned by keys or indices are checked, not the ones walked with First or BySlice
+    if strict and not (node.labels or decoded_children or children_by_key or children_by_index):
+        _check_container(document, position)
+
+
+@contextmanager
+def _json_document(source: JsonSource) -> Iterator[bytes]:
+    """
+    Provides the bytes of the JSON source, files are memory-mapped when possible
+    """
+    if isinstance(source, (bytes, bytearray)):
+        yield source
+    elif isinstance(source, memoryview):
+        # the slices of memoryviews can be neither decoded nor parsed by json.loads
+        yield source.tobytes()
+    elif isinstance(source, str):
+        yield source.encode('utf-8')
+    else:
+        try:
+            document = mmap(source.fileno(), 0, access=ACCESS_READ)
+        except (AttributeError, OSError, ValueError):
+            # file-like objects without file descriptor, empty files
+            content = source.read()
+            yield content.encode('utf-8') if isinstance(content, str) else content
+        else:
+            with document:
+                yield document
+
+
+def walk_json(walk_set: WalkSet, source: JsonSource, default: Any, strict: bool) -> dict[Hashable, Any]:
+    """
+    Applies the walks of the walk set on the JSON document and returns their values by label
+    """
+    values = dict.fromkeys(walk_set.walks)
+    with _json_document(source) as document:
+        if (position := _skip_whitespaces(document, 0)) == len(document):
+            raise _syntax_error('expecting value', position)
+        try:
+            _walk_json_node(walk_set, walk_set.root, document, position, values, default, strict)
+            if strict and (end := _skip_whitespaces(document, _value_end(document, position))) != len(document):
+                raise _syntax_error('extra data', end)
+        except IndexError as error:
+            # the errors of the selectors are raised as WalkError, the scan went past the end of a truncated document
+            raise _syntax_error('unexpected end of document', len(document)) from error
+
+    return values
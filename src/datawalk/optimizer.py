@@ -0,0 +1,172 @@
+"""
+Rewrites the selectors of a walk into cheaper steps returning the same values, once per walk (when its steps are first
+requested, see Walk.steps):
+- consecutive slices applicable on iterators (no negative value) are merged: [2:] [:3] -> [2:5]
+- a % selector is fused with the slice before it, and with the slice and the index after it, into a FilteredScan which
+  filters the items lazily: % (key, values) / 0 stops scanning at the first match (like @), % (key, values) [:10] at the
+  10th one, and [1000:] % (key, values) / 0 scans the items from the 1000th one without copying them
+
+The errors describe the selectors as written: the selectors replaced by a failing step are applied again on its data
+state to find the failing one (see source_walk_error). Because the scans stop early, the predicate is not applied on
+the items following the requested matches (the walk cannot fail on them). The instrumentation records the one-pass
+filters as their % selector (see datawalk.instrumentation).
+>>> print(Walk.parse(".friends %(name in ['Suzie Q']) [0] .phone").explain())
+.friends
+%(name in ['Suzie Q']) [0]  # one-pass filter, stops at the match 0
+.phone
+"""
+
+from collections.abc import Iterator
+from typing import Any, Callable, Sequence
+
+from datawalk.errors import WalkError
+from datawalk.selectors.by_slice import BySlice
+from datawalk.selectors.fan_out import Branches, fold_fan_outs
+from datawalk.selectors.filtered_scan import FilteredScan, is_lazy_slice
+
+Selector = Callable[[Any], Any]
+
+
+def merged_slices(first: slice, second: slice) -> slice | None:
+    """
+    Returns the slice selecting the same items as the first slice followed by the second one, or None if one of them
+    has negative values (the length of the sliced sequence would be needed)
+    """
+    if not (is_lazy_slice(first) and is_lazy_slice(second)):
+        return None
+
+    first_start, first_step = first.start or 0, first.step or 1
+    second_start, second_step = second.start or 0, second.step or 1
+    # the items are selected up to the stop of the first slice and up to the stop of the second slice
+    stops = [first.stop] if first.stop is not None else []
+    if second.stop is not None:
+        stops.append(first_start + second.stop * first_step)
+
+    start = first_start + second_start * first_step
+    step = first_step * second_step
+
+    return slice(start or None, min(stops) if stops else None, None if step == 1 else step)
+
+
+def _fused(first: Selector, second: Selector) -> Selector | None:
+    """
+    Returns the step applying both steps, or None if they cannot be fused
+    """
+    first_selectors = first.selectors if type(first) is FilteredScan else (first,)
+    second_selectors = second.selectors if type(second) is FilteredScan else (second,)
+    if (
+        type(first_selectors[-1]) is BySlice
+        and type(second_selectors[0]) is BySlice
+        and (slicer := merged_slices(first_selectors[-1].slicer, second_selectors[0].slicer)) is not None
+    ):
+        chain = (*first_selectors[:-1], BySlice(slicer), *second_selectors[1:])
+    else:
+        chain = (*first_selectors, *second_selectors)
+
+    if len(chain) == 1:
+        return chain[0]
+
+    return FilteredScan(chain) if FilteredScan.can_fuse(chain) else None
+
+
+def _rewritten(selectors: Sequence[Selector]) -> list[tuple[Selector, tuple[Selector, ...]]]:
+    """
+    Returns the optimized steps, each one with the selectors it replaces
+    """
+    rewritten: list[tuple[Selector, tuple[Selector, ...]]] = []
+    for selector in selectors:
+        step, replaced = selector, (selector,)
+        while rewritten and (fused_step := _fused(rewritten[-1][0], step)) is not None:
+            step, replaced = fused_step, rewritten.pop()[1] + replaced
+        rewritten.append((step, replaced))
+
+    return rewritten
+
+
+def optimize_selectors(selectors: Sequence[Selector]) -> tuple[Selector, ...]:
+    """
+    Returns the steps applying the selectors with the same results, rewritten into cheaper forms
+    """
+    return tuple(step for step, _ in _rewritten(selectors))
+
+
+def plan_steps(selectors: Sequence[Selector]) -> tuple[Selector, ...]:
+    """
+    Returns the steps executing the walk made of the selectors: the optimized selectors, the ones from the first
+    fan-out selector being folded into Branches
+    """
+    return fold_fan_outs(optimize_selectors(selectors))
+
+
+def _step_sources(selectors: Sequence[Selector], steps: Sequence[Selector]) -> list[tuple[Selector, ...]]:
+    """
+    Returns the selectors replaced by each step of the planned walk
+    """
+    sources = [replaced for _, replaced in _rewritten(selectors)]
+    # the steps from the first fan-out selector are folded into Branches, the last step
+    sources[len(steps) - 1 :] = [sum(sources[len(steps) - 1 :], ())]
+
+    return sources
+
+
+def source_walk_error(
+    selectors: Sequence[Selector], steps: Sequence[Selector], failed_step: int, data_state: Any, replay: bool = True
+) -> WalkError:
+    """
+    Creates the error of a walk whose step failed on the data state, describing the written selectors: the selectors
+    replaced by the step are applied again on the data state to find the failing one, unless replay is False (async
+    walks, whose selectors can return awaitables), the state is an iterator (consumed by the step) or the step applies
+    fan-out branches (the failing branch is unknown). The error points to the first replaced selector otherwise.
+    """
+    if len(steps) == len(selectors):
+        # no step replaces several selectors
+        return WalkError(data_state=data_state, selectors=selectors, failed_index=failed_step)
+
+    sources = _step_sources(selectors, steps)
+    failed_index = sum(map(len, sources[:failed_step]))
+    replaced = sources[failed_step]
+    if (
+        replay
+        and len(replaced) > 1
+        and type(steps[failed_step]) is not Branches
+        and not isinstance(data_state, Iterator)
+    ):
+        replayed_state = data_state
+        for replayed_index, selector in enumerate(replaced):
+            try:
+                replayed_state = selector(replayed_state)
+            except Exception:
+                return WalkError(
+                    data_state=replayed_state, selectors=selectors, failed_index=failed_index + replayed_index
+                )
+
+    return WalkError(data_state=data_state, selectors=selectors, failed_index=failed_index)
+
+
+def _description(step: Selector, replaced: tuple[Selector, ...]) -> str:
+    if type(step) is BySlice:
+        return f'merged slices {" ".join(map(repr, replaced))}'
+
+    parts = ['one-pass filter']
+    if step.before is not None:
+        parts.append(f'of the items {BySlice(step.before)!r}')
+    if step.after is not None:
+        parts.append(f'stops after the matches {BySlice(step.after)!r}')
+    if step.index is not None:
+        parts.append(f'stops at the match {step.index}')
+    description = ', '.join(parts)
+    if replaced != step.selectors:
+        description += f' (from {" ".join(map(repr, replaced))})'
+
+    return description
+
+
+def explain_selectors(selectors: Sequence[Selector]) -> str:
+    """
+    Describes the optimized steps of the walk made of the selectors, one step per line: the rewritten steps are
+    followed by a comment describing the rewrite
+    """
+    return '\n'.join(
+        repr(step) if len(replaced) == 1 else f'{step!r}  # {_description(step, replaced)}'
+        for step, replaced in _rewritten(selectors)
+    )
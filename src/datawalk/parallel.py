@@ -0,0 +1,191 @@
+"""
+Applies walks on records with a pool of processes:
+- the walk specifications are sent once to each worker process by the pool initializer, which compiles and keeps them
+- the records are sent by chunks, the values are sent back by chunks
+- a bounded number of chunks is processed at a time so that the values do not pile up in memory when they are
+  consumed slowly
+
+or with a pool of threads, which share the compiled walks and the records without pickling them: the walks scale
+with the number of threads on free-threaded interpreters, they are serialized by the GIL otherwise.
+"""
+
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from itertools import islice
+from typing import Any, Callable, Iterable, Iterator, Sequence
+
+from datawalk.compiler import compile_selectors
+from datawalk.optimizer import plan_steps
+from datawalk.spec import from_spec
+
+# flag given to the compiled walks, default values are not given through a sentinel because they are pickled
+_NO_DEFAULT = object()
+
+# state of the worker processes, set by init_worker
+_worker_walk: Callable[[Any], Any] | None = None
+
+
+def records_walker(specs: Sequence[Sequence], has_default: bool, default: Any) -> Callable[[Any], Any]:
+    """
+    Creates a function returning the value of the walk applied on a record, or the tuple of the values of the walks
+    """
+    compiled_walks = []
+    for spec in specs:
+        selectors = from_spec(spec)
+        compiled_walks.append(compile_selectors(selectors, plan_steps(selectors), _NO_DEFAULT))
+
+    return compiled_walker(compiled_walks, has_default, default)
+
+
+def compiled_walker(
+    compiled_walks: Sequence[Callable[..., Any]], has_default: bool, default: Any
+) -> Callable[[Any], Any]:
+    """
+    Creates a function returning the value of the compiled walk applied on a record, or the tuple of the values of
+    the compiled walks
+    """
+    defaults = {'default': default} if has_default else {}
+    if len(compiled_walks) == 1:
+        compiled_walk = compiled_walks[0]
+        return lambda record: compiled_walk(record, **defaults)
+
+    return lambda record: tuple(compiled_walk(record, **defaults) for compiled_walk in compiled_walks)
+
+
+def init_worker(specs: Sequence[Sequence], has_default: bool, default: Any):
+    """
+    Initializer of the worker processes: compiles the walks once per process
+    """
+    global _worker_walk
+    _worker_walk = records_walker(specs, has_default, default)
+
+
+def worker_walker() -> Callable[[Any], Any]:
+    """
+    Returns the walker compiled by init_worker in the current worker process
+    """
+    return _worker_walk
+
+
+def _walk_records(records: list) -> list:
+    return [_worker_walk(record) for record in records]
+
+
+def pooled_map(
+    task: Callable[..., list],
+    tasks_arguments: Iterable[tuple],
+    workers: int,
+    initializer: Callable[..., None],
+    initargs: tuple,
+    ordered: bool = True,
+) -> Iterator[list]:
+    """
+    Submits the tasks to a pool of processes and yields their results (lists of values), keeping at most two tasks
+    per worker in progress
+    """
+    with ProcessPoolExecutor(workers, initializer=initializer, initargs=initargs) as pool:
+        yield from _submitted_results(pool, task, tasks_arguments, 2 * workers, ordered)
+
+
+def _submitted_results(
+    pool: Executor, task: Callable[..., list], tasks_arguments: Iterable[tuple], max_pending: int, ordered: bool
+) -> Iterator[list]:
+    pending: deque[Future] = deque()
+    for task_arguments in tasks_arguments:
+        pending.append(pool.submit(task, *task_arguments))
+        while len(pending) >= max_pending:
+            yield from _completed_results(pending, ordered)
+
+    while pending:
+        yield from _completed_results(pending, ordered)
+
+
+def _completed_results(pending: deque[Future], ordered: bool) -> Iterator[list]:
+    if ordered:
+        yield pending.popleft().result()
+    else:
+        done, _ = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            pending.remove(future)
+            yield future.result()
+
+
+def record_chunks(records: Iterable, chunk_size: int) -> Iterator[tuple[list]]:
+    """
+    Splits the records into lists of chunk_size records, wrapped in the tuples of arguments of the pooled tasks
+    """
+    records = iter(records)
+    while chunk := list(islice(records, chunk_size)):
+        yield (chunk,)
+
+
+def map_parallel(
+    specs: Sequence[Sequence],
+    records: Iterable,
+    workers: int,
+    chunk_size: int,
+    has_default: bool,
+    default: Any,
+    ordered: bool,
+) -> Iterator[Any]:
+    """
+    Applies the walks on the records by chunks in a pool of processes, or in the current process with one worker
+    """
+    if chunk_size < 1:
+        raise ValueError(f'the chunk size must be positive: {chunk_size}')
+
+    return _map_records(specs, records, workers, chunk_size, has_default, default, ordered)
+
+
+def _map_records(
+    specs: Sequence[Sequence],
+    records: Iterable,
+    workers: int,
+    chunk_size: int,
+    has_default: bool,
+    default: Any,
+    ordered: bool,
+) -> Iterator[Any]:
+    if workers == 1:
+        yield from map(records_walker(specs, has_default, default), records)
+    else:
+        initargs = (specs, has_default, default)
+        chunks = record_chunks(records, chunk_size)
+        for values in pooled_map(_walk_records, chunks, workers, init_worker, initargs, ordered):
+            yield from values
+
+
+def map_threaded(
+    walker: Callable[[Any], Any],
+    records: Iterable,
+    workers: int,
+    chunk_size: int,
+    ordered: bool,
+) -> Iterator[Any]:
+    """
+    Applies the walker on the records by chunks in a pool of threads, or in the current thread with one worker
+    """
+    if chunk_size < 1:
+        raise ValueError(f'the chunk size must be positive: {chunk_size}')
+
+    return _map_threaded_records(walker, records, workers, chunk_size, ordered)
+
+
+def _map_threaded_records(
+    walker: Callable[[Any], Any],
+    records: Iterable,
+    workers: int,
+    chunk_size: int,
+    ordered: bool,
+) -> Iterator[Any]:
+    if workers == 1:
+        yield from map(walker, records)
+    else:
+
+        def walk_chunk(chunk: list) -> list:
+            return [walker(record) for record in chunk]
+
+        chunks = record_chunks(records, chunk_size)
+        with ThreadPoolExecutor(workers, thread_name_prefix='datawalk') as pool:
+            for values in _submitted_results(pool, walk_chunk, chunks, 2 * workers, ordered):
+                yield from values
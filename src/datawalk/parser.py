@@ -0,0 +1,117 @@
+"""
+Parses the selectors of a walk from its string representation:
+>>> parse_selectors(".friends %(age >= 18) @(name==Suzie Q) [0:2] .phones [1] {name,age}")
+>>> parse_selectors(".friends [*] .name ..city")
+>>> parse_selectors(".pets group(type)")
+>>> parse_selectors(".friends partition(age >= 18) [0]")
+
+The values of the @ and % selectors are parsed as Python literals, and kept as strings otherwise: the representation
+of @(age==24) does not tell whether 24 is a number or a string, it is parsed as a number.
+Custom selectors cannot be parsed since their representation is arbitrary.
+"""
+
+import re
+from ast import literal_eval
+from typing import Any, Callable
+
+from datawalk.errors import SelectorError
+from datawalk.selectors.all import All
+from datawalk.selectors.by_key import ByKey
+from datawalk.selectors.by_slice import BySlice
+from datawalk.selectors.fan_out import Descendants, Each
+from datawalk.selectors.first import First
+from datawalk.selectors.group_by import GroupBy
+from datawalk.selectors.partition import Partition
+from datawalk.selectors.picker import Picker
+from datawalk.selectors.predicates import Between, Compare, Exists, In, Not, Predicate
+
+# a selector ends before a space followed by the start of another selector, or at the end of the text
+_SELECTOR_END = r'(?= (?:\.|\[|@\(|%\(|\{|group\(|count\(|partition\()|$)'
+_PREDICATE = r'(?:not )*(?:in .*?|exists|between .*? and .*?|(?:[=!<>]=|<|>) .*?)'
+_SELECTOR = re.compile(
+    '|'.join(
+        pattern + _SELECTOR_END
+        for pattern in (
+            r'\.\.(?P<descendants_key>.*?)',
+            r'\.(?P<key>.*?)',
+            r'\[(?P<each>\*)\]',
+            r'\[(?P<index>-?\d+)\]',
+            r'\[(?P<slice>-?\d*:-?\d*(?::-?\d*)?)\]',
+            r'@\((?P<first_key>.*?)==(?P<first_value>.*?)\)',
+            rf'%\((?P<all_key>.*?) (?P<predicate>{_PREDICATE})\)',
+            r'\{(?P<pickers>.*?)\}',
+            r'group\((?P<group_key>.*?)\)',
+            r'count\((?P<count_key>.*?)\)',
+            rf'partition\((?P<partition_key>.*?) (?P<partition_predicate>{_PREDICATE})\)',
+        )
+    ),
+    re.DOTALL,
+)
+
+
+def _parse_value(text: str) -> Any:
+    try:
+        return literal_eval(text)
+    except (ValueError, TypeError, SyntaxError, MemoryError, RecursionError):
+        return text
+
+
+def _parse_predicate(text: str) -> Predicate:
+    if text.startswith('not '):
+        return Not(_parse_predicate(text[4:]))
+    if text == 'exists':
+        return Exists()
+    if text.startswith('in '):
+        values = _parse_value(text[3:])
+        if isinstance(values, str):
+            raise SelectorError(f'invalid values of the in predicate: {text[3:]}')
+        return In(values)
+    if text.startswith('between '):
+        lower, _, upper = text[8:].partition(' and ')
+        return Between(_parse_value(lower), _parse_value(upper))
+
+    comparator, _, value = text.partition(' ')
+    return Compare(comparator, _parse_value(value))
+
+
+def _parse_selector(selector_match: re.Match) -> Callable[[Any], Any]:
+    match selector_match.lastgroup:
+        case 'key':
+            return ByKey(selector_match['key'])
+        case 'descendants_key':
+            return Descendants(selector_match['descendants_key'])
+        case 'each':
+            return Each()
+        case 'index':
+            return ByKey(int(selector_match['index']))
+        case 'slice':
+            return BySlice(slice(*(int(index) if index else None for index in selector_match['slice'].split(':'))))
+        case 'first_value':
+            return First(selector_match['first_key'], _parse_value(selector_match['first_value']))
+        case 'predicate':
+            return All(selector_match['all_key'], _parse_predicate(selector_match['predicate']))
+        case 'group_key':
+            return GroupBy(selector_match['group_key'])
+        case 'count_key':
+            return GroupBy(selector_match['count_key'], count=True)
+        case 'partition_predicate':
+            return Partition(selector_match['partition_key'], _parse_predicate(selector_match['partition_predicate']))
+        case _:
+            return Picker(selector_match['pickers'].split(',') if selector_match['pickers'] else ())
+
+
+def parse_selectors(text: str) -> tuple[Callable[[Any], Any], ...]:
+    """
+    Returns the selectors of the walk whose representation is given, separated by spaces
+    """
+    selectors = []
+    position = 0
+    while position < len(text):
+        if (selector_match := _SELECTOR.match(text, position)) is None:
+            raise SelectorError(f'invalid selector at position {position} of the walk: {text}')
+
+        selectors.append(_parse_selector(selector_match))
+        # skips the space separating the selectors
+        position = selector_match.end() + 1
+
+    return tuple(selectors)
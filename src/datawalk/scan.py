@@ -0,0 +1,173 @@
+"""
+Applies walks on the lines of a JSON Lines file with a pool of processes:
+- the file is memory-mapped and split into byte ranges aligned on the line ends
+- each worker process maps the file once, decodes the lines of the ranges it is given and applies the compiled walks
+- the values are streamed back in the order of the lines, or in the order of completion if requested
+
+The walks are sent once to each worker, their custom selectors must be picklable (lambdas are not).
+
+The streams which cannot be memory-mapped (standard input, pipes, sockets) are scanned by chunks of lines, which are
+sent to the workers and decoded by them: a bounded number of chunks is read ahead, the memory use does not depend on
+the length of the stream.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from mmap import ACCESS_READ, mmap
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, Iterable, Iterator, Sequence
+
+from datawalk.parallel import init_worker, pooled_map, record_chunks, records_walker, worker_walker
+
+if TYPE_CHECKING:
+    from datawalk import Walk
+
+# size of the byte ranges processed by the workers
+DEFAULT_CHUNK_SIZE = 4 * 2**20
+
+# number of lines of the chunks of the streams processed by the workers
+DEFAULT_LINES_CHUNK_SIZE = 2000
+
+_NO_DEFAULT = object()
+
+_LINE_END = b'\n'
+
+# file mapped in the worker processes by _init_worker, the walks are compiled by parallel.init_worker
+_worker_lines: mmap | None = None
+
+
+def chunk_ranges(document: bytes | mmap, chunk_size: int) -> Iterator[tuple[int, int]]:
+    """
+    Splits the document into ranges of about chunk_size bytes, ending after a line end (or at the end of the document)
+    """
+    start, document_size = 0, len(document)
+    while start < document_size:
+        line_end = document.find(_LINE_END, min(start + chunk_size, document_size) - 1)
+        end = document_size if line_end == -1 else line_end + 1
+        yield start, end
+        start = end
+
+
+def _walk_lines(document: bytes | mmap, start: int, end: int, walk: Callable[[Any], Any]) -> list[Any]:
+    # blank lines are skipped
+    return [walk(json.loads(line)) for line in document[start:end].splitlines() if line.strip()]
+
+
+def _init_worker(path: str, specs: Sequence[Sequence], has_default: bool, default: Any):
+    global _worker_lines
+    with open(path, 'rb') as lines_file:
+        _worker_lines = mmap(lines_file.fileno(), 0, access=ACCESS_READ)
+    init_worker(specs, has_default, default)
+
+
+def _walk_chunk(start: int, end: int) -> list[Any]:
+    return _walk_lines(_worker_lines, start, end, worker_walker())
+
+
+def _decode_lines(lines: Iterable[bytes | str], walk: Callable[[Any], Any]) -> Iterator[Any]:
+    # blank lines are skipped
+    return (walk(json.loads(line)) for line in lines if line.strip())
+
+
+def _walk_stream_chunk(lines: list[bytes | str]) -> list[Any]:
+    return list(_decode_lines(lines, worker_walker()))
+
+
+def scan_jsonl(
+    path: str | os.PathLike,
+    *walks: Walk,
+    workers: int | None = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ordered: bool = True,
+    default: Any = _NO_DEFAULT,
+) -> Iterator[Any]:
+    """
+    Applies the walks on each line of the JSON Lines file and yields the value of the walk, or the tuple of the values
+    of the walks when several walks are given. The lines are processed by chunks of about chunk_size bytes:
+    - by a pool of workers processes (os.cpu_count() by default)
+    - in the current process if workers is 1
+    The values are yielded in the order of the lines, unless ordered is False.
+    >>> for name, city in scan_jsonl('users.jsonl', Walk / 'name', Walk / 'address' / 'city', default=None):
+    ...     pass
+    """
+    if not walks:
+        raise ValueError('at least one walk must be given to scan the lines')
+    if chunk_size < 1:
+        raise ValueError(f'the chunk size must be positive: {chunk_size}')
+
+    specs = [walk.to_spec() for walk in walks]
+    workers = workers or os.cpu_count() or 1
+    return _scan_lines(str(Path(path)), specs, workers, chunk_size, ordered, default is not _NO_DEFAULT, default)
+
+
+def _scan_lines(
+    path: str,
+    specs: Sequence[Sequence],
+    workers: int,
+    chunk_size: int,
+    ordered: bool,
+    has_default: bool,
+    default: Any,
+) -> Iterator[Any]:
+    with open(path, 'rb') as lines_file:
+        if os.fstat(lines_file.fileno()).st_size == 0:
+            return
+
+        with mmap(lines_file.fileno(), 0, access=ACCESS_READ) as lines:
+            chunks = chunk_ranges(lines, chunk_size)
+            if workers == 1:
+                walk = records_walker(specs, has_default, default)
+                for start, end in chunks:
+                    yield from _walk_lines(lines, start, end, walk)
+            else:
+                initargs = (path, specs, has_default, default)
+                for values in pooled_map(_walk_chunk, chunks, workers, _init_worker, initargs, ordered):
+                    yield from values
+
+
+def scan_lines(
+    lines: Iterable[bytes | str],
+    *walks: Walk,
+    workers: int | None = None,
+    chunk_size: int = DEFAULT_LINES_CHUNK_SIZE,
+    ordered: bool = True,
+    default: Any = _NO_DEFAULT,
+) -> Iterator[Any]:
+    """
+    Applies the walks on each JSON line of the stream (an open file, sys.stdin.buffer, etc.) and yields the value of
+    the walk, or the tuple of the values of the walks when several walks are given. The lines are processed by chunks
+    of chunk_size lines:
+    - by a pool of workers processes (os.cpu_count() by default), which decode the lines
+    - in the current process if workers is 1
+    The values are yielded in the order of the lines, unless ordered is False.
+    >>> for name, city in scan_lines(sys.stdin.buffer, Walk / 'name', Walk / 'address' / 'city', default=None):
+    ...     pass
+    """
+    if not walks:
+        raise ValueError('at least one walk must be given to scan the lines')
+    if chunk_size < 1:
+        raise ValueError(f'the chunk size must be positive: {chunk_size}')
+
+    specs = [walk.to_spec() for walk in walks]
+    workers = workers or os.cpu_count() or 1
+    return _scan_stream(lines, specs, workers, chunk_size, ordered, default is not _NO_DEFAULT, default)
+
+
+def _scan_stream(
+    lines: Iterable[bytes | str],
+    specs: Sequence[Sequence],
+    workers: int,
+    chunk_size: int,
+    ordered: bool,
+    has_default: bool,
+    default: Any,
+) -> Iterator[Any]:
+    if workers == 1:
+        yield from _decode_lines(lines, records_walker(specs, has_default, default))
+    else:
+        initargs = (specs, has_default, default)
+        chunks = record_chunks(lines, chunk_size)
+        for values in pooled_map(_walk_stream_chunk, chunks, workers, init_worker, initargs, ordered):
+            yield from values
@@ -1,10 +1,92 @@
-from typing import Hashable
+from collections import namedtuple
+from functools import lru_cache
+from inspect import getattr_static
+from operator import attrgetter, itemgetter, methodcaller
+from typing import Any, Callable, Hashable, Iterable
 
 _DEFAULT = object()
 
+# type of the descriptors of the named tuple fields
+_TUPLE_FIELD = type(namedtuple('_Item', 'value').value)
+
 
 def value_getter(item: dict | object, key: Hashable):
     if isinstance(item, dict):
         return item.get(key, _DEFAULT)
     else:
         return getattr(item, key, _DEFAULT)
+
+
+def typed(value: Any) -> Any:
+    """
+    Pairs the value with its type, recursively in the tuples, lists, sets and dicts, so that the selectors built with
+    equal values of different types (1, 1.0 and True) are not equal: they have different representations.
+    The tuples and lists are interchangeable (the walk specifications turn lists into tuples), like sets and frozensets.
+    """
+    value_type = type(value)
+    if value_type is tuple or value_type is list:
+        return tuple, tuple(map(typed, value))
+    elif value_type is set or value_type is frozenset:
+        return frozenset, frozenset(map(typed, value))
+    elif value_type is dict:
+        return dict, tuple((typed(key), typed(item)) for key, item in value.items())
+    else:
+        return value_type, value
+
+
+def named_tuple_index(item_type: type, key: Hashable) -> int | None:
+    """
+    Returns the index of the named tuple field, if the key is one of the fields of the named tuple type
+    """
+    if (
+        issubclass(item_type, tuple)
+        and isinstance(key, str)
+        and isinstance(getattr_static(item_type, key, None), _TUPLE_FIELD)
+    ):
+        return item_type._fields.index(key)
+
+    return None
+
+
+def _typed_value_getter(item_type: type, key: Hashable) -> Callable[[Any], Any] | None:
+    """
+    Returns the fastest function behaving like value_getter for the items of the given type (C-implemented getters),
+    or None if there is none. The attribute getters raise AttributeError when the attribute is missing.
+    """
+    try:
+        return _cached_typed_value_getter(item_type, key)
+    except TypeError:
+        # unhashable key or item type (some metaclasses make their classes unhashable), which cannot be cached
+        return None
+
+
+@lru_cache(maxsize=1024)
+def _cached_typed_value_getter(item_type: type, key: Hashable) -> Callable[[Any], Any] | None:
+    if issubclass(item_type, dict):
+        return methodcaller('get', key, _DEFAULT)
+    if (field_index := named_tuple_index(item_type, key)) is not None:
+        return itemgetter(field_index)
+    # attrgetter handles dotted names as paths of attributes
+    if isinstance(key, str) and '.' not in key:
+        return attrgetter(key)
+
+    return None
+
+
+def item_values(items: Iterable, key: Hashable) -> list:
+    """
+    Returns the values of the key in the items (not an iterator), like value_getter applied on each item.
+    The values of items sharing the same type are retrieved with the fastest getter of their type, in one pass.
+    """
+    # the types are compared by identity, some metaclasses make them unhashable
+    if (
+        len(set(map(id, map(type, items)))) == 1
+        and (typed_getter := _typed_value_getter(type(next(iter(items))), key)) is not None
+    ):
+        try:
+            return list(map(typed_getter, items))
+        except AttributeError:
+            # some items miss the attribute
+            pass
+
+    return [value_getter(item, key) for item in items]
@@ -1,22 +1,78 @@
-from typing import Hashable, Iterable, Sequence
+from collections.abc import Iterator
+from typing import Any, Callable, Hashable, Iterable, Sequence
 
-from datawalk.selectors import value_getter
+from datawalk.indexed_sequence import IndexedSequence
+from datawalk.selectors import _DEFAULT, _typed_value_getter, typed, value_getter
+from datawalk.selectors.predicates import In, Predicate, as_predicate
+from datawalk.sorted_sequence import SortedSequence
 
 
 class All:
-    def __init__(self, key: Hashable, values: Sequence):
+    """
+    Selects the items whose key value satisfies the given predicate, or belongs to the given values.
+    Iterators are filtered lazily: the selector returns an iterator instead of a list.
+    """
+
+    __slots__ = ('key', 'predicate')
+
+    def __init__(self, key: Hashable, predicate: Predicate | Sequence):
         self.key = key
-        self.values = values
+        self.predicate = as_predicate(predicate)
+
+    def __call__(self, state: Iterable[dict | object]) -> Sequence | Iterator:
+        key, predicate = self.key, self.predicate
+        if isinstance(state, Iterator):
+            return (item for item in state if predicate(value_getter(item, key)))
+
+        # hash lookups in indexed sequences
+        if (
+            isinstance(state, IndexedSequence)
+            and isinstance(self.predicate, In)
+            and (positions := state.positions(self.key, self.predicate.values)) is not None
+        ):
+            return [state[position] for position in positions]
+
+        # binary searches in sorted sequences
+        if isinstance(state, SortedSequence) and (positions := state.positions(self.key, self.predicate)) is not None:
+            if isinstance(positions, range):
+                return list(state.items[positions.start : positions.stop])
+            return [state[position] for position in positions]
+
+        return matching_items(state, key, predicate)
 
-    def __call__(self, state: Iterable[dict | object]) -> Sequence:
-        """
-        Raises:
-            StopIteration: if the state sequence contains no item with the given key and value
-        """
-        if len(state) == 0:
-            return []
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, All) and typed(other.key) == typed(self.key) and other.predicate == self.predicate
 
-        return [item for item in state if value_getter(item, self.key) in self.values]
+    def __hash__(self) -> int:
+        return hash((All, self.key, self.predicate))
+
+    def __reduce__(self) -> tuple:
+        return All, (self.key, self.predicate)
 
     def __repr__(self) -> str:
-        return f'%({self.key} in {self.values})'
+        return f'%({self.key} {self.predicate})'
+
+
+def matching_items(items: Iterable[dict | object], key: Hashable, predicate: Callable[[Any], bool]) -> list:
+    """
+    Returns the items whose key value satisfies the predicate, in one pass: the values are retrieved with the fastest
+    getter of the type of the items (see item_values), selected again when the type changes
+    """
+    matches = []
+    getter_type = getter = None
+    for item in items:
+        if type(item) is not getter_type:
+            getter_type = type(item)
+            if (getter := _typed_value_getter(getter_type, key)) is None:
+                getter = lambda item: value_getter(item, key)  # noqa: E731
+
+        try:
+            value = getter(item)
+        except AttributeError:
+            # the item misses the attribute
+            value = _DEFAULT
+
+        if predicate(value):
+            matches.append(item)
+
+    return matches
@@ -1,16 +1,28 @@
-from typing import Any, Hashable, Sequence
+from collections.abc import Iterator, Mapping
+from itertools import islice
+from operator import attrgetter, itemgetter
+from typing import Any, Callable, Hashable, Sequence
+
+from datawalk.selectors import _DEFAULT, named_tuple_index
 
 
 class ByKey:
     """
     Returns the value associated with the given key:
-    - an index for a sequence
+    - an index for a sequence (or the nth item of an iterator)
     - a key for a dict
     - an attribute name otherwise
+
+    The way to access the value is resolved once per type of state and cached (records are often of the same type).
     """
 
+    __slots__ = ('key', 'is_dict_attribute', '_getters')
+
     def __init__(self, key: Hashable):
         self.key = key
+        # missing keys of dicts are looked up as attributes, like "items"
+        self.is_dict_attribute = isinstance(key, str) and hasattr(dict, key)
+        self._getters: dict[type, Callable[[Any], Any]] = {}
 
     def __call__(self, state: dict | Sequence | object) -> Any:
         """
@@ -20,14 +32,80 @@ class ByKey:
             AttributeError: when the state object has no attribute of the given name (self.key)
             KeyError: (LookupError) when the state dict does not have the given key (self.key)
             IndexError: (LookupError) when the state dict does not have the given key (self.key)
+            StopIteration: when the state iterator has less items than the index
+            ValueError: when the index is negative and the state is an iterator
+        """
+        if (getter := self._getters.get(type(state))) is None:
+            getter = self._getters[type(state)] = self._getter_of(type(state))
+
+        return getter(state)
+
+    def get(self, state: dict | Sequence | object, missing: Any) -> Any:
+        """
+        Like __call__, but returns the missing flag instead of raising an error when the key of a dict, the index of a
+        list or tuple, or the attribute of an object is missing (the other misses raise their error)
+        """
+        state_type = type(state)
+        if state_type is dict and not self.is_dict_attribute:
+            return state.get(self.key, missing)
+        if (state_type is list or state_type is tuple) and type(self.key) is int:
+            return state[self.key] if -len(state) <= self.key < len(state) else missing
+
+        if (getter := self._getters.get(state_type)) is None:
+            getter = self._getters[state_type] = self._getter_of(state_type)
+        if type(getter) is attrgetter:
+            return getattr(state, self.key, missing)
+
+        return getter(state)
+
+    def _getter_of(self, state_type: type) -> Callable[[Any], Any]:
+        """
+        Returns the fastest function accessing the value of the key in the states of the given type
         """
-        match self.key, state:
-            case int(), _:
-                return state[self.key]
-            case _, {self.key: value}:
-                return value
-            case _, _:
-                return getattr(state, self.key)
+        if isinstance(self.key, int):
+            if issubclass(state_type, Iterator):
+                return self._get_nth_item
+            return itemgetter(self.key)
+
+        if state_type is dict:
+            return self._get_dict_value
+        if issubclass(state_type, Mapping):
+            return self._get_mapping_value
+        if (field_index := named_tuple_index(state_type, self.key)) is not None:
+            return itemgetter(field_index)
+        # attrgetter handles dotted names as paths of attributes
+        if isinstance(self.key, str) and '.' not in self.key:
+            return attrgetter(self.key)
+
+        return self._get_attribute
+
+    def _get_nth_item(self, state: Iterator) -> Any:
+        return next(islice(state, self.key, None))
+
+    def _get_dict_value(self, state: dict) -> Any:
+        try:
+            return state[self.key]
+        except KeyError:
+            return getattr(state, self.key)
+
+    def _get_mapping_value(self, state: Mapping) -> Any:
+        # like dicts but without triggering __missing__ (defaultdict)
+        if (value := state.get(self.key, _DEFAULT)) is _DEFAULT:
+            return getattr(state, self.key)
+
+        return value
+
+    def _get_attribute(self, state: object) -> Any:
+        return getattr(state, self.key)
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, ByKey) and type(other.key) is type(self.key) and other.key == self.key
+
+    def __hash__(self) -> int:
+        return hash((ByKey, self.key))
+
+    def __reduce__(self) -> tuple:
+        return ByKey, (self.key,)
 
     def __repr__(self) -> str:
         if isinstance(self.key, int):
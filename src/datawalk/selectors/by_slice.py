@@ -1,20 +1,45 @@
+from collections.abc import Iterator
+from itertools import islice
 from typing import Sequence
 
+from datawalk.selectors import typed
+
 
 class BySlice:
     """
     Returns the values corresponding with the given slice.
+    Iterators are sliced lazily (negative slice values are not supported on iterators).
     """
 
+    __slots__ = ('slicer',)
+
     def __init__(self, slicer: slice):
         self.slicer = slicer
 
-    def __call__(self, state: Sequence) -> Sequence:
+    def __call__(self, state: Sequence | Iterator) -> Sequence | Iterator:
         """
         Apply the specified slice on the given sequence state
+
+        Raises:
+            ValueError: when slicing an iterator with negative values
         """
+        if isinstance(state, Iterator):
+            return islice(state, self.slicer.start, self.slicer.stop, self.slicer.step)
+
         return state[self.slicer]
 
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, BySlice) and typed(
+            (other.slicer.start, other.slicer.stop, other.slicer.step)
+        ) == typed((self.slicer.start, self.slicer.stop, self.slicer.step))
+
+    def __hash__(self) -> int:
+        # slices are hashable from Python 3.12 only
+        return hash((BySlice, self.slicer.start, self.slicer.stop, self.slicer.step))
+
+    def __reduce__(self) -> tuple:
+        return BySlice, (self.slicer,)
+
     def __repr__(self) -> str:
         indices = [str(index) if index is not None else '' for index in (self.slicer.start, self.slicer.stop)]
 
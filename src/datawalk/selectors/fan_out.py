@@ -0,0 +1,152 @@
+"""
+Fan-out selectors, which apply the rest of the walk on several values and return the list of the results:
+- Each ([*]): on every element of a sequence, or every value of a dict
+- Descendants (..key): on every value of the key found at any depth of nested dicts, lists and tuples
+>>> Walk / 'friends' * Each() / 'name'      # the names of all the friends
+>>> Walk * Descendants('city')              # all the cities of the document
+
+The values on which the rest of the walk misses a key, an index or an attribute are skipped (the other errors are
+raised). The walks fold the selectors following a fan-out selector
+into a Branches selector, which traverses the values with a stack in one pass (no Python recursion).
+"""
+
+from collections.abc import Mapping
+from typing import Any, Callable, Hashable, Iterable, Sequence
+
+from datawalk.selectors import typed
+
+
+class Each:
+    __slots__ = ()
+
+    def __call__(self, state: Iterable | Mapping) -> list:
+        """
+        Returns the elements of the sequence, or the values of the mapping
+        """
+        if isinstance(state, Mapping):
+            return list(state.values())
+
+        return list(state)
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, Each)
+
+    def __hash__(self) -> int:
+        return hash(Each)
+
+    def __reduce__(self) -> tuple:
+        return Each, ()
+
+    def __repr__(self) -> str:
+        return '[*]'
+
+
+def _children(value: Any) -> Iterable:
+    if isinstance(value, Mapping):
+        return value.values()
+    if isinstance(value, (list, tuple)):
+        return value
+
+    return ()
+
+
+class Descendants:
+    __slots__ = ('key',)
+
+    def __init__(self, key: Hashable):
+        self.key = key
+
+    def __call__(self, state: Any) -> list:
+        """
+        Returns the values of the key found in the nested dicts, depth first: the value of the key in a dict comes
+        before the values found in the nested values of the dict (including the value of the key)
+        """
+        key = self.key
+        found_values = []
+        # the children are stacked in reverse order so that they are popped in the order of the document
+        pending_values = [state]
+        while pending_values:
+            value = pending_values.pop()
+            if isinstance(value, Mapping) and key in value:
+                found_values.append(value[key])
+            pending_values.extend(reversed(tuple(_children(value))))
+
+        return found_values
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, Descendants) and typed(other.key) == typed(self.key)
+
+    def __hash__(self) -> int:
+        return hash((Descendants, self.key))
+
+    def __reduce__(self) -> tuple:
+        return Descendants, (self.key,)
+
+    def __repr__(self) -> str:
+        return f'..{self.key}'
+
+
+FAN_OUT_SELECTORS = (Each, Descendants)
+
+# errors of the selectors missing a value (KeyError, IndexError and WalkError are LookupErrors, StopIteration is raised
+# by the iterators shorter than an index)
+_MISSES = (LookupError, AttributeError, StopIteration)
+
+
+class Branches:
+    """
+    Applies a fan-out selector, then the next selectors on each of the returned values. The next fan-out selectors
+    multiply the branches, the results of all the branches are returned in a flat list.
+    """
+
+    __slots__ = ('selectors',)
+
+    def __init__(self, selectors: Sequence[Callable[[Any], Any]]):
+        # starts with a fan-out selector
+        self.selectors = tuple(selectors)
+
+    def __call__(self, state: Any) -> list:
+        selectors = self.selectors
+        selectors_count = len(selectors)
+        results = []
+        # the states of the branches and the index of the next selector to apply
+        branches = [(value, 1) for value in reversed(selectors[0](state))]
+        while branches:
+            state, index = branches.pop()
+            try:
+                while index < selectors_count and not isinstance(selectors[index], FAN_OUT_SELECTORS):
+                    state = selectors[index](state)
+                    index += 1
+
+                if index == selectors_count:
+                    results.append(state)
+                else:
+                    branches.extend((value, index + 1) for value in reversed(selectors[index](state)))
+            except _MISSES:
+                # the branches on which the walk misses a value are skipped
+                continue
+
+        return results
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, Branches) and other.selectors == self.selectors
+
+    def __hash__(self) -> int:
+        return hash((Branches, self.selectors))
+
+    def __reduce__(self) -> tuple:
+        return Branches, (self.selectors,)
+
+    def __repr__(self) -> str:
+        return ' '.join(map(repr, self.selectors))
+
+
+def fold_fan_outs(selectors: tuple[Callable[[Any], Any], ...]) -> tuple[Callable[[Any], Any], ...]:
+    """
+    Returns the steps applying the selectors: the selectors from the first fan-out one are folded into Branches
+    """
+    for index, selector in enumerate(selectors):
+        if isinstance(selector, FAN_OUT_SELECTORS):
+            return (*selectors[:index], Branches(selectors[index:]))
+
+    return selectors
@@ -0,0 +1,145 @@
+from collections.abc import Iterator, Sequence
+from itertools import islice
+from typing import Any, Callable, Iterable
+
+from datawalk.indexed_sequence import IndexedSequence
+from datawalk.selectors import _DEFAULT, value_getter
+from datawalk.selectors.all import All
+from datawalk.selectors.by_key import ByKey
+from datawalk.selectors.by_slice import BySlice
+from datawalk.selectors.predicates import In
+from datawalk.sorted_sequence import SortedSequence
+
+
+class FilteredScan:
+    """
+    Applies a % (All) selector fused with the slice applied before it and the slice and the index applied after it,
+    in one lazy pass over the items (created by the optimizer of the walks, see datawalk.optimizer):
+    - % (key, predicate) [a:b:c]: stops scanning the items once the slice of the matches is complete
+    - % (key, predicate) / n: stops scanning the items at the nth match
+    - [a:b:c] % (key, predicate) followed by one of the above: scans the items of the slice without copying them
+
+    The states which are neither sequences nor iterators (dicts, etc.) are walked by the selectors one after the other.
+    """
+
+    __slots__ = ('selectors', 'before', 'filter', 'after', 'index')
+
+    def __init__(self, selectors: Sequence[Callable[[Any], Any]]):
+        # [BySlice] All [BySlice] [ByKey(index)]
+        self.selectors = tuple(selectors)
+        position = 0
+        self.before = self.after = self.index = None
+        if isinstance(self.selectors[position], BySlice):
+            self.before = self.selectors[position].slicer
+            position += 1
+        self.filter: All = self.selectors[position]
+        position += 1
+        if position < len(self.selectors) and isinstance(self.selectors[position], BySlice):
+            self.after = self.selectors[position].slicer
+            position += 1
+        if position < len(self.selectors):
+            self.index = self.selectors[position].key
+
+    def _matches(self, state: Sequence | Iterator, scanned: Callable[[Iterable], Iterable] | None) -> Iterator:
+        key, predicate = self.filter.key, self.filter.predicate
+        if self.before is None:
+            # hash lookups in indexed sequences
+            if (
+                isinstance(state, IndexedSequence)
+                and isinstance(predicate, In)
+                and (positions := state.positions(key, predicate.values)) is not None
+            ):
+                return (state[position] for position in positions)
+            # binary searches in sorted sequences
+            if isinstance(state, SortedSequence) and (positions := state.positions(key, predicate)) is not None:
+                return (state[position] for position in positions)
+            items: Iterable = state
+        elif isinstance(state, Iterator):
+            items = islice(state, self.before.start, self.before.stop, self.before.step)
+        elif (positions := range(*self.before.indices(len(state)))).step > 0:
+            items = islice(state, positions.start, positions.stop, positions.step)
+        else:
+            items = state[self.before]
+
+        if scanned is not None:
+            items = scanned(items)
+        # inlined access to the values of plain dicts, the most common items
+        return (
+            item
+            for item in items
+            if predicate(item.get(key, _DEFAULT) if type(item) is dict else value_getter(item, key))
+        )
+
+    def __call__(self, state: Sequence | Iterator, scanned: Callable[[Iterable], Iterable] | None = None) -> Any:
+        """
+        The optional scanned function is applied on the items before they are filtered (the instrumentation counts them)
+
+        Raises:
+            IndexError: when a sequence has less matches than the index
+            StopIteration: when an iterator has less matches than the index
+        """
+        if not isinstance(state, (Sequence, Iterator)):
+            for selector in self.selectors:
+                state = selector(state)
+
+            return state
+
+        matches = self._matches(state, scanned)
+        if self.after is not None:
+            matches = islice(matches, self.after.start, self.after.stop, self.after.step)
+
+        if self.index is not None:
+            for match in islice(matches, self.index, None):
+                return match
+
+            if isinstance(state, Iterator):
+                raise StopIteration(f'no match at index {self.index}')
+            raise IndexError(f'no match at index {self.index}')
+
+        return matches if isinstance(state, Iterator) else list(matches)
+
+    @staticmethod
+    def can_fuse(selectors: Sequence[Callable[[Any], Any]]) -> bool:
+        """
+        Tells whether the selectors form a chain that FilteredScan applies with the same results and stops early: an
+        optional slice, a % selector, then a slice and/or an index which can be applied lazily (not negative)
+        """
+        position = 1 if len(selectors) > 0 and type(selectors[0]) is BySlice else 0
+        if position >= len(selectors) or type(selectors[position]) is not All:
+            return False
+        position += 1
+        if position < len(selectors) and type(selectors[position]) is BySlice:
+            if not is_lazy_slice(selectors[position].slicer):
+                return False
+            position += 1
+        if position < len(selectors):
+            index_selector = selectors[position]
+            if type(index_selector) is not ByKey or type(index_selector.key) is not int or index_selector.key < 0:
+                return False
+            position += 1
+
+        # the scan must stop early, filtering the whole state is faster with All
+        return position == len(selectors) and type(selectors[-1]) is not All
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, FilteredScan) and other.selectors == self.selectors
+
+    def __hash__(self) -> int:
+        return hash((FilteredScan, self.selectors))
+
+    def __reduce__(self) -> tuple:
+        return FilteredScan, (self.selectors,)
+
+    def __repr__(self) -> str:
+        return ' '.join(map(repr, self.selectors))
+
+
+def is_lazy_slice(slicer: slice) -> bool:
+    """
+    Tells whether the slice can be applied on an iterator (no negative value)
+    """
+    return (
+        (slicer.start is None or (type(slicer.start) is int and slicer.start >= 0))
+        and (slicer.stop is None or (type(slicer.stop) is int and slicer.stop >= 0))
+        and (slicer.step is None or (type(slicer.step) is int and slicer.step > 0))
+    )
@@ -1,22 +1,60 @@
 from typing import Any, Hashable, Iterable
 
-from datawalk.selectors import value_getter
+from datawalk.indexed_sequence import IndexedSequence
+from datawalk.selectors import typed, value_getter
+from datawalk.sorted_sequence import SortedSequence
 
 
 class First:
+    __slots__ = ('key', 'value')
+
     def __init__(self, key: Hashable, value: Any):
         self.key = key
         self.value = value
 
     def __call__(self, state: Iterable[dict | object]) -> Any:
         """
+        Returns the first item having the given key and value, or None if the state is empty.
+        The iteration stops at the first match, the state can be an iterator.
+
         Raises:
-            StopIteration: if the state sequence contains no item with the given key and value
+            StopIteration: if the state contains no item with the given key and value
         """
-        if len(state) == 0:
+        # hash lookup in indexed sequences
+        if (
+            isinstance(state, IndexedSequence)
+            and len(state) > 0
+            and (positions := state.positions(self.key, (self.value,))) is not None
+        ):
+            return state[next(iter(positions))]
+
+        # binary search in sorted sequences
+        if (
+            isinstance(state, SortedSequence)
+            and len(state) > 0
+            and (positions := state.equal_positions(self.key, self.value)) is not None
+        ):
+            return state[next(iter(positions))]
+
+        is_empty = True
+        for item in state:
+            if value_getter(item, self.key) == self.value:
+                return item
+            is_empty = False
+
+        if is_empty:
             return None
 
-        return next(item for item in state if value_getter(item, self.key) == self.value)
+        raise StopIteration(f'no item with {self.key}=={self.value}')
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, First) and typed((other.key, other.value)) == typed((self.key, self.value))
+
+    def __hash__(self) -> int:
+        return hash((First, self.key, self.value))
+
+    def __reduce__(self) -> tuple:
+        return First, (self.key, self.value)
 
     def __repr__(self) -> str:
         return f'@({self.key}=={self.value})'
@@ -0,0 +1,54 @@
+from collections import Counter
+from collections.abc import Iterator
+from typing import Hashable, Iterable
+
+from datawalk.selectors import _DEFAULT, item_values, typed
+
+
+class GroupBy:
+    """
+    Groups the items by the value of the given key in one pass, in a dict of lists of items (or of counts of items)
+    indexed by value, in the order of the first occurrence of each value. The items missing the key are left out.
+    >>> walk * GroupBy('type')             # -> {'cat': [...], 'dog': [...]}
+    >>> walk * GroupBy('type', count=True) # -> {'cat': 2, 'dog': 1}
+    """
+
+    __slots__ = ('key', 'count')
+
+    def __init__(self, key: Hashable, count: bool = False):
+        self.key = key
+        self.count = count
+
+    def __call__(self, state: Iterable[dict | object]) -> dict[Hashable, list | int]:
+        """
+        Raises:
+            TypeError: when a value of the key is not hashable
+        """
+        items = list(state) if isinstance(state, Iterator) else state
+        values = item_values(items, self.key)
+        if self.count:
+            counts = Counter(values)
+            counts.pop(_DEFAULT, None)
+            return dict(counts)
+
+        groups: dict[Hashable, list] = {}
+        for item, value in zip(items, values):
+            if value is not _DEFAULT:
+                if (group := groups.get(value)) is None:
+                    groups[value] = [item]
+                else:
+                    group.append(item)
+
+        return groups
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, GroupBy) and typed(other.key) == typed(self.key) and other.count == self.count
+
+    def __hash__(self) -> int:
+        return hash((GroupBy, self.key, self.count))
+
+    def __reduce__(self) -> tuple:
+        return GroupBy, (self.key, self.count)
+
+    def __repr__(self) -> str:
+        return f'{"count" if self.count else "group"}({self.key})'
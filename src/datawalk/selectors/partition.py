@@ -0,0 +1,46 @@
+from collections.abc import Iterator
+from typing import Hashable, Iterable, Sequence
+
+from datawalk.selectors import item_values, typed
+from datawalk.selectors.predicates import Predicate, as_predicate
+
+
+class Partition:
+    """
+    Separates the items whose key value satisfies the given predicate, or belongs to the given values, from the other
+    items, in one pass. Returns the 2 lists (matching items, other items) in a tuple:
+    >>> walk * Partition('age', Compare('>=', 18)) / 0 # the adults
+    >>> walk * Partition('type', ['cat', 'dog']) / 1   # the pets which are neither cats nor dogs
+    """
+
+    __slots__ = ('key', 'predicate')
+
+    def __init__(self, key: Hashable, predicate: Predicate | Sequence):
+        self.key = key
+        self.predicate = as_predicate(predicate)
+
+    def __call__(self, state: Iterable[dict | object]) -> tuple[list, list]:
+        items = list(state) if isinstance(state, Iterator) else state
+        predicate = self.predicate
+        matching_items, other_items = [], []
+        for item, value in zip(items, item_values(items, self.key)):
+            if predicate(value):
+                matching_items.append(item)
+            else:
+                other_items.append(item)
+
+        return matching_items, other_items
+
+    def __eq__(self, other: object) -> bool:
+        return (
+            isinstance(other, Partition) and typed(other.key) == typed(self.key) and other.predicate == self.predicate
+        )
+
+    def __hash__(self) -> int:
+        return hash((Partition, self.key, self.predicate))
+
+    def __reduce__(self) -> tuple:
+        return Partition, (self.key, self.predicate)
+
+    def __repr__(self) -> str:
+        return f'partition({self.key} {self.predicate})'
@@ -4,11 +4,22 @@ from datawalk.selectors.by_key import ByKey
 
 
 class Picker:
+    __slots__ = ('pickers',)
+
     def __init__(self, pickers: Sequence[Hashable]):
         self.pickers = tuple(ByKey(picker) for picker in pickers)
 
     def __call__(self, state: dict | object) -> dict:
         return {picker.key: picker(state) for picker in self.pickers}
 
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, Picker) and other.pickers == self.pickers
+
+    def __hash__(self) -> int:
+        return hash((Picker, self.pickers))
+
+    def __reduce__(self) -> tuple:
+        return Picker, (tuple(picker.key for picker in self.pickers),)
+
     def __repr__(self) -> str:
         return f'{{{",".join(str(picker.key) for picker in self.pickers)}}}'
@@ -0,0 +1,189 @@
+"""
+Predicates used by the % (All) selector to filter the items of a sequence according to the value of one of their keys.
+They are built once, when the walk is created, and are evaluated on each item value:
+>>> walk % ('type', ['cat', 'dog'])             # In(['cat', 'dog']), set membership
+>>> walk % ('age', Compare('>=', 18))           # comparison
+>>> walk % ('age', Between(18, 65))             # range, bounds included
+>>> walk % ('type', Not(['cat', 'dog']))        # negation of a predicate or of a membership
+>>> walk % ('phone', Exists())                  # key presence
+"""
+
+import operator
+from abc import ABC, abstractmethod
+from typing import Any, Callable, Sequence
+
+from datawalk.errors import SelectorError
+from datawalk.selectors import _DEFAULT, typed
+
+
+class Predicate(ABC):
+    """
+    Base class of the predicates, which are equal when they have the same type and parameters
+    """
+
+    __slots__ = ()
+
+    @abstractmethod
+    def __call__(self, value: Any) -> bool:
+        """
+        Tells whether the value of the item key matches the predicate (_DEFAULT when the item has no such key)
+        """
+
+    @abstractmethod
+    def _parameters(self) -> tuple:
+        """
+        The arguments building the predicate, which define its equality
+        """
+
+    def __eq__(self, other: object) -> bool:
+        # the parameters are compared with their types, like the keys of ByKey
+        return type(other) is type(self) and typed(other._parameters()) == typed(self._parameters())
+
+    def __hash__(self) -> int:
+        return hash((type(self), self._parameters()))
+
+    def __reduce__(self) -> tuple:
+        # the predicates are rebuilt from their parameters
+        return type(self), self._parameters()
+
+
+class In(Predicate):
+    """
+    Matches the values belonging to the given ones, with a set lookup when all the values are hashable
+    """
+
+    __slots__ = ('values', 'hashed_values')
+
+    def __init__(self, values: Sequence):
+        self.values = values
+        try:
+            self.hashed_values = frozenset(values)
+        except TypeError:
+            self.hashed_values = None
+
+    def __call__(self, value: Any) -> bool:
+        if self.hashed_values is None:
+            return value in self.values
+
+        try:
+            return value in self.hashed_values
+        except TypeError:
+            # the value is not hashable
+            return value in self.values
+
+    def _parameters(self) -> tuple:
+        return (tuple(self.values),)
+
+    def __repr__(self) -> str:
+        return f'in {self.values}'
+
+
+class Compare(Predicate):
+    """
+    Matches the values satisfying the comparison with the given value; incomparable values do not match
+    """
+
+    OPERATORS: dict[str, Callable[[Any, Any], bool]] = {
+        '==': operator.eq,
+        '!=': operator.ne,
+        '<': operator.lt,
+        '<=': operator.le,
+        '>': operator.gt,
+        '>=': operator.ge,
+    }
+
+    __slots__ = ('comparator', 'value', 'compare')
+
+    def __init__(self, comparator: str, value: Any):
+        if (compare := Compare.OPERATORS.get(comparator)) is None:
+            raise SelectorError(f'unsupported comparator: {comparator}, use one of {", ".join(Compare.OPERATORS)}')
+
+        self.comparator = comparator
+        self.value = value
+        self.compare = compare
+
+    def __call__(self, value: Any) -> bool:
+        if value is _DEFAULT:
+            return False
+
+        try:
+            return self.compare(value, self.value)
+        except TypeError:
+            return False
+
+    def _parameters(self) -> tuple:
+        return self.comparator, self.value
+
+    def __repr__(self) -> str:
+        return f'{self.comparator} {self.value}'
+
+
+class Between(Predicate):
+    """
+    Matches the values within the given bounds (included); incomparable values do not match
+    """
+
+    __slots__ = ('lower', 'upper')
+
+    def __init__(self, lower: Any, upper: Any):
+        self.lower = lower
+        self.upper = upper
+
+    def __call__(self, value: Any) -> bool:
+        if value is _DEFAULT:
+            return False
+
+        try:
+            return self.lower <= value <= self.upper
+        except TypeError:
+            return False
+
+    def _parameters(self) -> tuple:
+        return self.lower, self.upper
+
+    def __repr__(self) -> str:
+        return f'between {self.lower} and {self.upper}'
+
+
+class Exists(Predicate):
+    """
+    Matches the items having the key, whatever its value
+    """
+
+    __slots__ = ()
+
+    def __call__(self, value: Any) -> bool:
+        return value is not _DEFAULT
+
+    def _parameters(self) -> tuple:
+        return ()
+
+    def __repr__(self) -> str:
+        return 'exists'
+
+
+class Not(Predicate):
+    """
+    Negates the given predicate, or the membership to the given values
+    """
+
+    __slots__ = ('predicate',)
+
+    def __init__(self, predicate: Predicate | Sequence):
+        self.predicate = as_predicate(predicate)
+
+    def __call__(self, value: Any) -> bool:
+        return not self.predicate(value)
+
+    def _parameters(self) -> tuple:
+        return (self.predicate,)
+
+    def __repr__(self) -> str:
+        return f'not {self.predicate}'
+
+
+def as_predicate(predicate_or_values: Predicate | Sequence) -> Predicate:
+    if isinstance(predicate_or_values, Predicate):
+        return predicate_or_values
+    else:
+        return In(predicate_or_values)
@@ -0,0 +1,112 @@
+from bisect import bisect_left, bisect_right
+from itertools import chain
+from typing import Any, Hashable, Iterator, Sequence
+
+from datawalk.selectors import _DEFAULT, item_values
+from datawalk.selectors.predicates import Between, Compare, In, Predicate
+
+
+class SortedSequence(Sequence):
+    """
+    Wraps a sequence of dicts or objects sorted by the values of a key (time series, exports ordered by id, etc.) and
+    lets the @ (First) and % (All) selectors find the items with binary searches instead of linear scans:
+    - @ (key, value)
+    - % (key, values), % (key, Compare(comparator, value)) with the ==, <, <=, > and >= comparators,
+      % (key, Between(lower, upper))
+
+    The values of the key are read once, when the items are wrapped, and must be sorted. The other keys and predicates,
+    and the searched values which cannot be compared with the ones of the key, are scanned linearly.
+    Wrap the sequence again after modifying it.
+    >>> readings = SortedSequence(readings_list, 'timestamp')
+    >>> Walk @ ('timestamp', 1700000000) | readings                              # -> binary search
+    >>> Walk % ('timestamp', Between(1700000000, 1700003600)) / 'value' | readings # -> binary searches of the bounds
+    """
+
+    def __init__(self, items: Sequence[dict | object], key: Hashable, /):
+        """
+        Raises:
+            ValueError: when an item misses the key, or when the items are not sorted by the values of the key
+        """
+        self.items = items
+        self.key = key
+        self.keys = item_values(items, key)
+        for position, value in enumerate(self.keys):
+            if value is _DEFAULT:
+                raise ValueError(f'the item at position {position} has no {key!r} key')
+
+        try:
+            # "not <=" also rejects the unordered values like NaN
+            unsorted_position = next(
+                (
+                    position
+                    for position in range(1, len(self.keys))
+                    if not self.keys[position - 1] <= self.keys[position]
+                ),
+                None,
+            )
+        except TypeError as error:
+            raise ValueError(f'the values of the {key!r} key cannot be compared: {error}') from error
+
+        if unsorted_position is not None:
+            raise ValueError(f'the items are not sorted by {key!r}, see the item at position {unsorted_position}')
+
+    def __getitem__(self, index: int | slice) -> Any:
+        return self.items[index]
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def __iter__(self) -> Iterator:
+        return iter(self.items)
+
+    def __repr__(self) -> str:
+        return f'SortedSequence({self.items!r}, {self.key!r})'
+
+    def equal_positions(self, key: Hashable, value: Any) -> range | None:
+        """
+        Returns the positions of the items whose key has the given value, or None if the key is not the sorting key or
+        if the value cannot be compared with the ones of the key
+        """
+        if key != self.key:
+            return None
+
+        try:
+            return range(bisect_left(self.keys, value), bisect_right(self.keys, value))
+        except TypeError:
+            return None
+
+    def positions(self, key: Hashable, predicate: Predicate) -> range | list[int] | None:
+        """
+        Returns the sorted positions of the items whose key value satisfies the predicate, or None if the key is not
+        the sorting key or if the predicate cannot be answered by binary searches
+        """
+        if key != self.key:
+            return None
+
+        keys = self.keys
+        try:
+            match predicate:
+                case In(values=values):
+                    # the ranges of the sorted distinct values are sorted too
+                    return list(
+                        chain.from_iterable(
+                            range(bisect_left(keys, value), bisect_right(keys, value)) for value in sorted(set(values))
+                        )
+                    )
+                case Compare(comparator='=='):
+                    return range(bisect_left(keys, predicate.value), bisect_right(keys, predicate.value))
+                case Compare(comparator='<'):
+                    return range(0, bisect_left(keys, predicate.value))
+                case Compare(comparator='<='):
+                    return range(0, bisect_right(keys, predicate.value))
+                case Compare(comparator='>'):
+                    return range(bisect_right(keys, predicate.value), len(keys))
+                case Compare(comparator='>='):
+                    return range(bisect_left(keys, predicate.value), len(keys))
+                case Between():
+                    return range(bisect_left(keys, predicate.lower), bisect_right(keys, predicate.upper))
+        except TypeError:
+            # unhashable or incomparable values
+            return None
+
+        return None
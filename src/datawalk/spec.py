@@ -0,0 +1,129 @@
+"""
+Serializes walks into a canonical specification made of built-in values, which is compact to pickle, can be dumped as
+JSON and can be used as a cache key (when the keys and values of the selectors are hashable):
+>>> (Walk / 'friends' % ('age', Compare('>=', 18)) / slice(0, 2) // ('name', 'age')).to_spec()
+>>> # -> (1, ('/', 'friends'), ('%', 'age', ('>=', 18)), ('/:', 0, 2, None), ('//', 'name', 'age'))
+
+The first item is the version of the specification format, each step starts with the operator of its selector.
+The fan-out selectors are described by ('[*]',) and ('..', key) steps, the group-by and partition selectors by
+('group', key), ('count', key) and ('partition', key, predicate) steps. Custom selectors are kept as is in
+('*', selector) steps.
+"""
+
+from typing import Any, Callable, Sequence
+
+from datawalk.errors import SelectorError
+from datawalk.selectors.all import All
+from datawalk.selectors.by_key import ByKey
+from datawalk.selectors.by_slice import BySlice
+from datawalk.selectors.fan_out import Descendants, Each
+from datawalk.selectors.first import First
+from datawalk.selectors.group_by import GroupBy
+from datawalk.selectors.partition import Partition
+from datawalk.selectors.picker import Picker
+from datawalk.selectors.predicates import Between, Compare, Exists, In, Not, Predicate
+
+SPEC_VERSION = 1
+
+
+def _predicate_spec(predicate: Predicate) -> tuple:
+    match predicate:
+        case In():
+            return 'in', tuple(predicate.values)
+        case Compare():
+            return predicate.comparator, predicate.value
+        case Between():
+            return 'between', predicate.lower, predicate.upper
+        case Exists():
+            return ('exists',)
+        case Not():
+            return 'not', _predicate_spec(predicate.predicate)
+        case _:
+            return '*', predicate
+
+
+def _step_spec(selector: Callable[[Any], Any]) -> tuple:
+    match selector:
+        case ByKey():
+            return '/', selector.key
+        case BySlice():
+            return '/:', selector.slicer.start, selector.slicer.stop, selector.slicer.step
+        case First():
+            return '@', selector.key, selector.value
+        case All():
+            return '%', selector.key, _predicate_spec(selector.predicate)
+        case Picker():
+            return ('//', *(picker.key for picker in selector.pickers))
+        case Each():
+            return ('[*]',)
+        case GroupBy():
+            return 'count' if selector.count else 'group', selector.key
+        case Partition():
+            return 'partition', selector.key, _predicate_spec(selector.predicate)
+        case Descendants():
+            return '..', selector.key
+        case _:
+            return '*', selector
+
+
+def to_spec(selectors: Sequence[Callable[[Any], Any]]) -> tuple:
+    """
+    Returns the specification of the walk made of the given selectors
+    """
+    return (SPEC_VERSION, *(_step_spec(selector) for selector in selectors))
+
+
+def _build_predicate(predicate_spec: Sequence) -> Predicate:
+    match tuple(predicate_spec):
+        case ('in', values):
+            return In(tuple(values))
+        case (str() as comparator, value) if comparator in Compare.OPERATORS:
+            return Compare(comparator, value)
+        case ('between', lower, upper):
+            return Between(lower, upper)
+        case ('exists',):
+            return Exists()
+        case ('not', negated_spec):
+            return Not(_build_predicate(negated_spec))
+        case ('*', Predicate() as predicate):
+            return predicate
+        case _:
+            raise SelectorError(f'unsupported predicate specification: {predicate_spec}')
+
+
+def _build_selector(step_spec: Sequence) -> Callable[[Any], Any]:
+    match tuple(step_spec):
+        case ('/', key):
+            return ByKey(key)
+        case ('/:', start, stop, step):
+            return BySlice(slice(start, stop, step))
+        case ('@', key, value):
+            return First(key, value)
+        case ('%', key, predicate_spec):
+            return All(key, _build_predicate(predicate_spec))
+        case ('//', *keys):
+            return Picker(keys)
+        case ('[*]',):
+            return Each()
+        case ('group', key):
+            return GroupBy(key)
+        case ('count', key):
+            return GroupBy(key, count=True)
+        case ('partition', key, predicate_spec):
+            return Partition(key, _build_predicate(predicate_spec))
+        case ('..', key):
+            return Descendants(key)
+        case ('*', selector):
+            return selector
+        case _:
+            raise SelectorError(f'unsupported step specification: {step_spec}')
+
+
+def from_spec(spec: Sequence) -> tuple[Callable[[Any], Any], ...]:
+    """
+    Returns the selectors of the walk specification. Lists are accepted in place of tuples (JSON specifications).
+    """
+    if len(spec) == 0 or spec[0] != SPEC_VERSION:
+        raise SelectorError(f'unsupported walk specification version, expected {SPEC_VERSION}: {spec}')
+
+    return tuple(_build_selector(step_spec) for step_spec in spec[1:])
@@ -0,0 +1,90 @@
+"""
+Copy-on-write updates of the value at the end of a walk made of / key steps: only the containers along the walked path
+are copied, the other values are shared with the original structure, which is left unchanged.
+The containers are copied according to their type:
+- dicts and mappings: shallow copy, then key assignment (the last key is added if it is missing)
+- lists: shallow copy, then index assignment
+- named tuples: _replace() of the field (by name or by index)
+- tuples: new tuple with the replaced item
+- dataclasses: dataclasses.replace() of the field
+- other objects: shallow copy (copy.copy), then attribute assignment
+"""
+
+from collections.abc import Mapping
+from copy import copy
+from dataclasses import is_dataclass, replace
+from typing import Any, Callable, Hashable, Sequence
+
+from datawalk.errors import SelectorError, WalkError
+from datawalk.selectors import named_tuple_index
+from datawalk.selectors.by_key import ByKey
+
+# flag of the missing value of the last key of a dict, when setting a value
+_MISSING = object()
+
+
+def _replaced(container: Any, key: Hashable, value: Any) -> Any:
+    """
+    Returns a shallow copy of the container in which the key is associated with the given value
+    """
+    if isinstance(container, (Mapping, list)):
+        container_copy = copy(container)
+        container_copy[key] = value
+        return container_copy
+
+    if isinstance(container, tuple):
+        if hasattr(container, '_replace'):
+            field_index = key if isinstance(key, int) else named_tuple_index(type(container), key)
+            if field_index is not None:
+                return container._replace(**{container._fields[field_index]: value})
+
+        items = list(container)
+        items[key] = value
+        return type(container)(items)
+
+    if is_dataclass(container):
+        return replace(container, **{key: value})
+
+    container_copy = copy(container)
+    setattr(container_copy, key, value)
+
+    return container_copy
+
+
+def update_selectors(
+    selectors: Sequence[Callable[[Any], Any]], data: Any, function: Callable[[Any], Any], can_add: bool
+) -> Any:
+    """
+    Returns a copy of the data in which the value at the end of the walk is replaced by the result of the function
+    applied on it. The last key of a dict can be missing if can_add is True (the function receives _MISSING then).
+
+    Raises:
+        SelectorError: when a selector of the walk is not a / key step
+        WalkError: when one of the containers of the path cannot be reached
+    """
+    for selector in selectors:
+        if type(selector) is not ByKey:
+            raise SelectorError(f'only the walks made of / key steps can update values, not {selector}')
+
+    if len(selectors) == 0:
+        return function(data)
+
+    # containers along the path, from the data to the container of the updated value
+    containers = []
+    state = data
+    last_index = len(selectors) - 1
+    try:
+        for failed_index, selector in enumerate(selectors):  # noqa: B007 (read by the error handler)
+            containers.append(state)
+            if can_add and failed_index == last_index and isinstance(state, Mapping) and selector.key not in state:
+                state = _MISSING
+            else:
+                state = selector(state)
+    except Exception as error:
+        raise WalkError(data_state=state, selectors=selectors, failed_index=failed_index) from error
+
+    value = function(state)
+    for container, selector in zip(reversed(containers), reversed(selectors)):
+        value = _replaced(container, selector.key, value)
+
+    return value
@@ -0,0 +1,164 @@
+"""
+Memoizes the values of walks applied on immutable documents, by document identity and walk. The states reached by the
+prefixes of the walks are memoized too: the walks sharing a prefix reuse its state (walks are linked to their parent
+walk, the longest memoized prefix is found by walking up the parents).
+
+The documents supporting weak references (objects) are kept in the cache as long as they are alive, the other ones
+(dicts, lists, etc.) are kept in a bounded LRU cache: the least recently walked document is dropped when the number of
+documents exceeds max_documents. The memoized states of a document are bounded too: they are dropped when their
+number reaches max_states (walks generated with many distinct keys, for example), so that the memory used by a
+long-lived document does not grow with the number of walks applied on it.
+
+The cache can be shared by threads: the memoized states are written idempotently (concurrent walks store equal
+values), only the bookkeeping of the documents is guarded by a lock, which is not taken when walking the documents
+supporting weak references that are already cached.
+"""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from threading import RLock
+from typing import TYPE_CHECKING, Any
+from weakref import ref
+
+from datawalk.errors import WalkError
+from datawalk.selectors.fan_out import FAN_OUT_SELECTORS, Branches
+
+if TYPE_CHECKING:
+    from datawalk import Walk
+
+# flag used when walking a data structure without a default value
+_NO_DEFAULT = object()
+
+# flag of the states which are not memoized yet
+_MISSING = object()
+
+
+class WalkCache:
+    """
+    Memoizes the values of walks applied on documents that are not modified (call invalidate() otherwise)
+    >>> cache = WalkCache(max_documents=128, max_states=1024)
+    >>> cache.walk(Walk / 'org' / 'address' / 'city', config) # applies the selectors
+    >>> cache.walk(Walk / 'org' / 'address' / 'city', config) # returns the memoized value
+    >>> cache.walk(Walk / 'org' / 'address' / 'zipcode', config) # reuses the state of Walk / 'org' / 'address'
+    >>> cache.invalidate(config)
+    """
+
+    def __init__(self, *, max_documents: int = 128, max_states: int = 1024):
+        self.max_documents = max_documents
+        self.max_states = max_states
+        # memoized states by walk, indexed by document identity
+        self._weak_documents: dict[int, tuple[ref, dict[Walk, Any]]] = {}
+        self._lru_documents: OrderedDict[int, tuple[Any, dict[Walk, Any]]] = OrderedDict()
+        # guards the additions and removals of documents and the moves in the LRU order (reentrant: the garbage
+        # collection of a document may call _forget() while the lock is held by the same thread)
+        self._documents_lock = RLock()
+
+    def __len__(self) -> int:
+        """
+        Number of documents having memoized states
+        """
+        return len(self._weak_documents) + len(self._lru_documents)
+
+    def _document_states(self, document: Any) -> dict[Walk, Any]:
+        document_id = id(document)
+        if (weak_entry := self._weak_documents.get(document_id)) is not None and weak_entry[0]() is document:
+            return weak_entry[1]
+
+        with self._documents_lock:
+            if (lru_entry := self._lru_documents.get(document_id)) is not None and lru_entry[0] is document:
+                self._lru_documents.move_to_end(document_id)
+                return lru_entry[1]
+
+            try:
+                document_ref = ref(document, lambda document_ref: self._forget(document_id, document_ref))
+            except TypeError:
+                # the documents without weak references are kept by the cache, which prevents the reuse of their ids
+                lru_entry = self._lru_documents[document_id] = (document, {})
+                if len(self._lru_documents) > self.max_documents:
+                    self._lru_documents.popitem(last=False)
+
+                return lru_entry[1]
+
+            # another thread may have cached the document meanwhile
+            if (weak_entry := self._weak_documents.get(document_id)) is None or weak_entry[0]() is not document:
+                weak_entry = self._weak_documents[document_id] = (document_ref, {})
+
+            return weak_entry[1]
+
+    def _forget(self, document_id: int, document_ref: ref):
+        """
+        Drops the memoized states of a garbage-collected document (unless its id was reused by a new document)
+        """
+        with self._documents_lock:
+            if (weak_entry := self._weak_documents.get(document_id)) is not None and weak_entry[0] is document_ref:
+                del self._weak_documents[document_id]
+
+    def invalidate(self, document: Any = _NO_DEFAULT):
+        """
+        Drops the memoized states of the given document, or of all the documents if no document is given
+        """
+        with self._documents_lock:
+            if document is _NO_DEFAULT:
+                self._weak_documents.clear()
+                self._lru_documents.clear()
+            else:
+                self._weak_documents.pop(id(document), None)
+                self._lru_documents.pop(id(document), None)
+
+    def walk(self, walk: Walk, document: Any, /, *, default: Any = _NO_DEFAULT) -> Any:
+        """
+        Returns the value of the walk applied on the document, memoizing the states reached by the prefixes of the walk.
+        The walks with unhashable selectors are applied without memoization.
+
+        Raises:
+            WalkError: when one of the selectors fails to return a value and no default value is given
+        """
+        try:
+            hash(walk)
+        except TypeError:
+            return walk.walk(document) if default is _NO_DEFAULT else walk.walk(document, default=default)
+
+        states = self._document_states(document)
+        if (state := states.get(walk, _MISSING)) is not _MISSING:
+            return state
+
+        # the selectors from the first fan-out one are applied at once (folded into the last step), the prefix states
+        # are memoized until the fan-out selector (the prefixes apply the selectors as written, not optimized)
+        # the states are dropped rather than evicted one by one, which would need a lock and an LRU order on each hit
+        if len(states) >= self.max_states:
+            states.clear()
+
+        selectors, steps = walk.selectors, walk.steps
+        stepwise_walk = walk
+        if len(steps) > 0 and isinstance(steps[-1], Branches):
+            while any(isinstance(selector, FAN_OUT_SELECTORS) for selector in stepwise_walk.selectors):
+                stepwise_walk = stepwise_walk.parent
+
+        # finds the longest memoized prefix of the walk, the empty walk leads to the document
+        pending_walks: list[Walk] = []
+        prefix_walk = stepwise_walk
+        while prefix_walk.parent is not None and (state := states.get(prefix_walk, _MISSING)) is _MISSING:
+            pending_walks.append(prefix_walk)
+            prefix_walk = prefix_walk.parent
+        if prefix_walk.parent is None:
+            state = document
+
+        failed_index = len(prefix_walk.selectors)
+        try:
+            for pending_walk in reversed(pending_walks):
+                state = states[pending_walk] = pending_walk.selector(state)
+                failed_index += 1
+
+            if stepwise_walk is not walk:
+                state = states[walk] = steps[-1](state)
+        except Exception as error:
+            if default is _NO_DEFAULT:
+                raise WalkError(data_state=state, selectors=selectors, failed_index=failed_index) from error
+
+            return default
+
+        return state
+
+    def __repr__(self) -> str:
+        return f'WalkCache(documents={len(self)}, max_documents={self.max_documents}, max_states={self.max_states})'
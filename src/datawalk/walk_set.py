@@ -0,0 +1,190 @@
+from __future__ import annotations
+
+from collections.abc import Iterator
+from typing import TYPE_CHECKING, Any, Callable, Hashable, Iterable, Mapping
+
+from datawalk.columns import extract_columns
+from datawalk.json_walk import JsonSource, walk_json
+from datawalk.optimizer import source_walk_error
+
+if TYPE_CHECKING:
+    from numpy import ndarray
+
+    from datawalk import Walk
+
+# flag used when walking a data structure without a default value
+_NO_DEFAULT = object()
+
+
+class WalkNode:
+    """
+    A node of the prefix tree merging the selectors of several walks:
+    - the selector leading to the node and the selectors path from the root node
+    - the children nodes indexed by their selector
+    - the labels of the walks ending at this node
+    """
+
+    def __init__(self, selector: Callable[[Any], Any] | None, path: tuple):
+        self.selector = selector
+        self.path = path
+        self.children: dict[Hashable, WalkNode] = {}
+        self.labels: list[Hashable] = []
+
+    def child(self, selector: Callable[[Any], Any]) -> WalkNode:
+        # selectors with unhashable values (like a filter on a list) are merged by identity
+        try:
+            hash(selector)
+            node_key = selector
+        except TypeError:
+            node_key = id(selector)
+
+        if (child_node := self.children.get(node_key)) is None:
+            child_node = self.children[node_key] = WalkNode(selector, (*self.path, selector))
+
+        return child_node
+
+    def subtree_labels(self) -> list[Hashable]:
+        labels = []
+        nodes = [self]
+        while nodes:
+            node = nodes.pop()
+            labels.extend(node.labels)
+            nodes.extend(node.children.values())
+
+        return labels
+
+
+class WalkSet:
+    """
+    Applies several walks on a dataset in one traversal and returns their values in a dict, indexed by walk label.
+    The walks are merged in a prefix tree so that the selectors shared by several walks are applied once; the lazy
+    states (iterators) shared by several walks are turned into lists.
+    >>> address_walk = Walk / 'org' / 'address'
+    >>> walk_set = WalkSet({'city': address_walk / 'city', 'country': address_walk / 'country'}, defaults={'city': None})
+    >>> walk_set | data
+    >>> # -> {'city': 'Rennes', 'country': 'France'}
+    """
+
+    def __init__(self, walks: Mapping[Hashable, Walk], /, *, defaults: Mapping[Hashable, Any] | None = None):
+        self.walks = dict(walks)
+        self.defaults = {} if defaults is None else dict(defaults)
+        self.root = WalkNode(None, ())
+        for label, walk in self.walks.items():
+            node = self.root
+            for selector in walk.steps:
+                node = node.child(selector)
+            node.labels.append(label)
+
+    def __or__(self, data: dict | object) -> dict[Hashable, Any]:
+        """
+        Enables the use of the "|" or operator to apply the walks on the given dataset
+        >>> walk_set | data
+        """
+        return self.walk(data)
+
+    def __xor__(self, data_with_default_value: tuple[dict | object, Any]) -> dict[Hashable, Any]:
+        """
+        Enables the use of the "^" xor operator to apply the walks on the given dataset with a default value
+        for the walks having no specific default value
+        >>> walk_set ^ (data, default_value)
+        """
+        data, default_value = data_with_default_value
+        return self.walk(data, default=default_value)
+
+    def walk(self, data: dict | object, /, *, default: Any = _NO_DEFAULT) -> dict[Hashable, Any]:
+        """
+        Applies the walks on the given dataset, evaluating each node of the prefix tree once.
+
+        Raises:
+            WalkError: when a walk without default value fails to return a value
+        """
+        values = dict.fromkeys(self.walks)
+        self._walk_subtree(self.root, data, values, default)
+
+        return values
+
+    def _walk_subtree(self, node: WalkNode, state: Any, values: dict[Hashable, Any], default: Any):
+        """
+        Applies the selectors of the node subtree on the node state, storing the values of the walks in the given dict
+        """
+        nodes_and_states = [(node, state)]
+        while nodes_and_states:
+            node, state = nodes_and_states.pop()
+            if isinstance(state, Iterator) and len(node.children) + len(node.labels) > 1:
+                # the lazy states shared by several walks are materialized, the first walk would consume them
+                state = list(state)
+            for label in node.labels:
+                values[label] = state
+
+            for child_node in node.children.values():
+                try:
+                    nodes_and_states.append((child_node, child_node.selector(state)))
+                except Exception as error:
+                    self._fail_subtree(child_node, lambda state=state: state, values, default, error)
+
+    def _fail_subtree(
+        self,
+        failed_node: WalkNode,
+        get_data_state: Callable[[], Any],
+        values: dict[Hashable, Any],
+        default: Any,
+        error: Exception,
+    ):
+        """
+        Sets the default values of the walks passing by the failed node.
+
+        Raises:
+            WalkError: for the first walk without default value
+        """
+        for label in failed_node.subtree_labels():
+            if label in self.defaults:
+                values[label] = self.defaults[label]
+            elif default is not _NO_DEFAULT:
+                values[label] = default
+            else:
+                walk = self.walks[label]
+                raise source_walk_error(
+                    walk.selectors, walk.steps, len(failed_node.path) - 1, get_data_state()
+                ) from error
+
+    def walk_json(
+        self, source: JsonSource, /, *, default: Any = _NO_DEFAULT, strict: bool = False
+    ) -> dict[Hashable, Any]:
+        """
+        Applies the walks on a JSON document (bytes, string or file) without loading it: the walks drive the parsing,
+        which skips the parts of the document that they do not visit and stops once all the walks found their value.
+        The first member of an object with duplicate keys is walked and the syntax errors after the walked values are
+        not detected, unless strict=True: the visited objects and arrays are then scanned up to their end (the last
+        duplicate key wins, like with json.loads) and so is the document.
+        >>> with open('big_document.json', 'rb') as json_file:
+        >>>     walk_set.walk_json(json_file)
+
+        Raises:
+            WalkError: when a walk without default value fails to return a value
+            json.JSONDecodeError: when the scanned parts of the document are not valid JSON
+        """
+        return walk_json(self, source, default, strict)
+
+    def columns(
+        self,
+        records: Iterable[dict | object],
+        /,
+        *,
+        dtypes: Any | Mapping[Hashable, Any] = None,
+        default: Any = _NO_DEFAULT,
+        masked: bool = False,
+    ) -> dict[Hashable, ndarray]:
+        """
+        Applies the walks on each record and returns their values in NumPy arrays indexed by walk label
+        (struct of arrays). The dtypes can be given for all the columns, or by label; the missing ones are inferred from
+        the values (see Walk.column()).
+        >>> columns = walk_set.columns(records, dtypes={'city': object, 'population': int})
+
+        Raises:
+            ImportError: when NumPy is not installed (pip install "datawalk[numpy]")
+            WalkError: when no default value is given, masked is False and a walk fails on a record
+        """
+        return extract_columns(self, records, dtypes, default, default is not _NO_DEFAULT, masked)
+
+    def __repr__(self) -> str:
+        return f'WalkSet({", ".join(f"{label}: {walk}" for label, walk in self.walks.items())})'
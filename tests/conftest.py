@@ -27,6 +27,19 @@ class PetNamedTuple(NamedTuple):
     type: str
 
 
+class UnhashableType(type):
+    # the classes of this metaclass cannot be used as keys of the getters cache
+    def __eq__(cls, other: object) -> bool:
+        return cls is other
+
+    __hash__ = None
+
+
+class UncacheableItem(metaclass=UnhashableType):
+    def __init__(self, name: str):
+        self.name = name
+
+
 @fixture
 def pets() -> tuple[Pet, PetDataclass, Pet, PetNamedTuple]:
     return (
@@ -55,3 +68,23 @@ def friends() -> list[dict]:
         {'name': 'Suzie Q', 'phone': '06 43 15 27 98'},
         {'name': 'Jean Blasin'},
     ]
+
+
+@fixture
+def data(pets) -> dict:
+    return {
+        'name': 'Lucie Nation',
+        'org': {
+            'title': 'Datawalk',
+            'address': {'country': 'France', 'city': 'Rennes', 'zipcode': '35700'},
+            'phones': ['01 23 45 67 89', '02 13 46 58 79'],
+            (666, 'ev/l'): 'hashable key',
+        },
+        'friends': [
+            {'name': 'Frankie Manning'},
+            {'name': 'Harry Cover'},
+            {'name': 'Suzie Q', 'phone': '06 43 15 27 98'},
+            {'name': 'Jean Blasin'},
+        ],
+        'pets': pets,
+    }
@@ -1,7 +1,13 @@
+from collections import OrderedDict
+from types import SimpleNamespace
+
+from pytest import mark
+
 from datawalk import Walk
 from datawalk.selectors.all import All
+from datawalk.selectors.predicates import Exists, Not
 
-from tests.conftest import Pet, PetDataclass, PetNamedTuple
+from tests.conftest import Pet, PetDataclass, PetNamedTuple, UncacheableItem
 
 
 def test_all_repr():
@@ -22,3 +28,76 @@ def test_all_call_on_empty_sequence():
 def test_walk_with_all_selector(pets: tuple[Pet, PetDataclass, Pet, PetNamedTuple]):
     cinnamon, caramel, _, socks = pets
     assert Walk % ('type', ['cat', 'dog']) | pets == [cinnamon, caramel, socks]
+
+
+def test_all_equality():
+    assert All('type', ['cat', 'dog']) == All('type', ['cat', 'dog'])
+    assert hash(All('type', ['cat', 'dog'])) == hash(All('type', ['cat', 'dog']))
+    assert All('type', ['cat', 'dog']) != All('type', ['cat'])
+
+
+def test_all_with_predicate(friends: list[dict]):
+    selector = All('phone', Exists())
+    assert selector(friends) == [{'name': 'Suzie Q', 'phone': '06 43 15 27 98'}]
+    assert repr(selector) == '%(phone exists)'
+
+
+def test_all_filters_iterators_lazily(pets: tuple[Pet, PetDataclass, Pet, PetNamedTuple]):
+    cinnamon, _, _, socks = pets
+    pets_iterator = iter(pets)
+    cats = All('type', ['cat'])(pets_iterator)
+    assert next(cats) == cinnamon
+    assert list(pets_iterator) == list(pets[1:]), 'the iteration stopped at the first cat'
+    assert list(cats) == []
+
+    assert list(All('type', ['cat'])(pet for pet in pets)) == [cinnamon, socks]
+
+
+@mark.parametrize(
+    'items',
+    [
+        [{'name': 'Socks', 'type': 'cat'}, {'name': 'Ruby'}, {'name': 'Melody', 'type': 'dog'}],
+        [OrderedDict(name='Socks', type='cat'), OrderedDict(name='Ruby'), OrderedDict(name='Melody', type='dog')],
+        [PetNamedTuple('Socks', 'cat'), PetNamedTuple('Ruby', 'fish'), PetNamedTuple('Melody', 'dog')],
+        # a pet without type attribute
+        [Pet('Socks', 'cat'), SimpleNamespace(name='Ruby'), Pet('Melody', 'dog')],
+        [PetDataclass('Socks', 'cat'), PetDataclass('Ruby', 'fish'), Pet('Melody', 'dog')],
+    ],
+)
+def test_all_call_on_homogeneous_and_heterogeneous_items(items: list):
+    socks, _, melody = items
+    assert All('type', ['cat', 'dog'])(items) == [socks, melody]
+
+
+def test_all_call_on_items_missing_the_attribute():
+    items = [Pet('Socks', 'cat'), Pet('Ruby', 'fish'), Pet('Melody', 'dog')]
+    del items[1].type
+
+    assert All('type', Not(Exists()))(items) == [items[1]]
+
+
+class CountingSequence(list):
+    """Counts how many times the items are iterated"""
+
+    iterations_count = 0
+
+    def __iter__(self):
+        self.iterations_count += 1
+        return super().__iter__()
+
+
+def test_all_iterates_the_items_once():
+    items = CountingSequence([{'type': 'cat'}, PetNamedTuple('Ruby', 'fish'), {'type': 'cat'}, {'name': 'Bob'}])
+    assert All('type', ['cat', 'fish'])(items) == items[:3]
+    assert items.iterations_count == 1
+
+
+def test_all_call_with_a_dotted_attribute_name():
+    # attrgetter would read the attribute path, the attributes are read by name instead
+    items = [SimpleNamespace(**{'pet.type': 'cat'}), SimpleNamespace(pet=SimpleNamespace(type='cat'))]
+    assert All('pet.type', ['cat'])(items) == [items[0]]
+
+
+def test_all_call_with_unhashable_item_types():
+    items = [UncacheableItem('Cinnamon'), UncacheableItem('Caramel')]
+    assert All('name', ['Caramel'])(items) == items[1:]
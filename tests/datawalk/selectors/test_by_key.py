@@ -1,4 +1,9 @@
-from pytest import mark
+from collections import defaultdict
+from collections.abc import Mapping
+from dataclasses import dataclass
+from types import SimpleNamespace
+
+from pytest import mark, raises
 
 from datawalk import Walk
 from datawalk.selectors.by_key import ByKey
@@ -45,3 +50,131 @@ def test_walk_repr_with_bykey():
 
 def test_walk_with_bykey_selector(friends: list[dict]):
     assert Walk / 2 / 'name' | friends == 'Suzie Q'
+
+
+def test_bykey_equality():
+    assert ByKey('name') == ByKey('name')
+    assert hash(ByKey('name')) == hash(ByKey('name'))
+    assert ByKey('name') != ByKey('type')
+    assert ByKey(1) != ByKey(1.0), 'an index is not a key'
+
+
+def test_bykey_call_iterator(friends: list[dict]):
+    friends_iterator = iter(friends)
+    selector = ByKey(1)
+    assert selector(friends_iterator) == {'name': 'Harry Cover'}
+    assert list(friends_iterator) == friends[2:]
+    with raises(StopIteration):
+        selector(iter(friends[:1]))
+
+
+@dataclass(slots=True)
+class SlottedPet:
+    name: str
+    type: str
+
+
+class PetMapping(Mapping):
+    def __init__(self, **values):
+        self.values = values
+
+    def __getitem__(self, key):
+        return self.values[key]
+
+    def __iter__(self):
+        return iter(self.values)
+
+    def __len__(self):
+        return len(self.values)
+
+
+@mark.parametrize(
+    ['state', 'key', 'expected_value'],
+    [
+        ({'name': 'Socks'}, 'name', 'Socks'),
+        (PetMapping(name='Socks'), 'name', 'Socks'),
+        (PetNamedTuple('Socks', 'cat'), 'type', 'cat'),
+        (PetNamedTuple('Socks', 'cat'), 0, 'Socks'),
+        (SlottedPet('Socks', 'cat'), 'type', 'cat'),
+        (SimpleNamespace(**{'first.name': 'Socks'}), 'first.name', 'Socks'),
+        ((10, 20, 30), -1, 30),
+    ],
+)
+def test_bykey_call_on_state_types(state, key, expected_value):
+    selector = ByKey(key)
+    # the first call resolves the getter of the state type, the second one uses it
+    assert selector(state) == expected_value
+    assert selector(state) == expected_value
+    assert type(state) in selector._getters
+
+
+def test_bykey_call_retrieves_dict_attributes_when_the_key_is_missing():
+    pet = {'name': 'Socks'}
+    assert ByKey('keys')(pet) == pet.keys
+
+
+def test_bykey_call_does_not_trigger_default_factories():
+    pets_by_type = defaultdict(list, cats=['Socks'])
+    with raises(AttributeError):
+        ByKey('dogs')(pets_by_type)
+
+    assert 'dogs' not in pets_by_type
+
+
+@mark.parametrize(
+    ['state', 'key', 'expected_error'],
+    [
+        ({'name': 'Socks'}, 'type', AttributeError),
+        (PetMapping(name='Socks'), 'type', AttributeError),
+        (SlottedPet('Socks', 'cat'), 'age', AttributeError),
+        (SlottedPet('Socks', 'cat'), ('name',), TypeError),
+        (['Socks'], 'name', AttributeError),
+        (['Socks'], 1, IndexError),
+    ],
+)
+def test_bykey_call_raises_on_missing_keys(state, key, expected_error):
+    with raises(expected_error):
+        ByKey(key)(state)
+
+
+_MISSING = object()
+
+
+@mark.parametrize(
+    ['state', 'key', 'expected_value'],
+    [
+        ({'name': 'Socks'}, 'name', 'Socks'),
+        ({'name': 'Socks'}, 'type', _MISSING),
+        (['Socks', 'Caramel'], 1, 'Caramel'),
+        (['Socks', 'Caramel'], -2, 'Socks'),
+        (['Socks', 'Caramel'], 2, _MISSING),
+        (('Socks', 'Caramel'), -3, _MISSING),
+        (iter(['Socks']), 0, 'Socks'),
+        (SlottedPet('Socks', 'cat'), 'type', 'cat'),
+        (SlottedPet('Socks', 'cat'), 'age', _MISSING),
+        (PetNamedTuple('Socks', 'cat'), 'type', 'cat'),
+        (PetMapping(name='Socks'), 'name', 'Socks'),
+    ],
+)
+def test_bykey_get_returns_the_missing_flag(state, key, expected_value):
+    assert ByKey(key).get(state, _MISSING) is expected_value
+
+
+def test_bykey_get_retrieves_dict_attributes_when_the_key_is_missing():
+    pet = {'name': 'Socks'}
+    assert ByKey('keys').get(pet, _MISSING) == pet.keys
+
+
+@mark.parametrize(
+    ['state', 'key', 'expected_error'],
+    [
+        # the other misses raise their error, like __call__
+        (PetMapping(name='Socks'), 'type', AttributeError),
+        (SlottedPet('Socks', 'cat'), ('name',), TypeError),
+        (iter(['Socks']), 1, StopIteration),
+        ('Socks', 10, IndexError),
+    ],
+)
+def test_bykey_get_raises_on_the_other_misses(state, key, expected_error):
+    with raises(expected_error):
+        ByKey(key).get(state, _MISSING)
@@ -1,4 +1,4 @@
-from pytest import mark
+from pytest import mark, raises
 
 from datawalk import Walk
 from datawalk.selectors.by_slice import BySlice
@@ -53,3 +53,22 @@ def test_walk_repr_with_byslice():
 
 def test_walk_with_byslice_selector(friends: list[dict]):
     assert Walk / 2 / 'name' | friends == 'Suzie Q'
+
+
+def test_byslice_equality():
+    assert BySlice(slice(1, -1)) == BySlice(slice(1, -1))
+    assert hash(BySlice(slice(1, -1))) == hash(BySlice(slice(1, -1)))
+    assert BySlice(slice(1, -1)) != BySlice(slice(1, -1, 2))
+
+
+def test_byslice_call_iterator(friends: list[dict]):
+    friends_iterator = iter(friends)
+    selector = BySlice(slice(1, 3))
+    assert list(selector(friends_iterator)) == friends[1:3]
+    assert list(friends_iterator) == friends[3:], 'the iterator was consumed up to the slice stop'
+
+
+def test_byslice_call_iterator_with_negative_values(friends: list[dict]):
+    selector = BySlice(slice(1, -1))
+    with raises(ValueError):
+        selector(iter(friends))
@@ -0,0 +1,120 @@
+from pytest import mark, raises
+
+from datawalk import Walk, WalkSet
+from datawalk.errors import WalkError
+from datawalk.selectors.by_key import ByKey
+from datawalk.selectors.fan_out import Branches, Descendants, Each
+
+from tests.conftest import Pet, PetDataclass, PetNamedTuple
+
+
+@mark.parametrize(
+    ['walk', 'expected_repr'],
+    [
+        (Walk * Each(), '[*]'),
+        (Walk / 'friends' * Each() / 'name', '.friends [*] .name'),
+        (Walk * Descendants('city'), '..city'),
+        (Walk / 'org' * Descendants('phones') * Each(), '.org ..phones [*]'),
+    ],
+)
+def test_walk_repr_with_fan_out_selectors(walk: Walk, expected_repr: str):
+    assert repr(walk) == expected_repr
+
+
+def test_each_call():
+    assert Each()([1, 2]) == [1, 2]
+    assert Each()({'a': 1, 'b': 2}) == [1, 2]
+    assert Each()(iter((1, 2))) == [1, 2]
+
+
+def test_descendants_call_in_document_order():
+    document = {
+        'city': 'Rennes',
+        'offices': [{'city': 'Nantes', 'annex': {'city': 'Brest'}}, {'name': 'no city'}],
+        'hq': {'city': {'city': 'nested'}},
+    }
+    assert Descendants('city')(document) == ['Rennes', 'Nantes', 'Brest', {'city': 'nested'}, 'nested']
+    assert Descendants('zipcode')(document) == []
+
+
+def test_descendants_call_on_deep_documents():
+    document = 'bottom'
+    for _ in range(100_000):
+        document = {'next': document}
+
+    assert len(Descendants('next')(document)) == 100_000
+
+
+def test_walk_applies_the_next_selectors_on_each_value(data: dict):
+    assert Walk / 'friends' * Each() / 'name' | data == ['Frankie Manning', 'Harry Cover', 'Suzie Q', 'Jean Blasin']
+    assert Walk / 'org' / 'address' * Each() | data == ['France', 'Rennes', '35700']
+
+
+def test_walk_skips_the_branches_where_the_next_selectors_fail(data: dict):
+    assert Walk / 'friends' * Each() / 'phone' | data == ['06 43 15 27 98']
+    assert Walk / 'friends' * Each() / 'age' | data == []
+
+
+def test_branches_skip_the_missing_keys_indices_and_attributes(pets: tuple[Pet, PetDataclass, Pet, PetNamedTuple]):
+    values = [{'name': 'Suzie'}, ['Harry'], [], iter([]), pets[0], None]
+    assert Branches((Each(), ByKey('name')))(values) == ['Suzie', 'Cinnamon']
+    assert Branches((Each(), ByKey(0)))(values[:4]) == ['Harry']
+
+
+def test_branches_raise_the_other_errors():
+    def inverse(value: float) -> float:
+        return 1 / value
+
+    with raises(ZeroDivisionError):
+        Branches((Each(), inverse))([1, 0, 2])
+    with raises(TypeError):
+        Branches((Each(), ByKey(0)))([['Harry'], None])
+
+    with raises(WalkError) as error:
+        Walk * Each() * inverse | [1, 0, 2]
+    assert isinstance(error.value.__cause__, ZeroDivisionError)
+
+
+def test_walk_flattens_nested_fan_outs():
+    orgs = [
+        {'members': [{'name': 'Suzie'}, {'name': 'Harry'}]},
+        {'members': []},
+        {'members': [{'name': 'Jean'}]},
+    ]
+    assert Walk * Each() / 'members' * Each() / 'name' | orgs == ['Suzie', 'Harry', 'Jean']
+    assert Walk * Descendants('members') * Each() / 'name' | orgs == ['Suzie', 'Harry', 'Jean']
+
+
+def test_walk_with_descendants_on_objects(pets: tuple[Pet, PetDataclass, Pet, PetNamedTuple]):
+    document = {'household': {'pets': list(pets)}, 'pets': [pets[0]]}
+    # the value of the key in a dict comes before the values found in its nested values
+    assert Walk * Descendants('pets') * Each() / 'name' | document == [
+        'Cinnamon',
+        'Cinnamon',
+        'Caramel',
+        'Melody',
+        'Socks',
+    ]
+
+
+def test_walk_fails_when_the_fan_out_selector_fails(data: dict):
+    with raises(
+        WalkError, match=r'walked \[.org, .address, .zipcode, <built-in function len>\] but could not find \[\*\]'
+    ):
+        Walk / 'org' / 'address' / 'zipcode' * len * Each() / 'name' | data
+
+    assert (Walk / 'age' * Each() / 'name') ^ (data, None) is None
+
+
+def test_fan_outs_in_compiled_walks_and_walk_sets(data: dict):
+    names_walk = Walk / 'friends' * Each() / 'name'
+    assert names_walk.steps == (ByKey('friends'), Branches((Each(), ByKey('name'))))
+    assert names_walk.compile()(data) == ['Frankie Manning', 'Harry Cover', 'Suzie Q', 'Jean Blasin']
+    assert names_walk.walk_list([data, {'friends': [{'name': 'Bob'}]}]) == [
+        ['Frankie Manning', 'Harry Cover', 'Suzie Q', 'Jean Blasin'],
+        ['Bob'],
+    ]
+    assert WalkSet({'names': names_walk, 'cities': Walk * Descendants('city')}) | data == {
+        'names': ['Frankie Manning', 'Harry Cover', 'Suzie Q', 'Jean Blasin'],
+        'cities': ['Rennes'],
+    }
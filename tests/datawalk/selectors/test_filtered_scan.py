@@ -0,0 +1,100 @@
+from typing import Iterator
+
+from pytest import mark, raises
+
+from datawalk import IndexedSequence
+from datawalk.selectors.all import All
+from datawalk.selectors.by_key import ByKey
+from datawalk.selectors.by_slice import BySlice
+from datawalk.selectors.filtered_scan import FilteredScan, is_lazy_slice
+from datawalk.selectors.predicates import Compare
+
+from tests.conftest import PetNamedTuple
+
+ITEMS = [{'id': index, 'group': index % 3} for index in range(20)]
+IN_GROUP_0 = All('group', [0])
+
+
+def _counting(items: list, consumed: list) -> Iterator:
+    for item in items:
+        consumed.append(item)
+        yield item
+
+
+@mark.parametrize(
+    ['selectors', 'expected_ids'],
+    [
+        ((BySlice(slice(5, None)), IN_GROUP_0, BySlice(slice(None, 10))), [6, 9, 12, 15, 18]),
+        ((BySlice(slice(-6, None, 2)), IN_GROUP_0, BySlice(slice(None, 10))), [18]),
+        ((BySlice(slice(None, None, -4)), IN_GROUP_0, BySlice(slice(1, None))), [3]),
+        ((IN_GROUP_0, BySlice(slice(1, 3))), [3, 6]),
+        ((IN_GROUP_0, BySlice(slice(None, None, 3))), [0, 9, 18]),
+        ((BySlice(slice(1, 10)), IN_GROUP_0, BySlice(slice(1, None))), [6, 9]),
+    ],
+)
+def test_filtered_scan_call_on_sequences_and_iterators(selectors: tuple, expected_ids: list[int]):
+    filtered_scan = FilteredScan(selectors)
+    assert [item['id'] for item in filtered_scan(ITEMS)] == expected_ids
+    assert [item['id'] for item in filtered_scan(tuple(ITEMS))] == expected_ids
+    # iterators cannot be sliced with negative values
+    if not isinstance(selectors[0], BySlice) or is_lazy_slice(selectors[0].slicer):
+        iterated_values = filtered_scan(iter(ITEMS))
+        assert isinstance(iterated_values, Iterator), 'iterators are filtered lazily'
+        assert [item['id'] for item in iterated_values] == expected_ids
+
+
+def test_filtered_scan_stops_at_the_indexed_match():
+    consumed = []
+    assert FilteredScan((IN_GROUP_0, ByKey(1)))(_counting(ITEMS, consumed)) == {'id': 3, 'group': 0}
+    assert len(consumed) == 4
+
+    assert FilteredScan((All('id', Compare('>=', 7)), BySlice(slice(2)), ByKey(1)))(ITEMS) == {'id': 8, 'group': 2}
+
+
+def test_filtered_scan_missing_matches():
+    with raises(IndexError, match='no match at index 7'):
+        FilteredScan((IN_GROUP_0, ByKey(7)))(ITEMS)
+    with raises(StopIteration, match='no match at index 7'):
+        FilteredScan((IN_GROUP_0, ByKey(7)))(iter(ITEMS))
+
+
+def test_filtered_scan_uses_the_indexes_of_indexed_sequences():
+    items = IndexedSequence(ITEMS)
+    assert FilteredScan((IN_GROUP_0, ByKey(2)))(items) == {'id': 6, 'group': 0}
+    assert 'group' in items._indexes
+
+
+def test_filtered_scan_applies_the_selectors_on_other_states():
+    cats = {PetNamedTuple('Socks', 'cat')}
+    assert FilteredScan((All('type', ['cat']), ByKey(0)))(cats) == PetNamedTuple('Socks', 'cat')
+    with raises(TypeError, match="'set' object is not subscriptable"):
+        FilteredScan((BySlice(slice(1, None)), All('type', ['cat'])))(cats)
+
+
+@mark.parametrize(
+    ['selectors', 'can_fuse'],
+    [
+        ((IN_GROUP_0, ByKey(0)), True),
+        ((BySlice(slice(-2, None)), IN_GROUP_0, ByKey(0)), True),
+        ((BySlice(slice(1, 2)), IN_GROUP_0, BySlice(slice(None, 3)), ByKey(1)), True),
+        ((IN_GROUP_0,), False),
+        ((BySlice(slice(1, None)), IN_GROUP_0), False),
+        ((IN_GROUP_0, ByKey(-1)), False),
+        ((IN_GROUP_0, ByKey(True)), False),
+        ((IN_GROUP_0, ByKey('id')), False),
+        ((IN_GROUP_0, BySlice(slice(-2, None))), False),
+        ((IN_GROUP_0, BySlice(slice(None, None, -1))), False),
+        ((IN_GROUP_0, ByKey(0), ByKey(0)), False),
+        ((BySlice(slice(1, 2)), BySlice(slice(1, 2)), IN_GROUP_0), False),
+    ],
+)
+def test_filtered_scan_can_fuse(selectors: tuple, can_fuse: bool):
+    assert FilteredScan.can_fuse(selectors) is can_fuse
+
+
+def test_filtered_scan_repr_equality_and_hash():
+    filtered_scan = FilteredScan((BySlice(slice(1, None)), IN_GROUP_0, ByKey(0)))
+    assert repr(filtered_scan) == '[1:] %(group in [0]) [0]'
+    assert filtered_scan == FilteredScan((BySlice(slice(1, None)), All('group', [0]), ByKey(0)))
+    assert hash(filtered_scan) == hash(FilteredScan((BySlice(slice(1, None)), All('group', [0]), ByKey(0))))
+    assert filtered_scan != FilteredScan((IN_GROUP_0, ByKey(0)))
@@ -22,3 +22,22 @@ def test_first_call_on_empty_sequence():
 def test_walk_with_first_selector(pets: tuple[Pet, PetDataclass, Pet, PetNamedTuple]):
     _, caramel, _, _ = pets
     assert Walk @ ('type', 'dog') | pets == caramel
+
+
+def test_first_equality():
+    assert First('type', 'dog') == First('type', 'dog')
+    assert hash(First('type', 'dog')) == hash(First('type', 'dog'))
+    assert First('type', 'dog') != First('type', 'cat')
+
+
+def test_first_stops_iterating_at_the_first_match(pets: tuple[Pet, PetDataclass, Pet, PetNamedTuple]):
+    _, caramel, melody, socks = pets
+    pets_iterator = iter(pets)
+    selector = First('type', 'dog')
+    assert selector(pets_iterator) == caramel
+    assert list(pets_iterator) == [melody, socks]
+
+
+def test_first_call_on_empty_iterator():
+    selector = First('type', 'dog')
+    assert selector(iter([])) is None
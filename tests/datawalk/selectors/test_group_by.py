@@ -0,0 +1,58 @@
+from pytest import mark, raises
+
+from datawalk import Walk
+from datawalk.errors import WalkError
+from datawalk.selectors.group_by import GroupBy
+
+from tests.conftest import Pet, PetDataclass, PetNamedTuple
+
+
+@mark.parametrize(
+    ['walk', 'expected_repr'],
+    [
+        (Walk / 'pets' * GroupBy('type'), '.pets group(type)'),
+        (Walk / 'pets' * GroupBy('type', count=True), '.pets count(type)'),
+    ],
+)
+def test_walk_repr_with_group_by(walk: Walk, expected_repr: str):
+    assert repr(walk) == expected_repr
+
+
+def test_group_by_groups_the_items_by_value(pets: tuple[Pet, PetDataclass, Pet, PetNamedTuple]):
+    cinnamon, caramel, melody, socks = pets
+    assert GroupBy('type')(pets) == {'cat': [cinnamon, socks], 'dog': [caramel], 'bird': [melody]}
+    assert list(GroupBy('type')(pets)) == ['cat', 'dog', 'bird'], 'groups in the order of their first item'
+
+
+def test_group_by_counts_the_items_by_value(pets: tuple[Pet, PetDataclass, Pet, PetNamedTuple]):
+    assert GroupBy('type', count=True)(pets) == {'cat': 2, 'dog': 1, 'bird': 1}
+
+
+def test_group_by_leaves_out_the_items_missing_the_key(friends: list[dict]):
+    assert GroupBy('phone')(friends) == {'06 43 15 27 98': [friends[2]]}
+    assert GroupBy('phone', count=True)(friends) == {'06 43 15 27 98': 1}
+    assert GroupBy('phone')([]) == {}
+
+
+def test_group_by_on_iterators(friends: list[dict]):
+    assert GroupBy('name', count=True)(iter(friends + friends[:1])) == {
+        'Frankie Manning': 2,
+        'Harry Cover': 1,
+        'Suzie Q': 1,
+        'Jean Blasin': 1,
+    }
+
+
+def test_walk_with_group_by(data: dict):
+    pets_by_type = Walk / 'pets' * GroupBy('type')
+    assert [pet.name for pet in (pets_by_type / 'cat' | data)] == ['Cinnamon', 'Socks']
+
+    with raises(WalkError, match=r'walked \[.org, .phones\] but could not find group\(type\)'):
+        Walk / 'org' / 'phones' * GroupBy('type') / 0 | {'org': {'phones': [{'type': ['unhashable']}]}}
+
+
+def test_group_by_equality():
+    assert GroupBy('type') == GroupBy('type')
+    assert hash(GroupBy('type')) == hash(GroupBy('type'))
+    assert GroupBy('type') != GroupBy('type', count=True)
+    assert GroupBy('type') != GroupBy('name')
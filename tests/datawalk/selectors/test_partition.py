@@ -0,0 +1,40 @@
+from pytest import mark
+
+from datawalk import Between, Exists, Walk
+from datawalk.selectors.partition import Partition
+
+from tests.conftest import Pet, PetDataclass, PetNamedTuple
+
+
+@mark.parametrize(
+    ['walk', 'expected_repr'],
+    [
+        (Walk / 'pets' * Partition('type', ['cat']), ".pets partition(type in ['cat'])"),
+        (Walk / 'friends' * Partition('phone', Exists()) / 0, '.friends partition(phone exists) [0]'),
+    ],
+)
+def test_walk_repr_with_partition(walk: Walk, expected_repr: str):
+    assert repr(walk) == expected_repr
+
+
+def test_partition_separates_the_matching_items(pets: tuple[Pet, PetDataclass, Pet, PetNamedTuple]):
+    cinnamon, caramel, melody, socks = pets
+    assert Partition('type', ['cat'])(pets) == ([cinnamon, socks], [caramel, melody])
+    assert Partition('type', ['fish'])(pets) == ([], list(pets))
+
+
+def test_partition_with_predicate_on_iterators(friends: list[dict]):
+    assert Partition('phone', Exists())(iter(friends)) == ([friends[2]], [friends[0], friends[1], friends[3]])
+
+
+def test_walk_with_partition():
+    friends = [{'name': 'Suzie', 'age': 24}, {'name': 'Harry', 'age': 70}, {'name': 'Jean', 'age': 42}]
+    working_age_walk = Walk * Partition('age', Between(18, 65))
+    assert working_age_walk / 0 | friends == [friends[0], friends[2]]
+    assert working_age_walk / 1 / 0 / 'name' | friends == 'Harry'
+
+
+def test_partition_equality():
+    assert Partition('type', ['cat']) == Partition('type', ['cat'])
+    assert hash(Partition('type', ['cat'])) == hash(Partition('type', ['cat']))
+    assert Partition('type', ['cat']) != Partition('type', ['dog'])
@@ -71,3 +71,9 @@ def test_picker_call_pets(pets: tuple[Pet, PetDataclass, Pet, PetNamedTuple]):
 )
 def test_walk_with_picker(walk, state, expected_result):
     assert walk | state == expected_result
+
+
+def test_picker_equality():
+    assert Picker(('city', 'zipcode')) == Picker(['city', 'zipcode'])
+    assert hash(Picker(('city', 'zipcode'))) == hash(Picker(['city', 'zipcode']))
+    assert Picker(('city', 'zipcode')) != Picker(('city',))
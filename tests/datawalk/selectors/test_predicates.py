@@ -0,0 +1,106 @@
+from pytest import mark, raises
+
+from datawalk import Walk
+from datawalk.errors import SelectorError
+from datawalk.selectors import _DEFAULT
+from datawalk.selectors.predicates import Between, Compare, Exists, In, Not, Predicate
+
+from tests.conftest import Pet, PetDataclass, PetNamedTuple
+
+
+@mark.parametrize(
+    ['predicate', 'expected_repr'],
+    [
+        (In(['cat', 'dog']), "in ['cat', 'dog']"),
+        (Compare('>=', 18), '>= 18'),
+        (Between(18, 65), 'between 18 and 65'),
+        (Exists(), 'exists'),
+        (Not(['cat']), "not in ['cat']"),
+        (Not(Exists()), 'not exists'),
+    ],
+)
+def test_predicate_repr(predicate, expected_repr):
+    assert repr(predicate) == expected_repr
+
+
+@mark.parametrize(
+    ['predicate', 'matching_values', 'unmatching_values'],
+    [
+        (In(['cat', 'dog']), ['cat', 'dog'], ['bird', _DEFAULT, ['cat']]),
+        (In([['cat'], 'dog']), [['cat'], 'dog'], ['cat', _DEFAULT]),
+        (Compare('==', 18), [18, 18.0], [17, '18', _DEFAULT]),
+        (Compare('!=', 18), [17, '18'], [18, _DEFAULT]),
+        (Compare('<', 18), [17], [18, 19, '17', None, _DEFAULT]),
+        (Compare('<=', 18), [17, 18], [19, _DEFAULT]),
+        (Compare('>', 18), [19], [18, 17, _DEFAULT]),
+        (Compare('>=', 18), [18, 19], [17, _DEFAULT]),
+        (Between(18, 65), [18, 40, 65], [17, 66, None, _DEFAULT]),
+        (Exists(), [None, 0, 'cat'], [_DEFAULT]),
+        (Not(['cat', 'dog']), ['bird', _DEFAULT], ['cat', 'dog']),
+        (Not(Exists()), [_DEFAULT], [None]),
+    ],
+)
+def test_predicate_call(predicate, matching_values: list, unmatching_values: list):
+    for matching_value in matching_values:
+        assert predicate(matching_value), f'{matching_value} should match {predicate}'
+    for unmatching_value in unmatching_values:
+        assert not predicate(unmatching_value), f'{unmatching_value} should not match {predicate}'
+
+
+def test_in_uses_a_set_of_hashable_values():
+    assert In(['cat', 'dog']).hashed_values == frozenset(['cat', 'dog'])
+    assert In([['cat'], 'dog']).hashed_values is None
+
+
+def test_predicate_equality():
+    assert In(['cat', 'dog']) == In(('cat', 'dog'))
+    assert hash(Compare('>=', 18)) == hash(Compare('>=', 18))
+    assert Compare('>=', 18) != Compare('>', 18)
+    assert Between(1, 2) != Compare('>=', 1)
+    assert Not(['cat']) == Not(In(['cat']))
+
+
+def test_predicates_with_values_of_different_types_are_not_equal():
+    assert In([1]) != In([1.0])
+    assert In([1, 2]) != In([True, 2])
+    assert In([(1, 'a')]) != In([(1.0, 'a')])
+    assert Compare('==', 1) != Compare('==', True)
+    assert Between(0, 1) != Between(0.0, 1)
+    assert Not([1]) != Not([1.0])
+    assert In({1, 2}) == In({2, 1})
+
+
+def test_compare_invalid_comparator():
+    with raises(SelectorError) as error:
+        Compare('=>', 18)
+
+    assert str(error.value) == 'unsupported comparator: =>, use one of ==, !=, <, <=, >, >='
+
+
+@mark.parametrize(
+    ['walk', 'expected_names'],
+    [
+        (Walk % ('type', Not(['cat'])), ['Caramel', 'Melody']),
+        (Walk % ('name', Compare('<', 'D')), ['Cinnamon', 'Caramel']),
+        (Walk % ('name', Between('Cinnamon', 'Socks')), ['Cinnamon', 'Melody', 'Socks']),
+        (Walk % ('owner', Exists()), []),
+        (Walk % ('owner', Not(Exists())), ['Cinnamon', 'Caramel', 'Melody', 'Socks']),
+    ],
+)
+def test_walk_with_predicates(pets: tuple[Pet, PetDataclass, Pet, PetNamedTuple], walk: Walk, expected_names):
+    assert [pet.name for pet in walk | pets] == expected_names
+
+
+def test_walk_repr_with_predicates():
+    assert repr(Walk / 'pets' % ('age', Between(1, 3)) / 0) == '.pets %(age between 1 and 3) [0]'
+
+
+def test_predicates_implement_the_abstract_methods():
+    class Incomplete(Predicate):
+        def __call__(self, value) -> bool:
+            return True
+
+    with raises(TypeError):
+        Predicate()
+    with raises(TypeError):
+        Incomplete()
@@ -0,0 +1,104 @@
+from collections import OrderedDict, namedtuple
+from operator import attrgetter, itemgetter, methodcaller
+from types import SimpleNamespace
+from typing import Any, Hashable
+
+from pytest import mark, raises
+
+from datawalk.selectors import _DEFAULT, _typed_value_getter, item_values, named_tuple_index, typed
+
+from tests.conftest import Pet, PetDataclass, PetNamedTuple, UncacheableItem
+
+
+@mark.parametrize(
+    ['value', 'expected_typed_value'],
+    [
+        (1, (int, 1)),
+        (True, (bool, True)),
+        (None, (type(None), None)),
+        ((1, 'a'), (tuple, ((int, 1), (str, 'a')))),
+        ([1, 'a'], (tuple, ((int, 1), (str, 'a')))),
+        ({1}, (frozenset, frozenset({(int, 1)}))),
+        (frozenset({1}), (frozenset, frozenset({(int, 1)}))),
+        ({'a': [1.0]}, (dict, (((str, 'a'), (tuple, ((float, 1.0),))),))),
+    ],
+)
+def test_typed(value: Any, expected_typed_value: tuple):
+    assert typed(value) == expected_typed_value
+
+
+def test_typed_distinguishes_the_equal_values_of_different_types():
+    assert typed(1) != typed(1.0) != typed(True)
+    assert typed({'a': [1]}) != typed({'a': [True]})
+    assert typed([1, 2]) == typed((1, 2))
+    assert typed({1, 2}) == typed(frozenset({2, 1}))
+
+
+@mark.parametrize(
+    ['item_type', 'key', 'expected_index'],
+    [
+        (PetNamedTuple, 'name', 0),
+        (PetNamedTuple, 'type', 1),
+        (namedtuple('Point', 'x y'), 'y', 1),
+        # methods and unknown attributes of named tuples, keys of other types
+        (PetNamedTuple, 'count', None),
+        (PetNamedTuple, 'owner', None),
+        (PetNamedTuple, 0, None),
+        (tuple, 'name', None),
+        (Pet, 'name', None),
+        (dict, 'name', None),
+    ],
+)
+def test_named_tuple_index(item_type: type, key: Hashable, expected_index: int | None):
+    assert named_tuple_index(item_type, key) == expected_index
+
+
+@mark.parametrize(
+    ['item_type', 'key', 'expected_getter'],
+    [
+        (dict, 'name', methodcaller('get', 'name', _DEFAULT)),
+        (OrderedDict, 1, methodcaller('get', 1, _DEFAULT)),
+        (PetNamedTuple, 'type', itemgetter(1)),
+        (Pet, 'name', attrgetter('name')),
+        (PetDataclass, 'type', attrgetter('type')),
+        # no typed getter for dotted names (attrgetter walks them as paths) and non-string attribute names
+        (Pet, 'name.upper', None),
+        (Pet, 1, None),
+        # the getters of unhashable keys and types are not cached
+        (Pet, ['name'], None),
+        (UncacheableItem, 'name', None),
+    ],
+)
+def test_typed_value_getter(item_type: type, key: Hashable, expected_getter: Any):
+    typed_getter = _typed_value_getter(item_type, key)
+    assert repr(typed_getter) == repr(expected_getter)
+
+
+@mark.parametrize(
+    ['items', 'key', 'expected_values'],
+    [
+        # one type per state: typed getters
+        ([{'name': 'a'}, {}], 'name', ['a', _DEFAULT]),
+        ([{(1, 2): 'a'}, {}], (1, 2), ['a', _DEFAULT]),
+        ([PetNamedTuple('Socks', 'cat')], 'type', ['cat']),
+        ([SimpleNamespace(name='a'), SimpleNamespace(name='b')], 'name', ['a', 'b']),
+        # attributes missing in some items
+        ([SimpleNamespace(name='a'), SimpleNamespace()], 'name', ['a', _DEFAULT]),
+        # mixed types
+        ([{'name': 'a'}, PetNamedTuple('Socks', 'cat'), Pet('Cinnamon', 'cat')], 'name', ['a', 'Socks', 'Cinnamon']),
+        # no typed getter
+        ([Pet('Cinnamon', 'cat')], 'name.upper', [_DEFAULT]),
+        # unhashable item type
+        ([UncacheableItem('a'), UncacheableItem('b')], 'name', ['a', 'b']),
+        ([], 'name', []),
+    ],
+)
+def test_item_values(items: list, key: Hashable, expected_values: list):
+    assert item_values(items, key) == expected_values
+
+
+@mark.parametrize('key', [1, ['name']])
+def test_item_values_rejects_the_invalid_attribute_names(key: Any):
+    # like getattr
+    with raises(TypeError):
+        item_values([Pet('Cinnamon', 'cat')], key)
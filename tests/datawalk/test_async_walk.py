@@ -0,0 +1,172 @@
+import asyncio
+from typing import Any
+
+from pytest import mark, raises
+
+from datawalk import Not, Walk
+from datawalk.errors import WalkError
+
+
+class RemoteStore:
+    """
+    Resolves the values after a delay and counts the loads
+    """
+
+    def __init__(self):
+        self.loads_count = 0
+        self.running_loads_count = 0
+        self.max_running_loads_count = 0
+
+    async def load(self, value: Any) -> Any:
+        self.loads_count += 1
+        self.running_loads_count += 1
+        self.max_running_loads_count = max(self.max_running_loads_count, self.running_loads_count)
+        await asyncio.sleep(0.01)
+        self.running_loads_count -= 1
+
+        return value
+
+
+class Org:
+    """
+    An org whose address is a lazy relationship: each access to the attribute returns a new awaitable
+    """
+
+    def __init__(self, store: RemoteStore, name: str, address: dict):
+        self.store = store
+        self.name = name
+        self._address = address
+
+    @property
+    def address(self):
+        return self.store.load(self._address)
+
+
+def test_awalk_awaits_the_awaitable_states():
+    store = RemoteStore()
+    user = {'name': 'Suzie Q', 'org': store.load(Org(store, 'Datawalk', {'city': 'Rennes'}))}
+
+    assert asyncio.run((Walk / 'org' / 'address' / 'city').awalk(user)) == 'Rennes'
+    assert store.loads_count == 2
+
+
+def test_awalk_awaits_the_awaitable_data():
+    store = RemoteStore()
+    assert asyncio.run((Walk / 'name').awalk(store.load({'name': 'Suzie Q'}))) == 'Suzie Q'
+
+
+def test_awalk_on_plain_data(data: dict):
+    assert asyncio.run((Walk / 'org' / 'address' / 'city').awalk(data)) == 'Rennes'
+    assert asyncio.run((Walk / 'friends' @ ('name', 'Suzie Q') / 'phone').awalk(data)) == '06 43 15 27 98'
+
+
+def test_awalk_awaits_the_picked_and_filtered_values_concurrently():
+    store = RemoteStore()
+    contact = {'firstname': store.load('Suzie'), 'lastname': store.load('Q'), 'city': 'Rennes'}
+    assert asyncio.run((Walk // ('firstname', 'lastname', 'city')).awalk(contact)) == {
+        'firstname': 'Suzie',
+        'lastname': 'Q',
+        'city': 'Rennes',
+    }
+    assert store.max_running_loads_count == 2
+
+    store = RemoteStore()
+    friends = [store.load('Frankie'), store.load('Harry'), store.load('Suzie')]
+    assert asyncio.run((Walk / slice(0, 2)).awalk(friends)) == ['Frankie', 'Harry']
+    assert store.max_running_loads_count == 2
+    # the load of the friend which was not selected is not awaited
+    friends[2].close()
+
+
+def test_awalk_with_default_value():
+    store = RemoteStore()
+    user = {'org': store.load({'name': 'Datawalk'})}
+
+    assert asyncio.run((Walk / 'org' / 'address').awalk(user, default=None)) is None
+
+
+def test_awalk_raises_a_walk_error():
+    store = RemoteStore()
+    user = {'org': store.load({'name': 'Datawalk'})}
+
+    with raises(WalkError, match=r'walked \[.org\] but could not find .address in the current data state') as error:
+        asyncio.run((Walk / 'org' / 'address').awalk(user))
+
+    assert error.value.data_state == {'name': 'Datawalk'}
+
+
+def test_awalk_many_shares_the_loads_of_the_records():
+    store = RemoteStore()
+    rennes_org = Org(store, 'Datawalk', {'city': 'Rennes'})
+    nantes_org = Org(store, 'Datawalk', {'city': 'Nantes'})
+    users = [{'org': rennes_org}, {'org': nantes_org}, {'org': rennes_org}, {'org': rennes_org}]
+
+    cities = asyncio.run((Walk / 'org' / 'address' / 'city').awalk_many(users))
+    assert cities == ['Rennes', 'Nantes', 'Rennes', 'Rennes']
+    assert store.loads_count == 2, 'one load per org'
+    assert store.max_running_loads_count == 2, 'the loads of the orgs are concurrent'
+
+
+def test_awalk_many_shares_the_awaitables_of_the_records():
+    store = RemoteStore()
+    shared_org = store.load({'name': 'Datawalk'})
+    users = [{'org': shared_org}, {'org': shared_org}]
+
+    assert asyncio.run((Walk / 'org' / 'name').awalk_many(users)) == ['Datawalk', 'Datawalk']
+    assert store.loads_count == 1
+
+
+def test_awalk_many_with_default_value():
+    store = RemoteStore()
+    users = [{'org': store.load({'name': 'Datawalk'})}, {'org': store.load({})}]
+
+    assert asyncio.run((Walk / 'org' / 'name').awalk_many(users, default=None)) == ['Datawalk', None]
+
+
+def test_awalk_many_raises_a_walk_error():
+    store = RemoteStore()
+    users = [{'org': store.load({'name': 'Datawalk'})}, {'org': store.load({})}]
+
+    with raises(WalkError, match=r'walked \[.org\] but could not find .name in the current data state'):
+        asyncio.run((Walk / 'org' / 'name').awalk_many(users))
+
+
+def test_awalk_many_bounds_the_concurrent_walks():
+    store = RemoteStore()
+    users = [{'org': store.load({'name': f'org {index}'})} for index in range(10)]
+
+    orgs = asyncio.run((Walk / 'org' / 'name').awalk_many(users, max_concurrency=3))
+    assert orgs == [f'org {index}' for index in range(10)]
+    assert store.max_running_loads_count == 3
+
+
+@mark.parametrize('max_concurrency', [0, -1])
+def test_awalk_many_rejects_invalid_max_concurrencies(max_concurrency: int):
+    with raises(ValueError, match=f'the maximum concurrency must be positive: {max_concurrency}'):
+        asyncio.run((Walk / 'name').awalk_many([], max_concurrency=max_concurrency))
+
+
+class UnhashableLoader:
+    """
+    An unhashable custom selector loading the value of the key
+    """
+
+    __hash__ = None
+
+    def __init__(self, store: RemoteStore, key: str):
+        self.store = store
+        self.key = key
+
+    def __call__(self, state: dict) -> Any:
+        return self.store.load(state[self.key])
+
+
+def test_awalk_many_with_unhashable_selectors():
+    store = RemoteStore()
+    org = {'name': 'Datawalk'}
+    users = [{'org': org}, {'org': org}]
+
+    assert asyncio.run(Walk(UnhashableLoader(store, 'org')).awalk_many(users)) == [org, org]
+    # the loads of unhashable selectors are not shared
+    assert store.loads_count == 2
+    assert asyncio.run((Walk % ('tags', Not([[]])) / 0).awalk([{'tags': ['a']}])) == {'tags': ['a']}
@@ -0,0 +1,161 @@
+import io
+import json
+import os
+import runpy
+import subprocess
+import sys
+from pathlib import Path
+
+from pytest import CaptureFixture, MonkeyPatch, fixture, mark, raises
+
+from datawalk.cli import main
+
+USERS = [
+    {'name': 'Suzie Q', 'address': {'city': 'Rennes'}, 'tags': ['swing']},
+    {'name': 'Harry Cover', 'tags': []},
+]
+
+
+@fixture
+def users_jsonl() -> str:
+    return '\n'.join(json.dumps(user) for user in USERS) + '\n'
+
+
+@fixture
+def users_path(tmp_path: Path, users_jsonl: str) -> Path:
+    users_path = tmp_path / 'users.jsonl'
+    users_path.write_text(users_jsonl)
+
+    return users_path
+
+
+def _set_stdin(monkeypatch: MonkeyPatch, text: str):
+    monkeypatch.setattr('sys.stdin', io.TextIOWrapper(io.BytesIO(text.encode())))
+
+
+@mark.parametrize('workers', ['1', '2'])
+def test_cli_streams_the_standard_input_as_jsonl(
+    monkeypatch: MonkeyPatch, capsys: CaptureFixture, users_jsonl: str, workers: str
+):
+    _set_stdin(monkeypatch, users_jsonl)
+
+    assert main(['.name', '--workers', workers]) == 0
+    assert capsys.readouterr().out == '"Suzie Q"\n"Harry Cover"\n'
+
+
+def test_cli_writes_arrays_of_values_with_several_walks(capsys: CaptureFixture, users_path: Path):
+    assert main(['.name', '.address .city', '--default', 'null', '--input', str(users_path)]) == 0
+    assert capsys.readouterr().out == '["Suzie Q", "Rennes"]\n["Harry Cover", null]\n'
+
+
+def test_cli_writes_csv(capsys: CaptureFixture, users_path: Path):
+    arguments = ['.name', '.address .city', '.tags', '--default', 'null', '--output-format', 'csv']
+    assert main([*arguments, '-i', str(users_path), '-i', str(users_path)]) == 0
+    assert capsys.readouterr().out == (
+        '.name,.address .city,.tags\n'
+        'Suzie Q,Rennes,"[""swing""]"\n'
+        'Harry Cover,,[]\n'
+        'Suzie Q,Rennes,"[""swing""]"\n'
+        'Harry Cover,,[]\n'
+    )
+
+
+def test_cli_walks_json_documents(monkeypatch: MonkeyPatch, capsys: CaptureFixture):
+    _set_stdin(monkeypatch, json.dumps({'users': USERS}, indent=2))
+
+    assert main(['.users @(name==Harry Cover) .tags', '--input-format', 'json']) == 0
+    assert capsys.readouterr().out == '[]\n'
+
+
+def test_cli_prints_the_stats_on_the_standard_error(capsys: CaptureFixture, users_path: Path):
+    assert main(['.name', '--input', str(users_path), '--stats']) == 0
+    assert capsys.readouterr().err.startswith('2 records in ')
+
+
+@mark.parametrize(
+    ['arguments', 'expected_error'],
+    [
+        (['.address .city'], 'datawalk: error: walked [] but could not find .address in the current data state'),
+        (
+            ['.name', '--input', 'missing.jsonl'],
+            "datawalk: error: [Errno 2] No such file or directory: 'missing.jsonl'",
+        ),
+    ],
+)
+def test_cli_reports_the_walk_and_input_errors(
+    monkeypatch: MonkeyPatch, capsys: CaptureFixture, users_jsonl: str, arguments: list[str], expected_error: str
+):
+    _set_stdin(monkeypatch, users_jsonl)
+
+    assert main(arguments) == 1
+    assert capsys.readouterr().err.strip() == expected_error
+
+
+@mark.parametrize(
+    ['arguments', 'expected_error'],
+    [
+        (['.name', '--default', 'none'], 'invalid JSON value: none'),
+        (['.name', '--workers', '0'], 'the number of workers must be positive: 0'),
+        (['[oops'], 'invalid selector at position 0 of the walk: [oops'),
+    ],
+)
+def test_cli_rejects_invalid_arguments(capsys: CaptureFixture, arguments: list[str], expected_error: str):
+    with raises(SystemExit) as system_exit:
+        main(arguments)
+
+    assert system_exit.value.code == 2
+    assert expected_error in capsys.readouterr().err
+
+
+def test_cli_walks_json_files(capsys: CaptureFixture, tmp_path: Path):
+    json_path = tmp_path / 'users.json'
+    json_path.write_text(json.dumps({'users': USERS}))
+
+    assert main(['.users [*] .name', '--input-format', 'json', '-i', str(json_path), '-i', str(json_path)]) == 0
+    assert capsys.readouterr().out == '["Suzie Q", "Harry Cover"]\n["Suzie Q", "Harry Cover"]\n'
+
+
+class BrokenPipeOutput(io.StringIO):
+    """
+    An output whose reader stopped reading, backed by a file descriptor which the CLI redirects to /dev/null
+    """
+
+    def __init__(self, file_descriptor: int):
+        super().__init__()
+        self.file_descriptor = file_descriptor
+
+    def write(self, text: str) -> int:
+        raise BrokenPipeError(32, 'Broken pipe')
+
+    def fileno(self) -> int:
+        return self.file_descriptor
+
+
+def test_cli_stops_when_the_output_pipe_is_broken(monkeypatch: MonkeyPatch, users_path: Path, tmp_path: Path):
+    with (tmp_path / 'output.txt').open('w') as output_file:
+        monkeypatch.setattr('sys.stdout', BrokenPipeOutput(output_file.fileno()))
+        assert main(['.name', '--input', str(users_path)]) == 1
+
+
+def test_cli_runs_as_a_module(monkeypatch: MonkeyPatch, capsys: CaptureFixture, users_path: Path):
+    monkeypatch.setattr('sys.argv', ['datawalk', '.name', '--input', str(users_path)])
+    with raises(SystemExit) as system_exit:
+        runpy.run_module('datawalk', run_name='__main__')
+
+    assert system_exit.value.code == 0
+    assert capsys.readouterr().out == '"Suzie Q"\n"Harry Cover"\n'
+
+
+def test_cli_discards_the_output_read_by_a_stopped_reader(users_path: Path):
+    # the head of the output is read by a process which stops reading
+    datawalk = subprocess.Popen(
+        [sys.executable, '-m', 'datawalk', '.name', '-i', str(users_path), '-i', str(users_path)],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        env={**os.environ, 'PYTHONPATH': os.pathsep.join(sys.path)},
+    )
+    datawalk.stdout.close()
+    _, errors = datawalk.communicate(timeout=30)
+
+    assert datawalk.returncode == 1
+    assert b'Traceback' not in errors
@@ -0,0 +1,116 @@
+import sys
+
+from pytest import importorskip, mark, raises
+
+from datawalk import Walk, WalkSet
+from datawalk.errors import SelectorError, WalkError
+
+numpy = importorskip('numpy')
+
+PRODUCTS = [
+    {'product': {'name': 'apple', 'price': 1.5, 'stock': 10}},
+    {'product': {'name': 'banana', 'stock': 20}},
+    {'product': {'name': 'cherry', 'price': 4.0, 'stock': 30}},
+]
+
+
+def products_generator():
+    yield from PRODUCTS
+
+
+def test_column():
+    prices = (Walk / 'product' / 'price').column(PRODUCTS, dtype=float, default=numpy.nan)
+    assert prices.dtype == numpy.float64
+    numpy.testing.assert_array_equal(prices, [1.5, numpy.nan, 4.0])
+
+
+def test_column_of_iterator():
+    stocks = (Walk / 'product' / 'stock').column(products_generator(), dtype=numpy.int32)
+    assert stocks.dtype == numpy.int32
+    numpy.testing.assert_array_equal(stocks, [10, 20, 30])
+
+
+@mark.parametrize(
+    ['values', 'expected_dtype'],
+    [
+        ([10, 20, 30], numpy.int64),
+        ([True, False], numpy.bool_),
+        ([1, 2.5, 3], numpy.float64),
+        ([True, 2], numpy.int64),
+        ([1, 2 + 1j], numpy.complex128),
+        (['apple', 'banana split'], object),
+        ([1, 'apple'], object),
+        ([1.5, None], object),
+        ([[1, 2], [3]], object),
+        ([2**70, 1], object),
+    ],
+)
+def test_column_infers_the_dtype_from_the_values(values: list, expected_dtype: type):
+    records = [{'value': value} for value in values]
+    for column in (Walk / 'value').column(records), (Walk / 'value').column(iter(records)):
+        assert column.dtype == expected_dtype
+        assert column.tolist() == values
+
+
+def test_column_infers_the_dtype_from_the_values_and_the_default():
+    prices = (Walk / 'product' / 'price').column(PRODUCTS, default=0)
+    assert prices.dtype == numpy.float64
+    assert prices.tolist() == [1.5, 0.0, 4.0]
+    labelled_prices = (Walk / 'product' / 'price').column(PRODUCTS, default='unknown')
+    assert labelled_prices.dtype == object
+    assert labelled_prices.tolist() == [1.5, 'unknown', 4.0]
+
+
+def test_masked_column():
+    prices = (Walk / 'product' / 'price').column(products_generator(), masked=True)
+    assert isinstance(prices, numpy.ma.MaskedArray)
+    assert prices.mask.tolist() == [False, True, False]
+    assert prices.sum() == 5.5
+
+
+def test_column_without_default():
+    with raises(WalkError) as error:
+        (Walk / 'product' / 'price').column(PRODUCTS)
+
+    assert str(error.value) == 'walked [.product] but could not find .price in the current data state'
+
+
+def test_columns_of_picker():
+    columns = (Walk / 'product' // ('name', 'price')).columns(
+        PRODUCTS, dtypes={'name': object, 'price': float}, masked=True
+    )
+    assert list(columns) == ['name', 'price']
+    assert columns['name'].tolist() == ['apple', 'banana', 'cherry']
+    assert columns['price'].mask.tolist() == [False, True, False]
+
+    inferred_columns = (Walk / 'product' // ('name', 'stock')).columns(PRODUCTS)
+    assert inferred_columns['name'].dtype == object
+    assert inferred_columns['name'].tolist() == ['apple', 'banana', 'cherry']
+    assert inferred_columns['stock'].dtype == numpy.int64
+
+
+def test_columns_requires_a_picker():
+    with raises(SelectorError) as error:
+        (Walk / 'product' / 'price').columns(PRODUCTS)
+
+    assert str(error.value) == 'the walk must end with a picker (//) to extract columns: .product .price'
+
+
+def test_walk_set_columns():
+    walk_set = WalkSet({'stock': Walk / 'product' / 'stock', 'price': Walk / 'product' / 'price'})
+    columns = walk_set.columns(products_generator(), dtypes=float, default=0.0)
+    numpy.testing.assert_array_equal(columns['stock'], [10.0, 20.0, 30.0])
+    numpy.testing.assert_array_equal(columns['price'], [1.5, 0.0, 4.0])
+
+    with raises(WalkError) as error:
+        walk_set.columns(PRODUCTS)
+
+    assert str(error.value) == 'walked [.product] but could not find .price in the current data state'
+
+
+def test_column_without_numpy(monkeypatch):
+    monkeypatch.setitem(sys.modules, 'numpy', None)
+    with raises(ImportError) as error:
+        (Walk / 'product' / 'price').column(PRODUCTS)
+
+    assert str(error.value) == 'NumPy is required to extract columns, install it with: pip install "datawalk[numpy]"'
@@ -0,0 +1,110 @@
+from collections import OrderedDict
+
+from pytest import mark, raises
+
+from datawalk import Walk
+from datawalk.errors import WalkError
+
+from tests.conftest import Pet, PetDataclass, PetNamedTuple
+
+
+@mark.parametrize(
+    ['walk'],
+    [
+        (Walk(),),
+        (Walk / 'name',),
+        (Walk / 'org' / 'address' / 'country',),
+        (Walk / 'org' / 'address' // ('city', 'zipcode'),),
+        (Walk / 'org' / 'phones' / 1,),
+        (Walk / 'org' / 'phones' / -1,),
+        (Walk / 'org' / (666, 'ev/l'),),
+        (Walk / 'friends' / slice(1, -1),),
+        (Walk / 'friends' @ ('name', 'Suzie Q') / 'phone',),
+        (Walk / 'pets' @ ('name', 'Caramel') / 'name',),
+        (Walk / 'pets' % ('type', ['cat']) / 1 / 'name',),
+        (Walk / 'pets' / 3 / 'type',),
+    ],
+)
+def test_compiled_walk_returns_the_walked_value(data: dict, walk: Walk):
+    assert walk.compile()(data) == walk.walk(data)
+
+
+def test_compiled_walk_is_generated_once():
+    walk = Walk / 'org' / 'title'
+    assert walk.compile() is walk.compile()
+
+
+def test_compiled_walk_handles_mappings_and_objects():
+    walk = Walk / 'org' / 'name'
+    assert walk.compile()(OrderedDict(org=Pet('Melody', 'bird'))) == 'Melody'
+    assert walk.compile()({'org': {'name': 'Datawalk'}}) == 'Datawalk'
+
+
+@mark.parametrize(
+    ['invalid_walk', 'expected_error_message', 'current_data_state'],
+    [
+        (
+            Walk / 'org' / 'phones' / 1 / 'phone',
+            'walked [.org, .phones, [1]] but could not find .phone in the current data state',
+            '02 13 46 58 79',
+        ),
+        (
+            Walk / 'org' / 'phones' / 2,
+            'walked [.org, .phones] but could not find [2] in the current data state',
+            ['01 23 45 67 89', '02 13 46 58 79'],
+        ),
+        (
+            Walk / 'pets' @ ('name', 'Vanilla') / 'name',
+            'walked [.pets] but could not find @(name==Vanilla) in the current data state',
+            (
+                Pet(name='Cinnamon', type='cat'),
+                PetDataclass(name='Caramel', type='dog'),
+                Pet(name='Melody', type='bird'),
+                PetNamedTuple(name='Socks', type='cat'),
+            ),
+        ),
+        (
+            Walk / 'nickname',
+            'walked [] but could not find .nickname in the current data state',
+            None,
+        ),
+    ],
+)
+def test_compiled_walk_invalid_path_without_default(
+    data: dict, invalid_walk: Walk, expected_error_message: str, current_data_state
+):
+    if current_data_state is None:
+        current_data_state = data
+
+    with raises(WalkError) as error:
+        invalid_walk.compile()(data)
+
+    walk_error: WalkError = error.value
+    assert str(walk_error) == expected_error_message
+    assert walk_error.data_state == current_data_state
+
+
+@mark.parametrize(
+    ['invalid_walk'],
+    [
+        (Walk / 'org' / 'phones' / 1 / 'phone',),
+        (Walk / 'friends' @ ('name', 'John Doe'),),
+        (Walk / 'pets' @ ('name', 'Vanilla') / 'name',),
+    ],
+)
+def test_compiled_walk_invalid_path_with_default(data: dict, invalid_walk: Walk):
+    assert invalid_walk.compile()(data, default='☹️') == '☹️'
+
+
+def test_compiled_walk_returns_the_default_value_of_missing_dict_keys(data: dict):
+    compiled_walk = (Walk / 'org' / 'zipcode').compile()
+    assert compiled_walk(data, default=None) is None
+    with raises(WalkError) as error:
+        compiled_walk(data)
+
+    assert str(error.value) == 'walked [.org] but could not find .zipcode in the current data state'
+
+
+def test_compiled_walk_retrieves_dict_attributes(data: dict):
+    org = data['org']
+    assert (Walk / 'org' / 'items').compile()(data, default=None) == org.items
@@ -1,33 +1,17 @@
+from concurrent.futures import ThreadPoolExecutor
+from threading import Barrier
 from typing import Any
 
-from pytest import fixture, mark, raises
+from pytest import mark, raises
 
-from datawalk import Walk
+from datawalk import Not, Walk
 from datawalk.errors import SelectorError, WalkError
+from datawalk.selectors.by_key import ByKey
+from datawalk.selectors.first import First
 
 from tests.conftest import Pet, PetDataclass, PetNamedTuple
 
 
-@fixture
-def data(pets) -> dict:
-    return {
-        'name': 'Lucie Nation',
-        'org': {
-            'title': 'Datawalk',
-            'address': {'country': 'France', 'city': 'Rennes', 'zipcode': '35700'},
-            'phones': ['01 23 45 67 89', '02 13 46 58 79'],
-            (666, 'ev/l'): 'hashable key',
-        },
-        'friends': [
-            {'name': 'Frankie Manning'},
-            {'name': 'Harry Cover'},
-            {'name': 'Suzie Q', 'phone': '06 43 15 27 98'},
-            {'name': 'Jean Blasin'},
-        ],
-        'pets': pets,
-    }
-
-
 def test_walks_are_immutable_when_appending_selectors():
     org_walk = Walk / 'org'
     org_walk_repr = repr(org_walk)
@@ -204,3 +188,163 @@ def test_walk_with_operators(data: dict, pets):
     assert Walk % ('type', ['dog']) / 0 / 'name' | pets == 'Caramel'
     # pick key:value items
     assert Walk // ('name', 'pets') | data == {'name': 'Lucie Nation', 'pets': pets}
+
+
+def test_walk_many_is_lazy(friends: list[dict]):
+    consumed_friends = []
+
+    def friends_generator():
+        for friend in friends:
+            consumed_friends.append(friend)
+            yield friend
+
+    names = (Walk / 'name').walk_many(friends_generator())
+    assert consumed_friends == []
+    assert next(names) == 'Frankie Manning'
+    assert consumed_friends == friends[:1]
+    assert list(names) == ['Harry Cover', 'Suzie Q', 'Jean Blasin']
+
+
+def test_walk_many_with_default(friends: list[dict]):
+    phones = (Walk / 'phone').walk_many(iter(friends), default=None)
+    assert list(phones) == [None, None, '06 43 15 27 98', None]
+
+
+def test_walk_many_without_default(friends: list[dict]):
+    phones = (Walk / 'phone').walk_many(friends)
+    with raises(WalkError) as error:
+        list(phones)
+
+    assert str(error.value) == 'walked [] but could not find .phone in the current data state'
+    assert error.value.data_state == {'name': 'Frankie Manning'}
+
+
+def test_walk_list(pets):
+    assert (Walk / 'name').walk_list(pets) == ['Cinnamon', 'Caramel', 'Melody', 'Socks']
+    assert (Walk / 'nickname').walk_list(pets, default='') == ['', '', '', '']
+
+
+@mark.parametrize(
+    ['walk', 'expected_value'],
+    [
+        (Walk @ ('name', 'Suzie Q') / 'phone', '06 43 15 27 98'),
+        (Walk % ('name', ['Harry Cover', 'Jean Blasin']) / 1 / 'name', 'Jean Blasin'),
+        (Walk / slice(1, None) @ ('name', 'Jean Blasin') / 'name', 'Jean Blasin'),
+        (Walk / slice(1, None, 2) / 0 / 'name', 'Harry Cover'),
+        (Walk / 2 / 'name', 'Suzie Q'),
+    ],
+)
+def test_walk_on_generators(friends: list[dict], walk: Walk, expected_value: Any):
+    assert walk | (friend for friend in friends) == expected_value
+    assert walk.compile()(friend for friend in friends) == expected_value
+
+
+def test_walk_with_default_retrieves_dict_attributes_of_missing_keys(data: dict):
+    org = data['org']
+    assert Walk / 'org' / 'items' ^ (data, None) == org.items
+    assert Walk / 'org' / 'zipcode' ^ (data, None) is None
+    assert Walk / 'org' / ['unhashable'] ^ (data, None) is None
+
+
+@mark.parametrize(
+    ['walk', 'expected_value'],
+    [
+        (Walk / 'org' / 'phones' / 1, '02 13 46 58 79'),
+        (Walk / 'org' / 'phones' / -1, '02 13 46 58 79'),
+        (Walk / 'org' / 'phones' / 2, None),
+        (Walk / 'org' / 'phones' / -3, None),
+        (Walk / 'pets' / 3 / 'type', 'cat'),
+        (Walk / 'pets' / 0 / 'age', None),
+        (Walk / 'pets' / 3 / 'age', None),
+        (Walk / 'pets' / 5 / 'name', None),
+    ],
+)
+def test_walk_with_default_detects_the_missing_indices_and_attributes(data: dict, walk: Walk, expected_value: Any):
+    assert walk.walk(data, default=None) == expected_value
+
+
+def test_walks_are_equal_and_hashed_by_selectors():
+    walk = Walk / 'friends' @ ('name', 'Suzie Q') / 'phone'
+    same_walk = Walk(ByKey('friends'), First('name', 'Suzie Q'), ByKey('phone'))
+
+    assert walk == same_walk
+    assert hash(walk) == hash(same_walk)
+    assert walk != Walk / 'friends' @ ('name', 'Suzie Q')
+    assert walk != Walk / 'friends' @ ('name', 'Suzie Q') / 'name'
+    assert {walk: 'phone'}[same_walk] == 'phone'
+
+
+def test_equal_walks_are_interned():
+    walk = Walk / 'org' / 'address' / 'city'
+
+    assert Walk / 'org' / 'address' / 'city' is walk
+    assert Walk(*walk.selectors) is walk
+    assert (Walk / 'org') + (Walk / 'address' / 'city') is walk
+    assert walk / ... is Walk / 'org' / 'address'
+    assert walk.parent.parent is Walk / 'org'
+    assert Walk() / ... is Walk()
+
+
+def test_threads_creating_equal_walks_get_the_same_walk():
+    threads_count = 8
+    barrier = Barrier(threads_count)
+
+    def create_walks(thread_index: int) -> list[Walk]:
+        pair_index = thread_index // 2
+        barrier.wait()
+        return [Walk / 'threads' / pair_index / step for step in range(200)]
+
+    with ThreadPoolExecutor(threads_count) as pool:
+        walks_by_thread = list(pool.map(create_walks, range(threads_count)))
+
+    # the threads of each pair created the same walks concurrently
+    for first_walks, second_walks in zip(walks_by_thread[::2], walks_by_thread[1::2]):
+        assert all(first_walk is second_walk for first_walk, second_walk in zip(first_walks, second_walks))
+
+
+def test_walks_with_values_of_different_types_are_not_interned_together():
+    int_walk = Walk / 'x' @ ('v', 1)
+    bool_walk = Walk / 'x' @ ('v', True)
+    assert bool_walk is not int_walk
+    assert repr(bool_walk) == '.x @(v==True)'
+    assert bool_walk.to_spec()[-1] == ('@', 'v', True)
+    assert Walk.from_spec(bool_walk.to_spec()) is bool_walk
+
+    int_filter_walk = Walk % ('v', [1.0])
+    filter_walk = Walk % ('v', [1])
+    assert filter_walk is not int_filter_walk
+    assert repr(filter_walk) == '%(v in [1])'
+    assert Walk.parse(repr(filter_walk)) is filter_walk
+    assert Walk / 'x' @ (1, 'a') is not Walk / 'x' @ (1.0, 'a')
+    assert Walk / slice(1, None) is not Walk / slice(True, None)
+
+
+def test_walks_with_unhashable_selectors_are_not_interned(data: dict):
+    friends_walk = Walk / 'friends' % ('tags', Not([[]])) / 0 / 'name'
+
+    assert friends_walk | data == 'Frankie Manning'
+    assert friends_walk == Walk / 'friends' % ('tags', Not([[]])) / 0 / 'name'
+    with raises(TypeError):
+        hash(friends_walk)
+
+
+def test_deep_walks_can_follow_an_unhashable_selector(data: dict):
+    walk = Walk / 'org' / ['unhashable']
+    for index in range(5000):
+        walk = walk / index
+
+    assert len(walk.selectors) == 5002
+    assert walk ^ (data, None) is None
+    assert walk == Walk(*walk.selectors)
+    with raises(TypeError):
+        hash(walk)
+    assert (Walk / 'org' / 'name') is Walk / 'org' / 'name', 'the hashable walks are still interned'
+
+
+def test_walks_built_step_by_step_share_their_parents():
+    walk = Walk()
+    for index in range(5000):
+        walk = walk / index
+
+    assert walk.selectors == tuple(ByKey(index) for index in range(5000))
+    assert walk.parent.parent.selectors == walk.selectors[:-2]
@@ -0,0 +1,45 @@
+import pickle
+
+from pytest import raises
+
+from datawalk import Walk
+from datawalk.errors import WalkError
+
+
+def test_walk_error_formats_its_message_when_read(data: dict):
+    with raises(WalkError) as error:
+        Walk / 'org' / 'address' / 'planet' | data
+
+    walk_error: WalkError = error.value
+    assert walk_error._message is None
+    assert str(walk_error) == 'walked [.org, .address] but could not find .planet in the current data state'
+    assert repr(walk_error) == (
+        "WalkError('walked [.org, .address] but could not find .planet in the current data state')"
+    )
+
+
+def test_walk_error_with_message():
+    walk_error = WalkError('could not walk', data_state=[])
+    assert str(walk_error) == 'could not walk'
+    assert walk_error.args == ('could not walk',)
+    assert walk_error.data_state == []
+
+
+def test_walk_error_data_state_repr_is_bounded():
+    walk_error = WalkError(data_state={'records': [{'id': index, 'tags': ['tag'] * 100} for index in range(1000)]})
+
+    assert walk_error.data_state_repr == (
+        "{'records': [{'id': 0, 'tags': [...]}, {'id': 1, 'tags': [...]}, {'id': 2, 'tags': [...]}, "
+        "{'id': 3, 'tags': [...]}, {'id': 4, 'tags': [...]}, {'id': 5, 'tags': [...]}, {'id': 6, 'tags': [...]}, "
+        "{'id': 7, 'tags': [...]}, ...]}"
+    )
+    assert len(WalkError(data_state='x' * 1000).data_state_repr) <= 80
+
+
+def test_walk_error_is_picklable(data: dict):
+    with raises(WalkError) as error:
+        Walk / 'org' / 'phones' / 3 | data
+
+    unpickled_error = pickle.loads(pickle.dumps(error.value))
+    assert str(unpickled_error) == str(error.value)
+    assert unpickled_error.data_state == ['01 23 45 67 89', '02 13 46 58 79']
@@ -0,0 +1,101 @@
+import pickle
+from concurrent.futures import ThreadPoolExecutor
+
+from pytest import raises
+
+from datawalk import IndexedSequence, Walk
+from datawalk.errors import WalkError
+from datawalk.selectors.all import All
+from datawalk.selectors.first import First
+
+from tests.conftest import Pet, PetDataclass, PetNamedTuple
+
+
+def test_indexed_sequence_behaves_like_the_wrapped_sequence(pets: tuple[Pet, PetDataclass, Pet, PetNamedTuple]):
+    indexed_pets = IndexedSequence(pets)
+    assert len(indexed_pets) == 4
+    assert list(indexed_pets) == list(pets)
+    assert indexed_pets[1] == pets[1]
+    assert indexed_pets[1:3] == pets[1:3]
+    assert Walk / 2 / 'name' | indexed_pets == 'Melody'
+
+
+def test_first_with_indexed_sequence(pets: tuple[Pet, PetDataclass, Pet, PetNamedTuple]):
+    cinnamon, caramel, _, _ = pets
+    indexed_pets = IndexedSequence(pets)
+    assert First('type', 'dog')(indexed_pets) == caramel
+    assert First('type', 'cat')(indexed_pets) == cinnamon, 'the first matching item is returned'
+    with raises(StopIteration):
+        First('type', 'fish')(indexed_pets)
+
+
+def test_all_with_indexed_sequence(pets: tuple[Pet, PetDataclass, Pet, PetNamedTuple]):
+    cinnamon, caramel, _, socks = pets
+    indexed_pets = IndexedSequence(pets)
+    assert All('type', ['cat', 'dog'])(indexed_pets) == [cinnamon, caramel, socks], 'items are returned in order'
+    assert All('type', ['dog', 'dog'])(indexed_pets) == [caramel]
+    assert All('type', ['fish'])(indexed_pets) == []
+
+
+def test_indexes_are_built_once_and_reused_across_walks(pets: tuple[Pet, PetDataclass, Pet, PetNamedTuple]):
+    indexed_pets = IndexedSequence(pets)
+    assert Walk @ ('name', 'Socks') / 'type' | indexed_pets == 'cat'
+    name_index = indexed_pets._indexes['name']
+    assert Walk % ('name', ['Melody', 'Caramel']) / 0 / 'type' | indexed_pets == 'dog'
+    assert indexed_pets._indexes['name'] is name_index
+
+
+def test_indexes_are_bounded(pets: tuple[Pet, PetDataclass, Pet, PetNamedTuple]):
+    indexed_pets = IndexedSequence(pets, max_indexes=1)
+    assert Walk @ ('name', 'Socks') / 'type' | indexed_pets == 'cat'
+    assert Walk @ ('type', 'bird') / 'name' | indexed_pets == 'Melody'
+    assert list(indexed_pets._indexes) == ['type'], 'the least recently used index was dropped'
+
+
+def test_invalidate_indexes():
+    friends = [{'name': 'Harry Cover'}, {'name': 'Suzie Q'}]
+    indexed_friends = IndexedSequence(friends)
+    suzie_walk = Walk @ ('name', 'Suzie Q')
+    assert suzie_walk | indexed_friends == {'name': 'Suzie Q'}
+
+    friends.insert(0, {'name': 'Suzie Q', 'phone': '06 43 15 27 98'})
+    indexed_friends.invalidate('name')
+    assert suzie_walk | indexed_friends == {'name': 'Suzie Q', 'phone': '06 43 15 27 98'}
+
+    friends.pop(0)
+    indexed_friends.invalidate()
+    assert indexed_friends._indexes == {}
+    assert suzie_walk | indexed_friends == {'name': 'Suzie Q'}
+
+
+def test_unhashable_values_are_scanned():
+    friends = IndexedSequence([{'name': 'Harry Cover', 'phones': ['01']}, {'name': 'Suzie Q', 'phones': ['02']}])
+    assert Walk @ ('phones', ['02']) / 'name' | friends == 'Suzie Q'
+    assert Walk % ('name', [['Suzie Q'], 'Harry Cover']) / 0 / 'phones' | friends == ['01']
+    with raises(WalkError):
+        Walk @ ('phones', ['03']) | friends
+
+
+def test_indexed_sequence_shared_by_threads():
+    friends = IndexedSequence([{'name': f'friend {index}', 'group': index % 3} for index in range(100)], max_indexes=1)
+    walks = [Walk @ ('name', 'friend 42') / 'group', Walk % ('group', [2]) / 0 / 'name']
+
+    def walk_friends(walk_index: int) -> list:
+        # alternating keys with a single index forces concurrent index builds and evictions
+        return [walks[(walk_index + call) % 2] | friends for call in range(200)]
+
+    with ThreadPoolExecutor(4) as pool:
+        values = [value for walk_values in pool.map(walk_friends, range(8)) for value in walk_values]
+
+    assert set(values) == {0, 'friend 2'}
+
+
+def test_indexed_sequence_pickling_drops_the_indexes():
+    friends = IndexedSequence([{'name': 'Harry Cover'}, {'name': 'Suzie Q'}], max_indexes=2)
+    assert Walk @ ('name', 'Suzie Q') | friends == {'name': 'Suzie Q'}
+
+    unpickled_friends = pickle.loads(pickle.dumps(friends))
+    assert list(unpickled_friends) == list(friends)
+    assert unpickled_friends.max_indexes == 2
+    assert unpickled_friends._indexes == {}
+    assert Walk @ ('name', 'Suzie Q') | unpickled_friends == {'name': 'Suzie Q'}
@@ -0,0 +1,177 @@
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterator
+
+from pytest import fixture, raises
+
+from datawalk import IndexedSequence, SortedSequence, Walk, instrumentation
+from datawalk.errors import WalkError
+from datawalk.selectors.all import All
+from datawalk.selectors.by_key import ByKey
+from datawalk.selectors.first import First
+from datawalk.selectors.predicates import Between, Not
+
+
+@fixture
+def instrumented() -> Iterator[None]:
+    instrumentation.reset()
+    instrumentation.enable()
+    yield
+    instrumentation.disable()
+    instrumentation.reset()
+
+
+def _outcomes(statistics: instrumentation.WalkStatistics) -> tuple[int, int, int, int]:
+    return statistics.calls, statistics.hits, statistics.misses, statistics.defaults
+
+
+def test_instrumentation_is_disabled_by_default(data: dict):
+    assert not instrumentation.enabled
+    assert Walk / 'org' / 'title' | data == 'Datawalk'
+    assert instrumentation.snapshot().walks == {}
+
+
+def test_instrumentation_records_walk_outcomes(instrumented, data: dict):
+    title_walk = Walk / 'org' / 'title'
+    planet_walk = Walk / 'org' / 'address' / 'planet'
+    assert title_walk | data == 'Datawalk'
+    assert title_walk | data == 'Datawalk'
+    assert planet_walk ^ (data, 'Earth') == 'Earth'
+    with raises(WalkError, match='could not find .planet'):
+        planet_walk | data
+
+    snapshot = instrumentation.snapshot()
+    title_statistics = snapshot.walks[title_walk]
+    assert _outcomes(title_statistics) == (2, 2, 0, 0)
+    assert title_statistics.total_ns > 0
+    assert title_statistics.average_ns == title_statistics.total_ns / 2
+    planet_statistics = snapshot.walks[planet_walk]
+    assert _outcomes(planet_statistics) == (2, 0, 1, 1)
+
+    org_statistics = snapshot.selectors[ByKey('org')]
+    assert (org_statistics.calls, org_statistics.hits, org_statistics.misses) == (4, 4, 0)
+    planet_key_statistics = snapshot.selectors[ByKey('planet')]
+    assert (planet_key_statistics.calls, planet_key_statistics.hits, planet_key_statistics.misses) == (2, 0, 2)
+    assert [walk for walk, _ in snapshot.hot_walks(2)] in ([title_walk, planet_walk], [planet_walk, title_walk])
+
+
+def test_instrumentation_counts_the_items_scanned_by_first_and_all(instrumented, friends: list[dict]):
+    assert Walk @ ('name', 'Suzie Q') / 'phone' | friends == '06 43 15 27 98'
+    assert Walk % ('name', ['Harry Cover', 'Jean Blasin']) | friends == [friends[1], friends[3]]
+    assert list(Walk % ('name', ['Harry Cover']) | iter(friends)) == [friends[1]]
+    assert Walk @ ('name', 'Bob') ^ (friends, None) is None
+
+    snapshot = instrumentation.snapshot()
+    first_statistics = snapshot.selectors[First('name', 'Suzie Q')]
+    assert (first_statistics.scans, first_statistics.scanned_items, first_statistics.average_scanned) == (1, 3, 3.0)
+    all_statistics = snapshot.selectors[All('name', ['Harry Cover', 'Jean Blasin'])]
+    assert (all_statistics.scans, all_statistics.scanned_items) == (1, 4)
+    # the iterators are filtered lazily, their items are counted once consumed
+    lazy_all_statistics = snapshot.selectors[All('name', ['Harry Cover'])]
+    assert (lazy_all_statistics.scans, lazy_all_statistics.scanned_items) == (1, 4)
+    missing_statistics = snapshot.selectors[First('name', 'Bob')]
+    assert (missing_statistics.misses, missing_statistics.scanned_items) == (1, 4)
+
+
+def test_instrumentation_records_the_optimized_filters_as_their_all_selector(instrumented, friends: list[dict]):
+    # % (key, values) / n and [a:b] % (key, values) [c:d] are fused into one-pass filters stopping early
+    assert Walk % ('name', ['Harry Cover', 'Suzie Q']) / 0 | friends == friends[1]
+    assert Walk / slice(1, None) % ('name', ['Suzie Q', 'Jean Blasin']) / slice(1) | friends == [friends[2]]
+    assert Walk % ('name', ['Bob']) / 0 ^ (friends, None) is None
+    assert Walk % ('name', ['Suzie Q']) / 0 | IndexedSequence(friends) == friends[2]
+
+    snapshot = instrumentation.snapshot()
+    harry_statistics = snapshot.selectors[All('name', ['Harry Cover', 'Suzie Q'])]
+    assert (harry_statistics.calls, harry_statistics.hits, harry_statistics.scans) == (1, 1, 1)
+    assert harry_statistics.scanned_items == 2, 'the scan stopped at the first match'
+    sliced_statistics = snapshot.selectors[All('name', ['Suzie Q', 'Jean Blasin'])]
+    assert (sliced_statistics.scans, sliced_statistics.scanned_items) == (1, 2)
+    missing_statistics = snapshot.selectors[All('name', ['Bob'])]
+    assert (missing_statistics.misses, missing_statistics.scanned_items) == (1, 4)
+    indexed_statistics = snapshot.selectors[All('name', ['Suzie Q'])]
+    assert (indexed_statistics.index_lookups, indexed_statistics.scans, indexed_statistics.scanned_items) == (1, 0, 0)
+
+
+def test_instrumented_optimized_walk_errors_describe_the_written_selectors(instrumented, friends: list[dict]):
+    expected_message = r"walked \[%\(name in \['Bob'\]\)\] but could not find \[0\]"
+    with raises(WalkError, match=expected_message):
+        Walk % ('name', ['Bob']) / 0 | friends
+
+    # the selectors applied again to find the failing one are not recorded
+    assert instrumentation.snapshot().selectors[All('name', ['Bob'])].calls == 1
+
+
+def test_instrumentation_counts_the_index_lookups(instrumented, friends: list[dict]):
+    indexed_friends = IndexedSequence(friends)
+    assert Walk @ ('name', 'Suzie Q') | indexed_friends == friends[2]
+    assert Walk % ('phone', ['06 43 15 27 98']) | indexed_friends == [friends[2]]
+
+    snapshot = instrumentation.snapshot()
+    first_statistics = snapshot.selectors[First('name', 'Suzie Q')]
+    assert (first_statistics.index_lookups, first_statistics.scans, first_statistics.average_scanned) == (1, 0, 0.0)
+    assert snapshot.selectors[All('phone', ['06 43 15 27 98'])].index_lookups == 1
+
+
+def test_instrumentation_counts_the_binary_searches(instrumented):
+    readings = SortedSequence([{'timestamp': timestamp} for timestamp in range(10)], 'timestamp')
+    assert Walk @ ('timestamp', 3) | readings == {'timestamp': 3}
+    assert Walk % ('timestamp', Between(2, 3)) | readings == [{'timestamp': 2}, {'timestamp': 3}]
+    assert Walk % ('timestamp', Not([3])) | readings == [
+        {'timestamp': timestamp} for timestamp in range(10) if timestamp != 3
+    ]
+
+    snapshot = instrumentation.snapshot()
+    first_statistics = snapshot.selectors[First('timestamp', 3)]
+    assert (first_statistics.index_lookups, first_statistics.scans) == (1, 0)
+    assert snapshot.selectors[All('timestamp', Between(2, 3))].index_lookups == 1
+    not_statistics = snapshot.selectors[All('timestamp', Not([3]))]
+    assert (not_statistics.index_lookups, not_statistics.scans, not_statistics.scanned_items) == (0, 1, 10)
+
+
+def test_instrumentation_indexes_the_unhashable_selectors_by_representation(instrumented):
+    class UnhashableSelector:
+        __hash__ = None
+
+        def __call__(self, state):
+            return state * 2
+
+        def __repr__(self) -> str:
+            return '*double'
+
+    walk = Walk * UnhashableSelector()
+    assert walk | 21 == 42
+
+    snapshot = instrumentation.snapshot()
+    assert snapshot.walks['*double'].hits == 1
+    assert snapshot.selectors['*double'].calls == 1
+
+
+def test_instrumentation_snapshot_is_a_copy_and_reset_clears_the_statistics(instrumented, data: dict):
+    title_walk = Walk / 'org' / 'title'
+    title_walk | data
+    snapshot = instrumentation.snapshot()
+    title_walk | data
+    assert snapshot.walks[title_walk].calls == 1
+    assert instrumentation.snapshot().walks[title_walk].calls == 2
+
+    instrumentation.disable()
+    title_walk | data
+    assert instrumentation.snapshot().walks[title_walk].calls == 2, 'the disabled instrumentation records nothing'
+
+    instrumentation.reset()
+    assert instrumentation.snapshot().walks == {}
+
+
+def test_instrumentation_sums_up_the_statistics_of_the_threads(instrumented, data: dict):
+    title_walk = Walk / 'org' / 'title'
+
+    def walk_titles(calls_count: int):
+        for _ in range(calls_count):
+            title_walk | data
+
+    with ThreadPoolExecutor(4) as pool:
+        list(pool.map(walk_titles, [500, 500, 500, 500]))
+    title_walk | data
+
+    snapshot = instrumentation.snapshot()
+    assert _outcomes(snapshot.walks[title_walk]) == (2001, 2001, 0, 0)
+    assert snapshot.selectors[ByKey('title')].calls == 2001
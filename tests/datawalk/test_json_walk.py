@@ -0,0 +1,229 @@
+import json
+from io import BytesIO, StringIO
+from json import JSONDecodeError
+from pathlib import Path
+from typing import Any
+
+from pytest import fixture, mark, raises
+
+from datawalk import Between, Walk, WalkSet
+from datawalk.errors import WalkError
+from datawalk.json_walk import _container_content, _container_content_pattern
+
+
+@fixture
+def json_data() -> dict:
+    return {
+        'name': 'Lucie Nation',
+        'org': {
+            'title': 'Datawalk',
+            'address': {'country': 'France', 'city': 'Rennes', 'zipcode': '35700'},
+            'phones': ['01 23 45 67 89', '02 13 46 58 79'],
+            'escaped \\"key\\"': 'é',
+        },
+        'friends': [
+            {'name': 'Frankie Manning', 'age': 24},
+            {'name': 'Harry Cover', 'tags': [], 'age': 42},
+            {'name': 'Suzie Q', 'phone': '06 43 15 27 98', 'age': 35},
+            {'name': 'Jean Blasin', 'age': 57},
+        ],
+        'pets': [],
+        'scores': [[1, 2], [3, 4]],
+    }
+
+
+WALKS = [
+    Walk(),
+    Walk / 'name',
+    Walk / 'org' / 'address' / 'country',
+    Walk / 'org' / 'address' // ('city', 'zipcode'),
+    Walk / 'org' / 'phones' / 1,
+    Walk / 'org' / 'phones' / -1,
+    Walk / 'org' / 'escaped \\"key\\"',
+    Walk / 'friends' / slice(1, 3) / 0 / 'name',
+    Walk / 'friends' / slice(None, None, -1) / 0 / 'name',
+    Walk / 'friends' @ ('name', 'Suzie Q') / 'phone',
+    Walk / 'friends' @ ('tags', []) / 'name',
+    Walk / 'friends' % ('age', Between(30, 50)) / 1 / 'name',
+    Walk / 'pets' @ ('name', 'Socks'),
+    Walk / 'scores' / 1 / 0,
+]
+
+INVALID_WALKS = [
+    Walk / 'nickname',
+    Walk / 'org' / 'phones' / 2,
+    Walk / 'org' / 'address' / 'street',
+    Walk / 'org' / 'title' / 'name',
+    Walk / 'friends' @ ('name', 'John Doe'),
+    Walk / 'friends' @ ('name', 'Suzie Q') / 'phone' / 'prefix',
+    Walk / 'friends' / 'name',
+    Walk / 'org' / 0,
+    Walk / 'scores' @ (0, 3),
+]
+
+
+@mark.parametrize(['walk'], [(walk,) for walk in WALKS])
+def test_walk_json_returns_the_walked_value(json_data: dict, walk: Walk):
+    json_document = json.dumps(json_data, indent=2)
+    assert walk.walk_json(json_document) == walk.walk(json_data)
+    assert walk.walk_json(json_document.encode()) == walk.walk(json_data)
+
+
+@mark.parametrize(['invalid_walk'], [(walk,) for walk in INVALID_WALKS])
+def test_walk_json_invalid_path(json_data: dict, invalid_walk: Walk):
+    json_document = json.dumps(json_data)
+    assert invalid_walk.walk_json(json_document, default='☹️') == '☹️'
+
+    with raises(WalkError) as expected_error:
+        invalid_walk.walk(json_data)
+    with raises(WalkError) as error:
+        invalid_walk.walk_json(json_document)
+
+    assert str(error.value) == str(expected_error.value)
+    assert error.value.data_state == expected_error.value.data_state
+
+
+def test_walk_set_walk_json(json_data: dict):
+    walks = {f'walk {index}': walk for index, walk in enumerate(WALKS + INVALID_WALKS)}
+    walk_set = WalkSet(walks)
+    assert walk_set.walk_json(json.dumps(json_data), default=None) == walk_set.walk(json_data, default=None)
+
+
+def test_walk_json_skips_unvisited_subtrees():
+    # the unvisited values are not parsed
+    json_document = '{"skipped": [not, valid, {"json": tru}], "name": "Suzie Q", "truncated": {"document'
+    assert (Walk / 'name').walk_json(json_document) == 'Suzie Q'
+
+    walk_set = WalkSet({'name': Walk / 'name', 'phone': Walk / 'phone'})
+    with raises(JSONDecodeError):
+        walk_set.walk_json(json_document)
+
+
+def test_walk_json_on_files(json_data: dict, tmp_path: Path):
+    json_path = tmp_path / 'document.json'
+    json_path.write_text(json.dumps(json_data), encoding='utf-8')
+    city_walk = Walk / 'org' / 'address' / 'city'
+    with json_path.open('rb') as json_file:
+        assert city_walk.walk_json(json_file) == 'Rennes'
+    with json_path.open(encoding='utf-8') as json_file:
+        assert city_walk.walk_json(json_file) == 'Rennes'
+
+    assert city_walk.walk_json(BytesIO(json_path.read_bytes())) == 'Rennes'
+    assert city_walk.walk_json(StringIO(json_path.read_text())) == 'Rennes'
+
+
+@mark.parametrize('source', [b'{"org": {"name": "Datawalk"}}', bytearray(b'{"org": {"name": "Datawalk"}}')])
+def test_walk_json_on_binary_sources(source: bytes | bytearray):
+    assert (Walk / 'org' / 'name').walk_json(source) == 'Datawalk'
+    assert (Walk / 'org' / 'name').walk_json(memoryview(source)) == 'Datawalk'
+    assert (Walk / 'org' * dict.keys).walk_json(memoryview(source)) == {'name': 'Datawalk'}.keys()
+
+
+def test_walk_json_on_empty_file(tmp_path: Path):
+    json_path = tmp_path / 'empty.json'
+    json_path.touch()
+    with json_path.open('rb') as json_file, raises(JSONDecodeError, match='expecting value'):
+        (Walk / 'name').walk_json(json_file)
+
+
+@mark.parametrize('json_document', ['', b'  ', '\n\t '])
+def test_walk_json_on_empty_documents(json_document: str | bytes):
+    with raises(JSONDecodeError, match='expecting value'):
+        (Walk / 'name').walk_json(json_document)
+
+
+@mark.parametrize('json_document', ['{', '{"name": "Suzie Q"', '[1, ', '{"org": {"name"'])
+def test_walk_json_on_truncated_documents(json_document: str):
+    with raises(JSONDecodeError):
+        (Walk / 'phone').walk_json(json_document, default=None)
+
+
+def test_walk_json_dict_attributes(json_data: dict):
+    assert (Walk / 'org' / 'keys').walk_json(json.dumps(json_data))() == json_data['org'].keys()
+
+
+def test_walk_json_skips_deeply_nested_subtrees():
+    nested_value = {'deep': [[[[[[{'a': ['}', '"]', {'b': [1, 2, {}]}]}]]]]]]}
+    json_document = json.dumps({'nested': nested_value, 'array': [nested_value, nested_value, 'third'], 'name': 'Q'})
+    assert (Walk / 'name').walk_json(json_document) == 'Q'
+    assert (Walk / 'array' / 2).walk_json(json_document) == 'third'
+    assert (Walk / 'nested' / 'deep' / 0 / 0).walk_json(json_document) == [[[[{'a': ['}', '"]', {'b': [1, 2, {}]}]}]]]]
+
+
+def test_container_content_depends_on_the_python_version():
+    assert _container_content((3, 11)) == _container_content_pattern(8, possessive=True)
+    # Python 3.10 does not support possessive quantifiers
+    assert _container_content((3, 10)) == _container_content_pattern(0, possessive=False)
+
+
+def test_walk_json_without_nested_content_pattern(monkeypatch, json_data: dict):
+    monkeypatch.setattr('datawalk.json_walk._CONTAINER_CONTENT', _container_content((3, 10)))
+    json_document = json.dumps(json_data)
+    for walk in WALKS:
+        assert walk.walk_json(json_document) == walk.walk(json_data)
+
+
+@mark.parametrize(
+    ['json_document', 'error_message'],
+    [
+        ('{"name": "Suzie Q', 'unterminated string'),
+        ('{"age": , "name": "Suzie Q"}', 'expecting value'),
+        ('{"age": 35 "name": "Suzie Q"}', 'expecting comma delimiter'),
+        ('{"age" 35, "name": "Suzie Q"}', 'expecting colon delimiter'),
+    ],
+)
+def test_walk_json_syntax_errors(json_document: str, error_message: str):
+    with raises(JSONDecodeError, match=error_message):
+        (Walk / 'name').walk_json(json_document)
+
+
+def test_walk_json_on_empty_containers():
+    assert (Walk / 'name').walk_json('{ }', default=None) is None
+    assert (Walk / 0).walk_json('[ ]', default=None) is None
+
+
+def test_walk_json_first_on_large_elements():
+    padding = 'x' * 2000
+    json_document = json.dumps([{'padding': padding, 'name': 'Harry Cover'}, {'padding': padding, 'name': 'Suzie Q'}])
+    assert (Walk @ ('name', 'Suzie Q') / 'padding').walk_json(json_document) == padding
+
+    invalid_document = json_document.replace('"name": "Harry Cover"', '"name": }')
+    with raises(JSONDecodeError, match='expecting value'):
+        (Walk @ ('name', 'Suzie Q')).walk_json(invalid_document)
+
+
+@mark.parametrize(['walk'], [(walk,) for walk in WALKS])
+def test_walk_json_strict_returns_the_walked_value(json_data: dict, walk: Walk):
+    assert walk.walk_json(json.dumps(json_data), strict=True) == walk.walk(json_data)
+
+
+@mark.parametrize(
+    ['walk', 'json_document', 'lenient_value', 'strict_value'],
+    [
+        (Walk / 'a', '{"a": 1, "a": 2}', 1, 2),
+        (Walk / 'a' / 'b', '{"a": {"b": 1}, "c": 0, "a": {"b": 2}}', 1, 2),
+        (Walk @ ('id', 1) / 'v', '[{"id": 1, "v": "x" , "v": "y"}]', 'x', 'y'),
+        (Walk @ ('id', 1) / 'v', f'[{{"id": 0, "id": 1, "v": "{"x" * 2000}"}}]', None, 'x' * 2000),
+    ],
+)
+def test_walk_json_duplicate_keys(walk: Walk, json_document: str, lenient_value: Any, strict_value: Any):
+    assert walk.walk_json(json_document, default=None) == lenient_value
+    assert walk.walk_json(json_document, strict=True) == strict_value == walk.walk(json.loads(json_document))
+
+
+@mark.parametrize(
+    ['walk', 'json_document'],
+    [
+        (Walk / 'a', '{"a": 1} garbage'),
+        (Walk / 'a', '{"a": 1, "b": ]'),
+        (Walk / 0, '[1, 2 3]'),
+        (Walk / slice(0, 1), '[1, 2 3]'),
+        (Walk @ ('id', 1), '[{"id": 1}, 2 3]'),
+        (Walk / 'a' @ ('id', 1), '{"a": [{"id": 1}, 2 3]}'),
+    ],
+)
+def test_walk_json_strict_syntax_errors(walk: Walk, json_document: str):
+    # the lenient scan stops before the syntax error
+    walk.walk_json(json_document)
+    with raises(JSONDecodeError):
+        walk.walk_json(json_document, strict=True)
@@ -0,0 +1,216 @@
+import asyncio
+import json
+from itertools import product
+from typing import Any, Iterator
+
+from pytest import mark, raises
+
+from datawalk import IndexedSequence, Walk, WalkCache, WalkSet
+from datawalk.errors import WalkError
+from datawalk.optimizer import merged_slices, optimize_selectors, source_walk_error
+from datawalk.selectors.all import All
+from datawalk.selectors.by_key import ByKey
+from datawalk.selectors.fan_out import Branches, Each
+from datawalk.selectors.filtered_scan import FilteredScan
+
+ITEMS = [{'id': index, 'group': index % 3} for index in range(20)]
+
+LAZY_SLICE_VALUES = [None, 0, 1, 2, 5, 13]
+LAZY_SLICE_STEPS = [None, 1, 2, 3]
+
+
+def _applied(selectors: tuple, state: Any) -> Any:
+    for selector in selectors:
+        state = selector(state)
+
+    return state
+
+
+def _listed(value: Any) -> Any:
+    return list(value) if isinstance(value, Iterator) else value
+
+
+def test_merged_slices_select_the_items_of_consecutive_slices():
+    slices = [slice(*bounds) for bounds in product(LAZY_SLICE_VALUES, LAZY_SLICE_VALUES, LAZY_SLICE_STEPS)]
+    for first, second in product(slices, slices):
+        merged = merged_slices(first, second)
+        for length in (0, 4, 12, 30):
+            items = list(range(length))
+            assert items[merged] == items[first][second], f'{first} then {second} merged into {merged}'
+
+
+@mark.parametrize(
+    ['first', 'second'],
+    [(slice(-2, None), slice(1, None)), (slice(None, 3), slice(None, -1)), (slice(None, None, -1), slice(1, None))],
+)
+def test_merged_slices_with_negative_values(first: slice, second: slice):
+    assert merged_slices(first, second) is None
+
+
+@mark.parametrize(
+    ['walk', 'expected_steps'],
+    [
+        (Walk / 'friends' % ('name', ['Suzie Q']) / 0 / 'phone', ('.friends', "%(name in ['Suzie Q']) [0]", '.phone')),
+        (Walk / slice(1, None) / slice(None, 3), ('[1:4]',)),
+        (Walk / slice(-3, None) / slice(None, 3), ('[-3:]', '[:3]')),
+        (Walk % ('group', [0]) / -1, ('%(group in [0])', '[-1]')),
+        (Walk / slice(3, None) % ('group', [0]), ('[3:]', '%(group in [0])')),
+        (Walk % ('group', [0]) / slice(-2, None), ('%(group in [0])', '[-2:]')),
+        (
+            Walk / slice(2, None) / slice(None, 10) % ('group', [0]) / slice(1, None) / slice(None, 2) / 1 / 'id',
+            ('[2:12] %(group in [0]) [1:3] [1]', '.id'),
+        ),
+        (Walk * Each() % ('group', [0]) / 0, ('[*] %(group in [0]) [0]',)),
+    ],
+)
+def test_walk_steps_are_optimized(walk: Walk, expected_steps: tuple[str, ...]):
+    assert tuple(map(repr, walk.steps)) == expected_steps
+
+
+def test_fan_out_branches_are_optimized():
+    walk = Walk * Each() % ('group', [0]) / 0
+    assert walk.steps == (Branches((Each(), FilteredScan((All('group', [0]), ByKey(0))))),)
+    assert walk | [ITEMS[:3], ITEMS[3:7], ITEMS[1:3]] == [ITEMS[0], ITEMS[3]]
+
+
+@mark.parametrize(
+    'walk',
+    [
+        Walk % ('group', [0]) / 2,
+        Walk % ('group', [1]) / slice(2, 5),
+        Walk % ('group', [1]) / slice(2, 5) / slice(1, None) / 0,
+        Walk / slice(3, None) % ('group', [2]) / 1,
+        Walk / slice(3, None, 2) / slice(1, 6) % ('group', [0, 2]) / slice(None, None, 2),
+        Walk / slice(None, 15) % ('group', [1]) / slice(1, None) / 1 / 'id',
+    ],
+)
+def test_optimized_walks_return_the_values_of_the_written_selectors(walk: Walk):
+    assert walk.steps != walk.selectors, 'the walk is optimized'
+    for state in (ITEMS, tuple(ITEMS), IndexedSequence(ITEMS)):
+        assert walk | state == _applied(walk.selectors, state)
+        assert walk.compile()(state) == _applied(walk.selectors, state)
+
+    assert _listed(walk | iter(ITEMS)) == _listed(_applied(walk.selectors, iter(ITEMS)))
+
+
+@mark.parametrize(
+    ['walk', 'data', 'expected_message', 'expected_data_state'],
+    [
+        (
+            Walk / 'friends' % ('name', ['Nobody']) / 0 / 'phone',
+            {'friends': [{'name': 'Suzie Q'}]},
+            "walked [.friends, %(name in ['Nobody'])] but could not find [0] in the current data state",
+            [],
+        ),
+        (
+            Walk / 'friends' / slice(1, None) % ('name', ['Suzie Q']) / slice(None, 1) / 'phone',
+            {'friends': [{'name': 'Suzie Q'}, {'name': 'Suzie Q'}]},
+            "walked [.friends, [1:], %(name in ['Suzie Q']), [:1]] but could not find .phone in the current data state",
+            [{'name': 'Suzie Q'}],
+        ),
+        (
+            Walk / 'count' / slice(2, None) / slice(None, 3),
+            {'count': 5},
+            'walked [.count] but could not find [2:] in the current data state',
+            5,
+        ),
+        (
+            Walk / 'friends' % ('name', ['Suzie Q']) * Each() / 'name',
+            {'friends': 3},
+            "walked [.friends] but could not find %(name in ['Suzie Q']) in the current data state",
+            3,
+        ),
+    ],
+)
+def test_optimized_walk_errors_describe_the_written_selectors(
+    walk: Walk, data: dict, expected_message: str, expected_data_state: Any
+):
+    assert len(walk.steps) < len(walk.selectors), 'the walk is optimized'
+    with raises(WalkError) as unoptimized_error:
+        try:
+            _applied(walk.selectors, data)
+        except Exception as error:
+            raise WalkError(expected_message) from error
+
+    for walk_function in (
+        walk.walk,
+        walk.compile(),
+        lambda data: WalkSet({'walk': walk}).walk(data),
+        lambda data: walk.walk_json(json.dumps(data)),
+    ):
+        with raises(WalkError) as error:
+            walk_function(data)
+        assert str(error.value) == str(unoptimized_error.value)
+        assert error.value.data_state == expected_data_state
+
+    assert walk ^ (data, 'no value') == 'no value'
+
+
+def test_source_walk_error_points_to_the_first_replaced_selector_when_the_replay_succeeds():
+    walk = Walk / 'friends' % ('name', ['Suzie Q']) / 0
+    friends = [{'name': 'Suzie Q'}]
+    # the step failed on a state that was modified since (by another thread, for example)
+    error = source_walk_error(walk.selectors, walk.steps, 1, friends)
+
+    assert str(error) == "walked [.friends] but could not find %(name in ['Suzie Q']) in the current data state"
+    assert error.data_state is friends
+
+
+def test_optimized_walk_errors_on_iterators_describe_the_first_replaced_selector():
+    # the iterator was consumed by the failing step, the selectors are not applied again
+    walk = Walk % ('name', ['Nobody']) / 0 / 'phone'
+    with raises(WalkError) as error:
+        walk.walk(iter([{'name': 'Suzie Q'}]))
+
+    assert str(error.value) == "walked [] but could not find %(name in ['Nobody']) in the current data state"
+
+
+def test_optimized_async_walk_errors_describe_the_first_replaced_selector():
+    # the selectors of async walks can return awaitables, they are not applied again
+    walk = Walk / 'friends' % ('name', ['Nobody']) / 0 / 'phone'
+    with raises(WalkError) as error:
+        asyncio.run(walk.awalk({'friends': [{'name': 'Suzie Q'}]}))
+
+    assert str(error.value) == "walked [.friends] but could not find %(name in ['Nobody']) in the current data state"
+
+
+def test_optimizer_keeps_the_written_selectors(data: dict):
+    walk = Walk / 'friends' % ('name', ['Suzie Q']) / 0 / 'phone'
+    assert repr(walk) == ".friends %(name in ['Suzie Q']) [0] .phone"
+    assert walk.selectors == (ByKey('friends'), All('name', ['Suzie Q']), ByKey(0), ByKey('phone'))
+    assert Walk.from_spec(walk.to_spec()) == walk
+    assert optimize_selectors(walk.selectors) == walk.steps
+    assert walk | data == '06 43 15 27 98'
+
+
+def test_walk_cache_with_optimized_walks(data: dict):
+    cache = WalkCache()
+    phone_walk = Walk / 'friends' % ('name', ['Suzie Q']) / 0 / 'phone'
+    assert cache.walk(phone_walk, data) == '06 43 15 27 98'
+    assert cache.walk(Walk / 'friends' % ('name', ['Suzie Q']) / 0, data) == {
+        'name': 'Suzie Q',
+        'phone': '06 43 15 27 98',
+    }
+
+    names_walk = Walk / 'friends' / slice(1, None) * Each() % ('name', ['Suzie Q', 'Jean Blasin']) / 0
+    assert cache.walk(Walk / 'friends' / slice(1, None) % ('name', ['Suzie Q']), data) == [data['friends'][2]]
+    with raises(WalkError, match=r"walked \[.friends, \[1:\], %\(name in \['Nobody'\]\)\] but could not find \[0\]"):
+        cache.walk(Walk / 'friends' / slice(1, None) % ('name', ['Nobody']) / 0, data)
+    assert cache.walk(Walk / 'friends' * Each(), data) == data['friends']
+    assert cache.walk(names_walk, {'friends': [[], [{'name': 'Suzie Q'}], [{'name': 'Bob'}]]}) == [{'name': 'Suzie Q'}]
+
+
+def test_explain():
+    walk = Walk / 'friends' / slice(1, None) / slice(None, 3) % ('name', ['Suzie Q']) / 0 / 'phone'
+    assert walk.explain() == (
+        '.friends\n'
+        "[1:4] %(name in ['Suzie Q']) [0]  # one-pass filter, of the items [1:4], "
+        "stops at the match 0 (from [1:] [:3] %(name in ['Suzie Q']) [0])\n"
+        '.phone'
+    )
+    assert (Walk / slice(2, None) / slice(None, 5, 2)).explain() == '[2:7:2]  # merged slices [2:] [:5:2]'
+    assert (Walk % ('name', ['Suzie Q']) / slice(None, 10)).explain() == (
+        "%(name in ['Suzie Q']) [:10]  # one-pass filter, stops after the matches [:10]"
+    )
+    assert (Walk / 'friends' * Each() / 'name').explain() == '.friends\n[*]\n.name'
+    assert Walk().explain() == ''
@@ -0,0 +1,95 @@
+from pytest import mark, raises
+
+from datawalk import Walk
+from datawalk.errors import WalkError
+from datawalk.parallel import _walk_records, init_worker, worker_walker
+
+RECORDS = [{'id': index, 'user': {'name': f'user {index}'}} for index in range(50)]
+
+
+@mark.parametrize('workers', [1, 3])
+@mark.parametrize('chunk_size', [1, 7, 100])
+def test_map_parallel_yields_the_values_in_the_records_order(workers: int, chunk_size: int):
+    ids = (Walk / 'id').map_parallel(iter(RECORDS), workers=workers, chunk_size=chunk_size)
+
+    assert list(ids) == list(range(50))
+
+
+def test_map_parallel_unordered_yields_all_the_values():
+    ids = (Walk / 'id').map_parallel(RECORDS, workers=3, chunk_size=4, ordered=False)
+
+    assert sorted(ids) == list(range(50))
+
+
+@mark.parametrize('workers', [1, 2])
+def test_map_parallel_uses_the_default_value(workers: int):
+    cities = (Walk / 'user' / 'city').map_parallel(RECORDS[:3], workers=workers, default=None)
+
+    assert list(cities) == [None, None, None]
+
+
+@mark.parametrize('workers', [1, 2])
+def test_map_parallel_raises_walk_errors_without_default(workers: int):
+    with raises(WalkError) as error:
+        list((Walk / 'user' / 'city').map_parallel(RECORDS, workers=workers))
+
+    assert str(error.value) == 'walked [.user] but could not find .city in the current data state'
+
+
+def test_init_worker_compiles_the_walks_of_the_worker_process(monkeypatch):
+    # the worker functions are called in the current process to check the state that they share
+    monkeypatch.setattr('datawalk.parallel._worker_walk', None)
+    init_worker([(Walk / 'id').to_spec()], False, None)
+
+    assert worker_walker()(RECORDS[3]) == 3
+    assert _walk_records(RECORDS[:3]) == [0, 1, 2]
+
+
+def test_map_parallel_rejects_invalid_chunk_sizes():
+    with raises(ValueError) as error:
+        (Walk / 'id').map_parallel(RECORDS, chunk_size=0)
+
+    assert str(error.value) == 'the chunk size must be positive: 0'
+
+
+@mark.parametrize('workers', [1, 3])
+@mark.parametrize('chunk_size', [1, 7, 100])
+def test_map_threaded_yields_the_values_in_the_records_order(workers: int, chunk_size: int):
+    ids = (Walk / 'id').map_threaded(iter(RECORDS), workers=workers, chunk_size=chunk_size)
+
+    assert list(ids) == list(range(50))
+
+
+def test_map_threaded_unordered_yields_all_the_values():
+    ids = (Walk / 'id').map_threaded(RECORDS, workers=3, chunk_size=4, ordered=False)
+
+    assert sorted(ids) == list(range(50))
+
+
+def test_map_threaded_shares_the_unpicklable_selectors_and_records():
+    records = [{'id': index, 'score': lambda index=index: index * 10} for index in range(20)]
+    scores = (Walk / 'score' * (lambda score: score())).map_threaded(records, workers=4, chunk_size=3)
+
+    assert list(scores) == [index * 10 for index in range(20)]
+
+
+@mark.parametrize('workers', [1, 2])
+def test_map_threaded_uses_the_default_value(workers: int):
+    cities = (Walk / 'user' / 'city').map_threaded(RECORDS[:3], workers=workers, default=None)
+
+    assert list(cities) == [None, None, None]
+
+
+@mark.parametrize('workers', [1, 2])
+def test_map_threaded_raises_walk_errors_without_default(workers: int):
+    with raises(WalkError) as error:
+        list((Walk / 'user' / 'city').map_threaded(RECORDS, workers=workers))
+
+    assert str(error.value) == 'walked [.user] but could not find .city in the current data state'
+
+
+def test_map_threaded_rejects_invalid_chunk_sizes():
+    with raises(ValueError) as error:
+        (Walk / 'id').map_threaded(RECORDS, chunk_size=0)
+
+    assert str(error.value) == 'the chunk size must be positive: 0'
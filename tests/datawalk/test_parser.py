@@ -0,0 +1,70 @@
+from pytest import mark, raises
+
+from datawalk import Between, Compare, Exists, In, Not, Walk
+from datawalk.errors import SelectorError
+from datawalk.selectors.fan_out import Descendants, Each
+from datawalk.selectors.group_by import GroupBy
+from datawalk.selectors.partition import Partition
+
+
+@mark.parametrize(
+    'walk',
+    [
+        Walk(),
+        Walk / 'name',
+        Walk / 'org' / 'phones' / 1,
+        Walk / 'org' / 'phones' / -1,
+        Walk / 'first name' / 'last.name',
+        Walk / slice(None, None),
+        Walk / slice(1, -1, 2),
+        Walk / slice(None, 3),
+        Walk @ ('name', 'Suzie Q') / 'phone',
+        Walk @ ('age', 24),
+        Walk @ ('name', 'Suzie (Q)'),
+        Walk @ ('tags', None),
+        Walk % ('type', ['cat', 'dog']),
+        Walk % ('type', ('cat',)) / 0,
+        Walk % ('first name', In(['Suzie'])),
+        Walk % ('age', Compare('>=', 18)),
+        Walk % ('age', Compare('<', 18.5)),
+        Walk % ('name', Compare('!=', 'Suzie Q')),
+        Walk % ('age', Between(18, 65)),
+        Walk % ('phone', Exists()),
+        Walk % ('type', Not(['cat'])),
+        Walk % ('age', Not(Not(Between(1, 2)))),
+        Walk // ('name', 'age'),
+        Walk / 'friends' % ('age', Compare('>', 30)) @ ('name', 'Suzie Q') // ('name', 'phone'),
+        Walk / 'friends' * Each() / 'name',
+        Walk * Descendants('city') * Each(),
+        Walk / 'pets' * GroupBy('type') / 'cat',
+        Walk / 'pets' * GroupBy('type', count=True),
+        Walk / 'friends' * Partition('age', Not(Between(18, 65))) / 0,
+    ],
+)
+def test_parse_rebuilds_walks_from_their_representation(walk: Walk):
+    assert Walk.parse(repr(walk)).selectors == walk.selectors
+
+
+def test_parse_returns_cached_compiled_walks(data):
+    walk = Walk.parse('.friends @(name==Suzie Q) .phone')
+
+    assert walk is Walk.parse('.friends @(name==Suzie Q) .phone')
+    assert walk._compiled is not None
+    assert walk | data == '06 43 15 27 98'
+
+
+@mark.parametrize(
+    ['text', 'expected_message'],
+    [
+        ('name', 'invalid selector at position 0 of the walk: name'),
+        ('.org [a]', 'invalid selector at position 5 of the walk: .org [a]'),
+        ('.org @(name)', 'invalid selector at position 5 of the walk: .org @(name)'),
+        ('%(age ~ 18)', 'invalid selector at position 0 of the walk: %(age ~ 18)'),
+        ('%(type in cats)', 'invalid values of the in predicate: cats'),
+    ],
+)
+def test_parse_rejects_invalid_walks(text: str, expected_message: str):
+    with raises(SelectorError) as error:
+        Walk.parse(text)
+
+    assert str(error.value) == expected_message
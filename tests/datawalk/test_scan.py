@@ -0,0 +1,165 @@
+import json
+from pathlib import Path
+
+from pytest import fixture, mark, raises
+
+import datawalk.scan
+from datawalk import Walk, scan_jsonl, scan_lines
+from datawalk.errors import WalkError
+from datawalk.parallel import init_worker
+from datawalk.scan import _init_worker, _walk_chunk, _walk_stream_chunk, chunk_ranges
+
+
+@fixture
+def jsonl_path(tmp_path: Path) -> Path:
+    records = [{'id': index, 'user': {'name': f'user {index}'}} for index in range(100)]
+    records[42]['user']['city'] = 'Rennes'
+    jsonl_path = tmp_path / 'records.jsonl'
+    jsonl_path.write_text('\n'.join(json.dumps(record) for record in records) + '\n')
+
+    return jsonl_path
+
+
+@mark.parametrize(
+    ['document', 'chunk_size', 'expected_ranges'],
+    [
+        (b'', 4, []),
+        (b'a\nbc\ndef\n', 1, [(0, 2), (2, 5), (5, 9)]),
+        (b'a\nbc\ndef\n', 2, [(0, 2), (2, 5), (5, 9)]),
+        (b'a\nbc\ndef\n', 3, [(0, 5), (5, 9)]),
+        (b'a\nbc\ndef\n', 100, [(0, 9)]),
+        (b'a\nbc\ndef', 3, [(0, 5), (5, 8)]),
+    ],
+)
+def test_chunk_ranges_end_on_line_ends(document: bytes, chunk_size: int, expected_ranges: list):
+    assert list(chunk_ranges(document, chunk_size)) == expected_ranges
+
+
+@mark.parametrize('workers', [1, 3])
+@mark.parametrize('chunk_size', [10, 500, 2**20])
+def test_scan_jsonl_yields_the_values_in_the_line_order(jsonl_path: Path, workers: int, chunk_size: int):
+    assert list(scan_jsonl(jsonl_path, Walk / 'id', workers=workers, chunk_size=chunk_size)) == list(range(100))
+
+
+def test_scan_jsonl_unordered_yields_all_the_values(jsonl_path: Path):
+    ids = scan_jsonl(jsonl_path, Walk / 'id', workers=3, chunk_size=100, ordered=False)
+
+    assert sorted(ids) == list(range(100))
+
+
+@mark.parametrize('workers', [1, 2])
+def test_scan_jsonl_yields_tuples_of_values_with_several_walks(jsonl_path: Path, workers: int):
+    values = list(scan_jsonl(str(jsonl_path), Walk / 'id', Walk / 'user' / 'city', workers=workers, default='n/a'))
+
+    assert values[41:44] == [(41, 'n/a'), (42, 'Rennes'), (43, 'n/a')]
+
+
+@mark.parametrize('workers', [1, 2])
+def test_scan_jsonl_raises_walk_errors_without_default(jsonl_path: Path, workers: int):
+    with raises(WalkError) as error:
+        list(scan_jsonl(jsonl_path, Walk / 'user' / 'city', workers=workers))
+
+    assert str(error.value) == 'walked [.user] but could not find .city in the current data state'
+
+
+def test_scan_jsonl_skips_blank_lines_and_handles_missing_last_line_end(tmp_path: Path):
+    jsonl_path = tmp_path / 'records.jsonl'
+    jsonl_path.write_text('{"id": 1}\n\n  \n{"id": 2}')
+
+    assert list(scan_jsonl(jsonl_path, Walk / 'id', workers=1)) == [1, 2]
+
+
+@mark.parametrize('workers', [1, 2])
+@mark.parametrize('chunk_size', [1, 10, 11, 1000])
+def test_scan_jsonl_chunk_boundaries(tmp_path: Path, workers: int, chunk_size: int):
+    # chunks of 10 bytes end exactly on the first line end, the last line has no line end
+    jsonl_path = tmp_path / 'records.jsonl'
+    jsonl_path.write_text('{"id": 1}\n{"id": 2}\n\n{"id": 3}')
+
+    assert list(scan_jsonl(jsonl_path, Walk / 'id', workers=workers, chunk_size=chunk_size)) == [1, 2, 3]
+
+
+def test_scan_jsonl_workers_map_the_file_and_walk_the_chunks(monkeypatch, tmp_path: Path):
+    # the worker functions are called in the current process to check the state that they share
+    monkeypatch.setattr('datawalk.scan._worker_lines', None)
+    monkeypatch.setattr('datawalk.parallel._worker_walk', None)
+    jsonl_path = tmp_path / 'records.jsonl'
+    document = b'{"id": 1}\n{"id": 2}\n\n{"id": 3}'
+    jsonl_path.write_bytes(document)
+
+    _init_worker(str(jsonl_path), [(Walk / 'id').to_spec()], True, None)
+    values = [_walk_chunk(start, end) for start, end in chunk_ranges(document, 10)]
+
+    assert values == [[1], [2], [3]]
+    datawalk.scan._worker_lines.close()
+
+
+def test_scan_lines_workers_walk_the_chunks_of_lines(monkeypatch):
+    monkeypatch.setattr('datawalk.parallel._worker_walk', None)
+    init_worker([(Walk / 'id').to_spec(), (Walk / 'name').to_spec()], True, 'n/a')
+
+    assert _walk_stream_chunk([b'{"id": 1}\n', b'\n', '{"id": 2, "name": "Suzie Q"}']) == [(1, 'n/a'), (2, 'Suzie Q')]
+
+
+def test_scan_jsonl_handles_empty_files(tmp_path: Path):
+    jsonl_path = tmp_path / 'empty.jsonl'
+    jsonl_path.write_bytes(b'')
+
+    assert list(scan_jsonl(jsonl_path, Walk / 'id', workers=2)) == []
+
+
+@mark.parametrize(
+    ['walks', 'chunk_size', 'expected_message'],
+    [
+        ((), 10, 'at least one walk must be given to scan the lines'),
+        ((Walk / 'id',), 0, 'the chunk size must be positive: 0'),
+    ],
+)
+def test_scan_jsonl_validates_its_parameters(jsonl_path: Path, walks: tuple, chunk_size: int, expected_message: str):
+    with raises(ValueError) as error:
+        scan_jsonl(jsonl_path, *walks, chunk_size=chunk_size)
+
+    assert str(error.value) == expected_message
+
+
+@mark.parametrize('workers', [1, 3])
+@mark.parametrize('chunk_size', [1, 7, 1000])
+def test_scan_lines_yields_the_values_in_the_line_order(jsonl_path: Path, workers: int, chunk_size: int):
+    with jsonl_path.open('rb') as lines:
+        ids = list(scan_lines(lines, Walk / 'id', workers=workers, chunk_size=chunk_size))
+
+    assert ids == list(range(100))
+
+
+@mark.parametrize('workers', [1, 2])
+def test_scan_lines_yields_tuples_of_values_with_several_walks(jsonl_path: Path, workers: int):
+    lines = jsonl_path.read_text().splitlines()
+    values = list(scan_lines(iter(lines), Walk / 'id', Walk / 'user' / 'city', workers=workers, default='n/a'))
+
+    assert values[41:44] == [(41, 'n/a'), (42, 'Rennes'), (43, 'n/a')]
+
+
+@mark.parametrize('workers', [1, 2])
+def test_scan_lines_raises_walk_errors_without_default(jsonl_path: Path, workers: int):
+    with raises(WalkError) as error, jsonl_path.open('rb') as lines:
+        list(scan_lines(lines, Walk / 'user' / 'city', workers=workers))
+
+    assert str(error.value) == 'walked [.user] but could not find .city in the current data state'
+
+
+def test_scan_lines_skips_blank_lines():
+    assert list(scan_lines(['{"id": 1}\n', '\n', '  \n', '{"id": 2}'], Walk / 'id', workers=1)) == [1, 2]
+
+
+@mark.parametrize(
+    ['walks', 'chunk_size', 'expected_message'],
+    [
+        ((), 10, 'at least one walk must be given to scan the lines'),
+        ((Walk / 'id',), 0, 'the chunk size must be positive: 0'),
+    ],
+)
+def test_scan_lines_validates_its_parameters(walks: tuple, chunk_size: int, expected_message: str):
+    with raises(ValueError) as error:
+        scan_lines([], *walks, chunk_size=chunk_size)
+
+    assert str(error.value) == expected_message
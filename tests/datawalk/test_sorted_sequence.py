@@ -0,0 +1,100 @@
+from itertools import product
+
+from pytest import mark, raises
+
+from datawalk import SortedSequence, Walk
+from datawalk.selectors.all import All
+from datawalk.selectors.first import First
+from datawalk.selectors.predicates import Between, Compare, Exists, In, Not
+
+from tests.conftest import PetDataclass
+
+READINGS = [{'timestamp': timestamp, 'value': index} for index, timestamp in enumerate([1, 3, 3, 3, 5, 8, 8, 13])]
+
+
+def test_sorted_sequence_behaves_like_the_wrapped_sequence():
+    readings = SortedSequence(READINGS, 'timestamp')
+    assert len(readings) == 8
+    assert list(readings) == READINGS
+    assert readings[1:3] == READINGS[1:3]
+    assert Walk / 4 / 'value' | readings == 4
+    assert readings.keys == [1, 3, 3, 3, 5, 8, 8, 13]
+
+
+@mark.parametrize(
+    ['items', 'expected_message'],
+    [
+        ([{'timestamp': 1}, {'value': 2}], "the item at position 1 has no 'timestamp' key"),
+        (
+            [{'timestamp': 1}, {'timestamp': 3}, {'timestamp': 2}],
+            "the items are not sorted by 'timestamp', see the item at position 2",
+        ),
+        (
+            [{'timestamp': 1}, {'timestamp': float('nan')}],
+            "the items are not sorted by 'timestamp', see the item at position 1",
+        ),
+        ([{'timestamp': 1}, {'timestamp': '2'}], "the values of the 'timestamp' key cannot be compared"),
+    ],
+)
+def test_sorted_sequence_rejects_unsorted_items(items: list[dict], expected_message: str):
+    with raises(ValueError, match=expected_message):
+        SortedSequence(items, 'timestamp')
+
+
+def test_first_with_sorted_sequence():
+    readings = SortedSequence(READINGS, 'timestamp')
+    assert First('timestamp', 3)(readings) == READINGS[1], 'the first matching item is returned'
+    assert First('timestamp', 13)(readings) == READINGS[7]
+    with raises(StopIteration):
+        First('timestamp', 4)(readings)
+    with raises(StopIteration):
+        First('timestamp', 'not comparable')(readings)
+    assert First('value', 6)(readings) == READINGS[6], 'the other keys are scanned'
+    assert First('timestamp', 1)(SortedSequence([], 'timestamp')) is None
+
+
+@mark.parametrize(
+    'predicate',
+    [
+        *(Compare(comparator, value) for comparator, value in product(Compare.OPERATORS, [0, 3, 4, 13, 20])),
+        *(Between(lower, upper) for lower, upper in product([0, 3, 4], [3, 8, 20])),
+        In([8, 1, 3, 8, 4]),
+        In([]),
+        In(['not comparable', 3]),
+        In([[3]]),
+        Not([3, 8]),
+        Exists(),
+        Compare('<', 'not comparable'),
+    ],
+)
+def test_all_with_sorted_sequence_selects_the_scanned_items(predicate):
+    assert All('timestamp', predicate)(SortedSequence(READINGS, 'timestamp')) == All('timestamp', predicate)(READINGS)
+
+
+@mark.parametrize(
+    ['predicate', 'expected_positions'],
+    [
+        (In([8, 3]), [1, 2, 3, 5, 6]),
+        (Compare('==', 3), range(1, 4)),
+        (Compare('<=', 3), range(0, 4)),
+        (Compare('>', 5), range(5, 8)),
+        (Between(2, 7), range(1, 5)),
+        (Compare('!=', 3), None),
+        (Not([3]), None),
+        (In(['not comparable', 3]), None),
+    ],
+)
+def test_sorted_sequence_positions(predicate, expected_positions: list[int] | range | None):
+    readings = SortedSequence(READINGS, 'timestamp')
+    assert readings.positions('timestamp', predicate) == expected_positions
+    assert readings.positions('value', predicate) is None
+
+
+def test_walks_on_sorted_sequences_of_objects():
+    pets = SortedSequence(
+        [PetDataclass('Caramel', 'dog'), PetDataclass('Melody', 'bird'), PetDataclass('Socks', 'cat')], 'name'
+    )
+    assert Walk @ ('name', 'Melody') / 'type' | pets == 'bird'
+    assert Walk % ('name', Compare('>=', 'M')) / 0 / 'type' | pets == 'bird'
+    assert Walk % ('name', Between('A', 'N')) / -1 / 'name' | pets == 'Melody'
+    assert (Walk @ ('name', 'Vanilla')) ^ (pets, None) is None
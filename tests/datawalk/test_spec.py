@@ -0,0 +1,103 @@
+import json
+import pickle
+
+from pytest import mark, raises
+
+from datawalk import Between, Compare, Exists, In, Not, Walk
+from datawalk.errors import SelectorError
+from datawalk.selectors.all import All
+from datawalk.selectors.by_key import ByKey
+from datawalk.selectors.by_slice import BySlice
+from datawalk.selectors.fan_out import Branches, Descendants, Each
+from datawalk.selectors.first import First
+from datawalk.selectors.group_by import GroupBy
+from datawalk.selectors.partition import Partition
+from datawalk.selectors.picker import Picker
+
+
+def upper_case(state: str) -> str:
+    return state.upper()
+
+
+@mark.parametrize(
+    ['walk', 'expected_spec'],
+    [
+        (Walk(), (1,)),
+        (Walk / 'org' / 0, (1, ('/', 'org'), ('/', 0))),
+        (Walk / slice(1, None, 2), (1, ('/:', 1, None, 2))),
+        (Walk @ ('name', 'Socks'), (1, ('@', 'name', 'Socks'))),
+        (Walk % ('type', ['cat', 'dog']), (1, ('%', 'type', ('in', ('cat', 'dog'))))),
+        (Walk % ('age', Compare('>=', 18)), (1, ('%', 'age', ('>=', 18)))),
+        (Walk % ('age', Between(18, 65)), (1, ('%', 'age', ('between', 18, 65)))),
+        (Walk % ('phone', Exists()), (1, ('%', 'phone', ('exists',)))),
+        (Walk % ('type', Not(['cat'])), (1, ('%', 'type', ('not', ('in', ('cat',)))))),
+        (Walk // ('name', 'type'), (1, ('//', 'name', 'type'))),
+        (Walk * upper_case, (1, ('*', upper_case))),
+        (Walk / 'friends' * Each() / 'name', (1, ('/', 'friends'), ('[*]',), ('/', 'name'))),
+        (Walk * Descendants('city'), (1, ('..', 'city'))),
+        (Walk * GroupBy('type'), (1, ('group', 'type'))),
+        (Walk * GroupBy('type', count=True), (1, ('count', 'type'))),
+        (Walk * Partition('age', Compare('<', 18)), (1, ('partition', 'age', ('<', 18)))),
+    ],
+)
+def test_to_spec_and_from_spec_roundtrip(walk: Walk, expected_spec: tuple):
+    spec = walk.to_spec()
+
+    assert spec == expected_spec
+    assert Walk.from_spec(spec).selectors == walk.selectors
+
+
+def test_from_spec_accepts_json_specifications():
+    walk = Walk / 'friends' % ('age', Compare('>', 30)) / slice(0, 2) // ('name',)
+    json_spec = json.loads(json.dumps(walk.to_spec()))
+
+    assert Walk.from_spec(json_spec).selectors == walk.selectors
+
+
+@mark.parametrize(
+    ['spec', 'expected_message'],
+    [
+        ((), 'unsupported walk specification version, expected 1: ()'),
+        ((2, ('/', 'name')), "unsupported walk specification version, expected 1: (2, ('/', 'name'))"),
+        ((1, ('?', 'name')), "unsupported step specification: ('?', 'name')"),
+        ((1, ('%', 'age', ('=>', 18))), "unsupported predicate specification: ('=>', 18)"),
+    ],
+)
+def test_from_spec_rejects_invalid_specifications(spec: tuple, expected_message: str):
+    with raises(SelectorError) as error:
+        Walk.from_spec(spec)
+
+    assert str(error.value) == expected_message
+
+
+@mark.parametrize(
+    'selector',
+    [
+        ByKey('name'),
+        BySlice(slice(None, -1)),
+        First('name', 'Socks'),
+        All('type', ['cat', 'dog']),
+        All('age', Not(Between(18, 65))),
+        All('age', Compare('<', 3)),
+        All('phone', Exists()),
+        All('type', In(['cat'])),
+        Picker(('name', 'type')),
+        Each(),
+        Descendants('city'),
+        Branches((Each(), ByKey('name'))),
+        GroupBy('type', count=True),
+        Partition('type', ['cat']),
+    ],
+)
+def test_selectors_are_picklable(selector):
+    assert pickle.loads(pickle.dumps(selector)) == selector
+
+
+def test_compiled_walks_are_picklable(data):
+    walk = Walk / 'org' / 'address' / 'city'
+    walk.compile()
+
+    unpickled_walk = pickle.loads(pickle.dumps(walk))
+
+    assert unpickled_walk.selectors == walk.selectors
+    assert unpickled_walk | data == 'Rennes'
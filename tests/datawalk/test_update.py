@@ -0,0 +1,121 @@
+from collections import OrderedDict
+from dataclasses import dataclass
+
+from pytest import mark, raises
+
+from datawalk import Walk
+from datawalk.errors import SelectorError, WalkError
+from datawalk.selectors.fan_out import Each
+
+from tests.conftest import Pet, PetDataclass, PetNamedTuple
+
+
+@dataclass(frozen=True)
+class Address:
+    city: str
+    zipcode: str
+
+
+def test_set_copies_the_containers_of_the_walked_path_only(data: dict):
+    updated_data = (Walk / 'org' / 'address' / 'city').set(data, 'Nantes')
+
+    assert updated_data['org']['address'] == {'country': 'France', 'city': 'Nantes', 'zipcode': '35700'}
+    assert data['org']['address']['city'] == 'Rennes', 'the original data is unchanged'
+    assert updated_data is not data
+    assert updated_data['org'] is not data['org']
+    assert updated_data['friends'] is data['friends'], 'the values out of the walked path are shared'
+    assert updated_data['org']['phones'] is data['org']['phones']
+
+
+def test_set_adds_the_missing_last_key_of_a_dict(data: dict):
+    updated_data = (Walk / 'org' / 'address' / 'planet').set(data, 'Earth')
+
+    assert updated_data['org']['address']['planet'] == 'Earth'
+    assert 'planet' not in data['org']['address']
+
+
+def test_set_in_lists_and_tuples(data: dict):
+    updated_data = (Walk / 'org' / 'phones' / -1).set(data, '00 00 00 00 00')
+    assert updated_data['org']['phones'] == ['01 23 45 67 89', '00 00 00 00 00']
+    assert data['org']['phones'] == ['01 23 45 67 89', '02 13 46 58 79']
+
+    assert (Walk / 1 / 0).set(((1, 2), (3, 4)), 30) == ((1, 2), (30, 4))
+
+
+@mark.parametrize('key', ['type', 1])
+def test_set_in_named_tuples(key):
+    pet = PetNamedTuple('Socks', 'cat')
+    updated_pet = (Walk / key).set(pet, 'dog')
+
+    assert updated_pet == PetNamedTuple('Socks', 'dog')
+    assert pet.type == 'cat'
+
+
+def test_set_in_dataclasses_and_objects():
+    updated_pets = (Walk / 0 / 'type').set([PetDataclass('Caramel', 'dog')], 'cat')
+    assert updated_pets == [PetDataclass('Caramel', 'cat')]
+
+    frozen_address = Address('Rennes', '35700')
+    assert (Walk / 'city').set(frozen_address, 'Nantes') == Address('Nantes', '35700')
+
+    pet = Pet('Melody', 'bird')
+    updated_pet = (Walk / 'name').set(pet, 'Sweet Melody')
+    assert (updated_pet.name, updated_pet.type) == ('Sweet Melody', 'bird')
+    assert pet.name == 'Melody'
+
+
+def test_set_preserves_the_mapping_types():
+    settings = OrderedDict(theme=OrderedDict(color='blue'))
+    updated_settings = (Walk / 'theme' / 'color').set(settings, 'red')
+
+    assert updated_settings == OrderedDict(theme=OrderedDict(color='red'))
+    assert type(updated_settings['theme']) is OrderedDict
+
+
+def test_set_with_an_empty_walk_returns_the_value():
+    assert Walk().set({'name': 'Suzie Q'}, 'Harry') == 'Harry'
+
+
+def test_update_applies_the_function_on_the_walked_value(data: dict):
+    updated_data = (Walk / 'org' / 'address' / 'city').update(data, str.upper)
+
+    assert updated_data['org']['address']['city'] == 'RENNES'
+    assert data['org']['address']['city'] == 'Rennes'
+
+
+def test_update_fails_on_missing_value(data: dict):
+    with raises(WalkError, match=r'walked \[.org, .address\] but could not find .planet'):
+        (Walk / 'org' / 'address' / 'planet').update(data, str.upper)
+
+
+def test_set_fails_on_missing_container(data: dict):
+    with raises(WalkError, match=r'walked \[.org\] but could not find .headquarters'):
+        (Walk / 'org' / 'headquarters' / 'city').set(data, 'Nantes')
+
+
+@mark.parametrize(
+    'walk',
+    [
+        Walk / 'friends' @ ('name', 'Suzie Q') / 'phone',
+        Walk / 'friends' % ('name', ['Suzie Q']),
+        Walk / 'friends' / slice(0, 2),
+        Walk / 'friends' * Each() / 'name',
+    ],
+)
+def test_update_requires_key_steps(walk: Walk, data: dict):
+    with raises(SelectorError, match='only the walks made of / key steps can update values'):
+        walk.set(data, None)
+
+
+def test_set_propagates_the_validation_errors_of_dataclasses():
+    @dataclass(frozen=True)
+    class FrozenCity:
+        name: str
+
+        def __post_init__(self):
+            # replace() re-runs the validation of the fields
+            if not self.name:
+                raise ValueError('empty name')
+
+    with raises(ValueError, match='empty name'):
+        (Walk / 'name').set(FrozenCity('Rennes'), '')
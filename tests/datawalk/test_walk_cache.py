@@ -0,0 +1,230 @@
+import gc
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+from weakref import ref
+
+from pytest import raises
+
+from datawalk import Walk, WalkCache
+from datawalk.errors import WalkError
+from datawalk.selectors.fan_out import Each
+
+from tests.conftest import Pet
+
+
+class CountingSelector:
+    """
+    Counts its calls, to check which states are memoized
+    """
+
+    def __init__(self, key: str):
+        self.key = key
+        self.calls_count = 0
+
+    def __call__(self, state: dict) -> Any:
+        self.calls_count += 1
+        return state[self.key]
+
+    def __repr__(self) -> str:
+        return f'.{self.key}'
+
+
+class Document:
+    """
+    A document supporting weak references
+    """
+
+    def __init__(self, content: dict):
+        self.content = content
+
+
+def test_walk_cache_memoizes_the_values_of_walks(data: dict):
+    cache = WalkCache()
+    org_selector = CountingSelector('org')
+    city_walk = Walk * org_selector / 'address' / 'city'
+
+    assert cache.walk(city_walk, data) == 'Rennes'
+    assert cache.walk(city_walk, data) == 'Rennes'
+    assert org_selector.calls_count == 1
+    assert len(cache) == 1
+
+
+def test_walk_cache_reuses_the_states_of_the_shared_prefixes(data: dict):
+    cache = WalkCache()
+    address_selector = CountingSelector('address')
+    address_walk = Walk / 'org' * address_selector
+
+    assert cache.walk(address_walk / 'city', data) == 'Rennes'
+    assert cache.walk(address_walk / 'country', data) == 'France'
+    assert cache.walk(address_walk, data) == data['org']['address']
+    assert address_selector.calls_count == 1
+
+
+def test_walk_cache_keys_the_values_by_document_identity(data: dict):
+    cache = WalkCache()
+    city_walk = Walk / 'org' / 'address' / 'city'
+    other_data = {'org': {'address': {'city': 'Nantes'}}}
+
+    assert cache.walk(city_walk, data) == 'Rennes'
+    assert cache.walk(city_walk, other_data) == 'Nantes'
+    assert cache.walk(city_walk, {'org': {'address': {'city': 'Nantes'}}}) == 'Nantes'
+    assert len(cache) == 3
+
+
+def test_walk_cache_evicts_the_least_recently_walked_documents():
+    cache = WalkCache(max_documents=2)
+    documents = [{'name': f'document {index}'} for index in range(3)]
+    for document in documents:
+        cache.walk(Walk / 'name', document)
+    assert len(cache) == 2
+
+    name_selector = CountingSelector('name')
+    assert cache.walk(Walk * name_selector, documents[0]) == 'document 0'
+    assert cache.walk(Walk * name_selector, documents[0]) == 'document 0'
+    assert name_selector.calls_count == 1
+
+
+def test_walk_cache_drops_the_garbage_collected_documents():
+    cache = WalkCache(max_documents=1)
+    documents = [Document({'name': f'document {index}'}) for index in range(3)]
+    for document in documents:
+        assert cache.walk(Walk / 'content' / 'name', document) == document.content['name']
+    assert len(cache) == 3, 'the weakly referenced documents are not bounded'
+
+    del documents, document
+    gc.collect()
+    assert len(cache) == 0
+
+
+def test_walk_cache_invalidation(data: dict):
+    cache = WalkCache()
+    title_walk = Walk / 'org' / 'title'
+    other_data = {'org': {'title': 'Other'}}
+    cache.walk(title_walk, data)
+    cache.walk(title_walk, other_data)
+
+    data['org'] = {'title': 'Datawalk 2'}
+    assert cache.walk(title_walk, data) == 'Datawalk', 'the documents must not be modified'
+    cache.invalidate(data)
+    assert cache.walk(title_walk, data) == 'Datawalk 2'
+    assert len(cache) == 2
+
+    cache.invalidate()
+    assert len(cache) == 0
+
+
+def test_walk_cache_defaults_and_errors(data: dict):
+    cache = WalkCache()
+    planet_walk = Walk / 'org' / 'address' / 'planet'
+
+    assert cache.walk(planet_walk, data, default=None) is None
+    with raises(WalkError, match=r'walked \[.org, .address\] but could not find .planet'):
+        cache.walk(planet_walk, data)
+
+    # the failures are not memoized
+    data['org']['address']['planet'] = 'Earth'
+    assert cache.walk(planet_walk, data) == 'Earth'
+
+
+def test_walk_cache_with_fan_out_walks(data: dict):
+    cache = WalkCache()
+    friends_selector = CountingSelector('friends')
+    names_walk = Walk * friends_selector * Each() / 'name'
+
+    names = ['Frankie Manning', 'Harry Cover', 'Suzie Q', 'Jean Blasin']
+    assert cache.walk(names_walk, data) == names
+    assert cache.walk(names_walk, data) == names
+    assert cache.walk(Walk * friends_selector * Each() / 'phone', data) == ['06 43 15 27 98']
+    assert friends_selector.calls_count == 1
+
+
+def test_walk_cache_applies_the_unhashable_walks(pets):
+    class UnhashableSelector:
+        __hash__ = None
+
+        def __call__(self, state: Pet) -> str:
+            return state.name
+
+    cache = WalkCache()
+    assert cache.walk(Walk / 0 * UnhashableSelector(), pets) == 'Cinnamon'
+    assert len(cache) == 0
+
+
+def test_walk_cache_with_empty_walk(data: dict):
+    assert WalkCache().walk(Walk(), data) is data
+
+
+def test_walk_cache_shared_by_threads():
+    cache = WalkCache(max_documents=4)
+    documents = [{'org': {'address': {'city': f'city {index}'}}} for index in range(10)]
+    city_walk = Walk / 'org' / 'address' / 'city'
+
+    def walk_cities(offset: int) -> list[str]:
+        # more documents than max_documents: the threads evict each other's documents
+        return [cache.walk(city_walk, documents[(offset + call) % 10]) for call in range(300)]
+
+    with ThreadPoolExecutor(4) as pool:
+        for offset, cities in enumerate(pool.map(walk_cities, range(8))):
+            assert cities == [f'city {(offset + call) % 10}' for call in range(300)]
+
+    assert len(cache) == 4
+
+
+def test_walk_cache_bounds_the_states_of_the_documents(data: dict):
+    cache = WalkCache(max_states=4)
+    org_selector = CountingSelector('org')
+    org_walk = Walk * org_selector
+    assert cache.walk(org_walk / 'address' / 'city', data) == 'Rennes'
+    assert cache.walk(org_walk / 'title', data) == 'Datawalk'
+    assert org_selector.calls_count == 1
+    assert len(cache._document_states(data)) == 4
+
+    # the states are dropped once their number reaches max_states
+    assert cache.walk(org_walk / 'address' / 'country', data) == 'France'
+    assert org_selector.calls_count == 2
+    assert len(cache._document_states(data)) == 3
+
+
+def test_walk_cache_reuses_the_states_of_weakly_referenced_documents():
+    cache = WalkCache()
+    document = Document({'name': 'Suzie Q'})
+    content_selector = CountingSelector('content')
+    name_walk = Walk * content_selector / 'name'
+
+    assert cache.walk(name_walk, vars(document)) == 'Suzie Q'
+    assert cache.walk(Walk / 'content' / 'name', document) == 'Suzie Q'
+    assert cache.walk(Walk / 'content' / 'name', document) == 'Suzie Q'
+    assert len(cache) == 2
+
+
+def test_walk_cache_keeps_the_states_of_a_document_cached_concurrently(monkeypatch):
+    cache = WalkCache()
+    document = Document({'name': 'Suzie Q'})
+    concurrent_states = {Walk / 'content' / 'name': 'cached by another thread'}
+
+    def concurrent_ref(referent: Any, callback: Any) -> ref:
+        # another thread caches the document between the lookup and the lock
+        document_ref = ref(referent, callback)
+        cache._weak_documents[id(referent)] = (document_ref, concurrent_states)
+        return document_ref
+
+    monkeypatch.setattr('datawalk.walk_cache.ref', concurrent_ref)
+    assert cache.walk(Walk / 'content' / 'name', document) == 'cached by another thread'
+
+
+def test_walk_cache_ignores_the_stale_garbage_collection_callbacks():
+    cache = WalkCache()
+    document = Document({'name': 'Suzie Q'})
+    assert cache.walk(Walk / 'content' / 'name', document) == 'Suzie Q'
+
+    # callback of a previous document having the same id
+    cache._forget(id(document), ref(Document({})))
+    assert len(cache) == 1
+    cache._forget(id(document), cache._weak_documents[id(document)][0])
+    assert len(cache) == 0
+
+
+def test_walk_cache_repr(data: dict):
+    cache = WalkCache(max_documents=8, max_states=64)
+    cache.walk(Walk / 'name', data)
+    assert repr(cache) == 'WalkCache(documents=1, max_documents=8, max_states=64)'
@@ -0,0 +1,106 @@
+from pytest import raises
+
+from datawalk import Walk, WalkSet
+from datawalk.errors import WalkError
+
+
+class CountingSelector:
+    """Counts how many times the selector is applied"""
+
+    def __init__(self, key: str):
+        self.key = key
+        self.calls_count = 0
+
+    def __call__(self, state: dict) -> dict:
+        self.calls_count += 1
+        return state[self.key]
+
+    def __repr__(self) -> str:
+        return f'*{self.key}'
+
+
+def test_walk_set_returns_the_values_by_label(data: dict):
+    walk_set = WalkSet(
+        {
+            'name': Walk / 'name',
+            'country': Walk / 'org' / 'address' / 'country',
+            'city': Walk / 'org' / 'address' / 'city',
+            'suzie_phone': Walk / 'friends' @ ('name', 'Suzie Q') / 'phone',
+            'phones': Walk / 'org' / 'phones',
+            'everything': Walk(),
+        }
+    )
+    assert walk_set | data == {
+        'name': 'Lucie Nation',
+        'country': 'France',
+        'city': 'Rennes',
+        'suzie_phone': '06 43 15 27 98',
+        'phones': ['01 23 45 67 89', '02 13 46 58 79'],
+        'everything': data,
+    }
+
+
+def test_walk_set_applies_shared_selectors_once(data: dict):
+    org_selector = CountingSelector('org')
+    org_walk = Walk * org_selector
+    walk_set = WalkSet({'title': org_walk / 'title', 'country': org_walk / 'address' / 'country'})
+    assert walk_set | data == {'title': 'Datawalk', 'country': 'France'}
+    assert org_selector.calls_count == 1
+
+
+def test_walk_set_materializes_the_lazy_states_shared_by_several_walks(friends: list[dict]):
+    friends_walk = Walk % ('name', ['Harry Cover', 'Jean Blasin'])
+    walk_set = WalkSet(
+        {
+            'names': friends_walk * (lambda matches: [friend['name'] for friend in matches]),
+            'count': friends_walk * (lambda matches: sum(1 for _ in matches)),
+            'friends': friends_walk,
+        }
+    )
+    assert walk_set | iter(friends) == {
+        'names': ['Harry Cover', 'Jean Blasin'],
+        'count': 2,
+        'friends': [friends[1], friends[3]],
+    }
+
+    # a lazy state walked by one walk is not materialized
+    (lazy_friends,) = WalkSet({'friends': friends_walk}).walk(iter(friends)).values()
+    assert list(lazy_friends) == [friends[1], friends[3]]
+
+
+def test_walk_set_merges_equal_selectors_of_different_walks():
+    walk_set = WalkSet(
+        {
+            'country': Walk / 'org' / 'address' / 'country',
+            'city': Walk / 'org' / 'address' / 'city',
+            'cats': Walk / 'org' / 'pets' % ('type', ['cat']),
+        }
+    )
+    (org_node,) = walk_set.root.children.values()
+    assert len(org_node.children) == 2
+
+
+def test_walk_set_with_defaults(data: dict):
+    walk_set = WalkSet(
+        {
+            'country': Walk / 'org' / 'address' / 'country',
+            'zipcode': Walk / 'org' / 'location' / 'zipcode',
+            'street': Walk / 'org' / 'location' / 'street',
+        },
+        defaults={'zipcode': '00000'},
+    )
+    assert walk_set ^ (data, None) == {'country': 'France', 'zipcode': '00000', 'street': None}
+
+
+def test_walk_set_error_without_default(data: dict):
+    walk_set = WalkSet({'country': Walk / 'org' / 'address' / 'country', 'street': Walk / 'org' / 'address' / 'street'})
+    with raises(WalkError) as error:
+        walk_set | data
+
+    assert str(error.value) == 'walked [.org, .address] but could not find .street in the current data state'
+    assert error.value.data_state == {'country': 'France', 'city': 'Rennes', 'zipcode': '35700'}
+
+
+def test_walk_set_repr():
+    walk_set = WalkSet({'country': Walk / 'org' / 'address' / 'country', 'first_phone': Walk / 'org' / 'phones' / 0})
+    assert repr(walk_set) == 'WalkSet(country: .org .address .country, first_phone: .org .phones [0])'